@@ -1,5 +1,7 @@
 from __future__ import absolute_import, division, print_function
 
+import contextlib
+
 from maya.api import OpenMaya
 
 
@@ -8,7 +10,7 @@ try:
 except NameError: # python 3 compatibility
     basestring = str
 
-__all__ = ['asMObject', 'asDagPath']
+__all__ = ['asMObject', 'asDagPath', 'evaluateAt', 'getMatrix']
 
 
 def asMObject(node):
@@ -30,3 +32,21 @@ def asDagPath(obj):
     sel = OpenMaya.MSelectionList()
     sel.add(str(obj))
     return sel.getDagPath(0)
+
+
+@contextlib.contextmanager
+def evaluateAt(time):
+    ''' Plugs read through the api within this block are evaluated at the given
+    time (in ui units) without changing the current time.
+    '''
+    context = OpenMaya.MDGContext( OpenMaya.MTime(time, OpenMaya.MTime.uiUnit()) )
+    with OpenMaya.MDGContextGuard(context):
+        yield
+
+
+def getMatrix(obj, attr='worldMatrix'):
+    ''' Returns the MMatrix of the given matrix attribute of the dag object, respecting `evaluateAt`.
+    '''
+    dagPath = asDagPath(obj)
+    plug = OpenMaya.MFnDagNode(dagPath).findPlug(attr, False).elementByLogicalIndex( dagPath.instanceNumber() )
+    return OpenMaya.MFnMatrixData( plug.asMObject() ).matrix()
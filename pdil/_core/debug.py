@@ -2,8 +2,12 @@ from __future__ import absolute_import, print_function
 
 import collections
 from contextlib import contextmanager
+import functools
+import json
 import time
 
+from maya.api import OpenMaya
+
 from pymel.core import dt, polyColorPerVertex, polyCylinder, polyUnite, PyNode, selected, xform
 
 __all__ = [
@@ -13,6 +17,9 @@ __all__ = [
     'Timer',
     'TimerBasic',
     'TimerAggregate',
+    'Profiler',
+    'profile',
+    'profiled',
 ]
 
 
@@ -122,7 +129,12 @@ class Timer(object):
 
         _counts[self.key] += 1
 
-        _allTimers[self.key] += time.time() - self.start
+        elapsed = time.time() - self.start
+        _allTimers[self.key] += elapsed
+        
+        # Also show up in the profile, under whatever section is running.
+        if _activeProfiler:
+            _activeProfiler._record(self.key, elapsed)
 
     def split(self, key):
         self._record()
@@ -184,4 +196,178 @@ class TimerAggregate(object):
     def report(self):
         print('Results, fastest to slowest')
         for elapsed, msg in sorted(self.results):
-            print( self.fmt.format( elapsed, msg) )
\ No newline at end of file
+            print( self.fmt.format( elapsed, msg) )
+
+
+# Hierarchical profiling ------------------------------------------------------
+
+if '_activeProfiler' not in globals():
+    _activeProfiler = None
+
+
+class ProfileNode(object):
+    ''' A section of a `Profiler`, repeated sections of the same name are combined.
+    
+    `commands` and `nodes` are only what ran directly in this section, not the children.
+    '''
+    
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.elapsed = 0.0
+        self.commands = 0
+        self.nodes = 0
+        self.children = collections.OrderedDict()
+    
+    def child(self, name):
+        if name not in self.children:
+            self.children[name] = ProfileNode(name)
+        return self.children[name]
+    
+    def selfElapsed(self):
+        return max(0.0, self.elapsed - sum(c.elapsed for c in self.children.values()))
+    
+    def total(self, attr):
+        return getattr(self, attr) + sum(c.total(attr) for c in self.children.values())
+    
+    def toDict(self):
+        return collections.OrderedDict( [
+            ('name', self.name),
+            ('calls', self.calls),
+            ('elapsed', self.elapsed),
+            ('selfElapsed', self.selfElapsed()),
+            ('commands', self.commands),
+            ('nodes', self.nodes),
+            ('totalCommands', self.total('commands')),
+            ('totalNodes', self.total('nodes')),
+            ('children', [c.toDict() for c in self.children.values()]),
+        ] )
+    
+    def folded(self, path=''):
+        ''' Generates the "folded stack" lines used by flame graph tools, the value is the self time in microseconds.
+        '''
+        path = (path + ';' if path else '') + self.name.replace(';', ',')
+        yield '{} {}'.format(path, int(self.selfElapsed() * 1000000))
+        for c in self.children.values():
+            for line in c.folded(path):
+                yield line
+
+
+class Profiler(object):
+    ''' Records nested timings of the `profile()` sections (and `Timer`s) that run while active, along with how many
+    commands ran and nodes were made in each.  ex:
+    
+        with Profiler('buildRig') as prof:
+            buildRig(cards)
+        
+        prof.report()
+        prof.toJson('build.json')
+        prof.toFolded('build.folded')  # For flamegraph.pl, speedscope etc.
+    
+    Sections only record when a profiler is active so they can be left in the code.
+    '''
+    
+    def __init__(self, name='root'):
+        self.root = ProfileNode(name)
+        self._stack = [self.root]
+        self._callbacks = []
+        self._start = None
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, type, value, traceback):
+        self.stop()
+    
+    def start(self):
+        global _activeProfiler
+        
+        self._callbacks = [
+            OpenMaya.MCommandMessage.addCommandCallback(self._commandRan),
+            OpenMaya.MDGMessage.addNodeAddedCallback(self._nodeAdded, 'dependNode'),
+        ]
+        _activeProfiler = self
+        self._start = time.time()
+    
+    def stop(self):
+        global _activeProfiler
+        
+        self.root.elapsed += time.time() - self._start
+        self.root.calls += 1
+        
+        for callbackId in self._callbacks:
+            OpenMaya.MMessage.removeCallback(callbackId)
+        self._callbacks = []
+        
+        if _activeProfiler is self:
+            _activeProfiler = None
+    
+    def _commandRan(self, command, clientData):
+        self._stack[-1].commands += 1
+    
+    def _nodeAdded(self, node, clientData):
+        self._stack[-1].nodes += 1
+    
+    def _record(self, name, elapsed):
+        node = self._stack[-1].child(name)
+        node.calls += 1
+        node.elapsed += elapsed
+    
+    @contextmanager
+    def section(self, name):
+        node = self._stack[-1].child(name)
+        self._stack.append(node)
+        start = time.time()
+        try:
+            yield
+        finally:
+            node.elapsed += time.time() - start
+            node.calls += 1
+            self._stack.pop()
+    
+    def report(self, minTime=0.0):
+        ''' Prints the tree, skipping sections shorter than `minTime`.
+        '''
+        def printNode(node, depth):
+            print( '{}{}  x{}  {}s (self {}s)  commands: {}  nodes: {}'.format(
+                '    ' * depth, node.name, node.calls, numf(node.elapsed), numf(node.selfElapsed()),
+                node.total('commands'), node.total('nodes') ) )
+            for c in node.children.values():
+                if c.elapsed >= minTime:
+                    printNode(c, depth + 1)
+        
+        printNode(self.root, 0)
+    
+    def toJson(self, filename):
+        with open(filename, 'w') as fid:
+            json.dump(self.root.toDict(), fid, indent=4)
+    
+    def toFolded(self, filename):
+        with open(filename, 'w') as fid:
+            fid.write( '\n'.join(self.root.folded()) + '\n' )
+
+
+@contextmanager
+def profile(name):
+    ''' Marks a section for the active `Profiler`, doing nothing if there isn't one.
+    '''
+    if _activeProfiler:
+        with _activeProfiler.section(name):
+            yield
+    else:
+        yield
+
+
+def profiled(name=None):
+    ''' Decorator version of `profile`, defaulting to the function's name.
+    '''
+    def decorator(func):
+        label = name if name else func.__name__
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -83,6 +83,7 @@ __all__ = [
     'SingleStringConnectionAccess',
     'Json',
     'JsonAccess',
+    'jsonCache',
     'IntAccess',
     'FloatAccess',
 ]
@@ -307,14 +308,86 @@ class Json(collections.OrderedDict):
         return self
     
     def __exit__(self, type, value, traceback):
-        setStringAttr(self._node, self._attr, json.dumps(self))
+        _setCachedJsonAttr(self._node, self._attr, self)
         #self._node.attr(self._attr).set( json.dumps(self) )
 
+
+# Json caching ----------------------------------------------------------------
+# While in a `jsonCache()` block, JsonAccess parses each attr once and defers
+# writing until the block is exited.
+
+_jsonCacheDepth = 0
+_jsonCache = {}  # {(node, attr): parsed data}
+_jsonCacheDirty = collections.OrderedDict()  # {(node, attr): None}, an ordered set of what needs to be written
+
+
+@contextlib.contextmanager
+def jsonCache():
+    '''
+    Within this block, `JsonAccess` attributes are only read and parsed once per node,
+    and all the writes are batched so each attribute is set once when the (outermost)
+    block exits.
+    
+    The cache is only aware of changes made through `JsonAccess`, so don't set the
+    underlying string attributes directly while inside.
+    '''
+    global _jsonCacheDepth
+    
+    _jsonCacheDepth += 1
+    try:
+        yield
+    finally:
+        _jsonCacheDepth -= 1
+        if not _jsonCacheDepth:
+            try:
+                for node, attr in _jsonCacheDirty:
+                    if node.exists():
+                        setJsonAttr(node, attr, _jsonCache[(node, attr)])
+            finally:
+                _jsonCache.clear()
+                _jsonCacheDirty.clear()
+
+
+def _copyJson(data):
+    ''' A deepcopy for json data which is much faster than copy.deepcopy.
+    '''
+    if isinstance(data, dict):
+        return collections.OrderedDict( (k, _copyJson(v)) for k, v in data.items() )
+    elif isinstance(data, list):
+        return [_copyJson(v) for v in data]
+    return data
+
+
+def _getCachedJsonAttr(node, attr, defaults):
+    ''' Returns the parsed json (a copy so it can be edited), using the cache if active.
+    '''
+    if _jsonCacheDepth:
+        key = (node, attr)
+        if key not in _jsonCache:
+            res = getStringAttr(node, attr)
+            _jsonCache[key] = json.loads(res, object_pairs_hook=collections.OrderedDict) if res else defaults.copy()
+        return _copyJson(_jsonCache[key])
+    
+    res = getStringAttr(node, attr)
+    if not res:
+        return defaults.copy()
+    return json.loads(res, object_pairs_hook=collections.OrderedDict)
+
+
+def _setCachedJsonAttr(node, attr, value):
+    if _jsonCacheDepth:
+        _jsonCache[(node, attr)] = _copyJson(value)
+        _jsonCacheDirty[(node, attr)] = None
+    else:
+        setJsonAttr(node, attr, value)
+
        
 class JsonAccess(object):
     '''
     Auto tranform json data to/from a string.  Call in `with` statement and edit
     the result to automatically assign the changes.
+    
+    See `jsonCache()` to speed up lots of access.
     '''
     
     def __init__(self, attrname, defaults={}):
@@ -322,13 +395,10 @@ class JsonAccess(object):
         self.defaults = defaults
     
     def __get__(self, instance, owner):
-        res = getStringAttr(instance, self.attr)
-        if not res:
-            return Json(self.defaults.copy(), instance, self.attr)
-        return Json(json.loads(res, object_pairs_hook=collections.OrderedDict), instance, self.attr )
+        return Json(_getCachedJsonAttr(instance, self.attr, self.defaults), instance, self.attr)
             
     def __set__(self, instance, value):
-        setJsonAttr(instance, self.attr, value)
+        _setCachedJsonAttr(instance, self.attr, value)
 
 
 class IntAccess(object):
@@ -1,15 +1,27 @@
 from __future__ import absolute_import, division, print_function
 
 import collections
+import fnmatch
+import os
+import re
+import struct
+import sys
 
 from ..vendor.Qt import QtGui, QtWidgets
-from ..vendor.Qt.QtCore import QPoint
+from ..vendor.Qt.QtCore import QPoint, Qt
 
 import math
 
+try:
+    import numpy
+except ImportError:  # Only ships with maya 2022+
+    numpy = None
+
 
 __all__ = [
     'autoCropContent',
+    'autoCropFile',
+    'autoCropFolder',
     'identifyContent',
     'disperse',
     'grab',
@@ -32,6 +44,9 @@ def autoCropContent(img, chroma=None, padding=0, keepRatio=True):
     
     '''
     
+    if isinstance(img, QtGui.QPixmap):
+        img = img.toImage()
+    
     if not chroma  == 'alpha':
         
         if chroma is None:
@@ -70,67 +85,166 @@ def autoCropContent(img, chroma=None, padding=0, keepRatio=True):
     return cropped
 
 
+def autoCropFile(filename, dest=None, size=None, chroma=None, padding=0, keepRatio=True):
+    '''
+    Runs `autoCropContent` on the image file, returning True if it was saved.
+    
+    :dest: Where to save the result, defaults to overwriting the original.
+    :size: If given, scale the result to fit a square of this many pixels.
+    
+    The rest of the args are passed to `autoCropContent`.
+    '''
+    
+    img = QtGui.QImage(filename)
+    if img.isNull():
+        return False
+    
+    cropped = autoCropContent(img, chroma, padding, keepRatio)
+    
+    if size:
+        cropped = cropped.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    
+    return cropped.save(dest if dest else filename)
+
+
+def autoCropFolder(folder, pattern='*.png', outputFolder=None, removeSuffix='', size=None,
+                   chroma=None, padding=0, keepRatio=True):
+    '''
+    Runs `autoCropFile` on every image in the folder matching the pattern,
+    returning the list of files written.
+    
+    ex, make the shape icons from the `controllerShape.screenshotControlShapes()` results:
+        autoCropFolder(shapeFolder, '*_large.png', removeSuffix='_large', size=64)
+    
+    :outputFolder: Where to save the results, defaults to overwriting the originals.
+    :removeSuffix: Remove this from the end of the names (before the extension) when saving.
+    :size: If given, scale the results to fit a square of this many pixels.
+    
+    The rest of the args are passed to `autoCropFile`.
+    '''
+    
+    outputFolder = outputFolder if outputFolder else folder
+    if not os.path.exists(outputFolder):
+        os.makedirs(outputFolder)
+    
+    written = []
+    for filename in sorted(fnmatch.filter(os.listdir(folder), pattern)):
+        name, ext = os.path.splitext(filename)
+        if removeSuffix and name.endswith(removeSuffix):
+            name = name[:-len(removeSuffix)]
+        
+        dest = os.path.join(outputFolder, name + ext)
+        if autoCropFile(os.path.join(folder, filename), dest, size, chroma, padding, keepRatio):
+            written.append(dest)
+    
+    return written
+
+
 def identifyContent(img, chroma):
     ''' Taking a pixel at the give coord (or alpha), return the minimum rectangle containing content.
     
+    Returns the first and last columns and rows with content, or the whole image if empty.
+    
     Args:
-        img: A Pixmap
+        img: A QImage (a QPixmap is converted)
         chroma: Either a pixel representing the chromakey or 'alpha' to use the alpha channel.
     '''
-    #px = img.load()
-    #chroma = px[x, y]
+    
+    if isinstance(img, QtGui.QPixmap):
+        img = img.toImage()
+    
+    # As ARGB32, each pixel is a native uint32 identical to `img.pixel()`
+    if img.format() != QtGui.QImage.Format_ARGB32:
+        img = img.convertToFormat(QtGui.QImage.Format_ARGB32)
+    
+    if numpy:
+        bounds = _contentBoundsNumpy(img, chroma)
+    else:
+        bounds = _contentBounds(img, chroma)
+    
+    return bounds if bounds else (0, 0, img.width(), img.height())
+
+
+def _imageBytes(img):
+    bits = img.constBits()
+    if hasattr(bits, 'setsize'):  # PyQt gives a sip.voidptr that needs a size
+        bits.setsize(img.bytesPerLine() * img.height())
+    return bytes(bits)
+
 
+def _contentBoundsNumpy(img, chroma):
+    width, height = img.width(), img.height()
+    
+    pixels = numpy.frombuffer(_imageBytes(img), dtype=numpy.uint32)
+    pixels = pixels.reshape(height, img.bytesPerLine() // 4)[:, :width]
+    
     if chroma == 'alpha':
-        def column_is_empty(x):
-            for y in range(img.height()):
-                if QtGui.qAlpha(img.pixel(x, y)):
-                    return False
-            return True
-
-        def row_is_empty(y):
-            for x in range(img.width()):
-                if QtGui.qAlpha(img.pixel(x, y)):
-                    return False
-            return True
+        content = (pixels >> 24) != 0
+    else:
+        content = pixels != numpy.uint32(chroma & 0xFFFFFFFF)
+    
+    columns = numpy.flatnonzero(content.any(axis=0))
+    if not len(columns):
+        return None
+    
+    rows = numpy.flatnonzero(content.any(axis=1))
+    
+    return int(columns[0]), int(rows[0]), int(columns[-1]), int(rows[-1])
+
+
+def _contentBounds(img, chroma):
+    '''
+    Without numpy, each row is checked with regex/strip on the raw bytes so
+    only the rows are looped over in python.
+    '''
+    width, height = img.width(), img.height()
+    data = _imageBytes(img)
+    stride = img.bytesPerLine()
+    
+    if chroma == 'alpha':
+        # Only keep the alpha byte of each pixel
+        data = data[3 if sys.byteorder == 'little' else 0::4]
+        stride //= 4
+        unit = 1
+        
+        def leading(row):
+            return len(row) - len(row.lstrip(b'\0'))
+        
+        def trailing(row):
+            return len(row) - len(row.rstrip(b'\0'))
     
     else:
-        def column_is_empty(x):
-            for y in range(img.height()):
-                if img.pixel(x, y) != chroma:
-                    return False
-            return True
-
-        def row_is_empty(y):
-            for x in range(img.width()):
-                if img.pixel(x, y) != chroma:
-                    return False
-            return True
-
-    left = 0
-    right = img.width()
-    top = 0
-    bottom = img.height()
-    
-    # For each side, test a strip moving in until a pixel with content is found
-    for x in range(img.width()):
-        if not column_is_empty(x):
-            left = x
-            break
-
-    for x in range(img.width() - 1, 0, -1):
-        if not column_is_empty(x):
-            right = x
-            break
-
-    for y in range(img.height()):
-        if not row_is_empty(y):
+        unit = 4
+        key = struct.pack('=I', chroma & 0xFFFFFFFF)
+        # Reversing the row also reverses each pixel's bytes, keeping the matches pixel aligned.
+        head = re.compile(b'(?:' + re.escape(key) + b')*')
+        tail = re.compile(b'(?:' + re.escape(key[::-1]) + b')*')
+        
+        def leading(row):
+            return head.match(row).end()
+        
+        def trailing(row):
+            return tail.match(row[::-1]).end()
+    
+    rowLength = width * unit
+    left, top, right, bottom = width, None, 0, 0
+    
+    for y in range(height):
+        row = data[y * stride: y * stride + rowLength]
+        
+        start = leading(row)
+        if start == rowLength:
+            continue
+        
+        if top is None:
             top = y
-            break
-
-    for y in range(img.height() - 1, 0, -1):
-        if not row_is_empty(y):
-            bottom = y
-            break
+        bottom = y
+        
+        left = min(left, start // unit)
+        right = max(right, (rowLength - trailing(row)) // unit - 1)
+    
+    if top is None:
+        return None
     
     return left, top, right, bottom
 
@@ -2,7 +2,7 @@ from collections import OrderedDict
 
 import re
 
-from pymel.core import cmds, delete, ls, nt, sets, shadingNode
+from pymel.core import cmds, delete, ls, sets, shadingNode
 
 from .._add import path
 
@@ -67,6 +67,13 @@ namedColors = OrderedDict([
 digit = re.compile( r'\d*\.\d*' )
 
 
+# {rgba key: shader}, shared by `createShader`, `findShaders` and `assign` so
+# building controls doesn't search every shader for each one.  Entries are
+# verified when used so it can persist across scenes.
+if '_shaderCache' not in globals():
+    _shaderCache = {}
+
+
 def parseStr(s):
     '''
     Given a string, possibly a named color, convert it to an rgb+opacity list.
@@ -198,9 +205,53 @@ def createShader(color, name=''):
     
     shader.rename( name )
     
+    _shaderCache[_colorKey(color)] = shader
+    
     return shader
 
 
+def _colorKey(color):
+    '''
+    Returns a hashable rgba, rounded so tiny float differences share the same key.
+    '''
+    color = list(color)
+    if len(color) == 3:
+        color.append(1.0)
+    return tuple( round(float(c), 3) for c in color )
+
+
+def _shaderColor(shader):
+    opacity = 1 - shader.outTransparency.get()[0]
+    return list(shader.outColor.get()) + [opacity]
+
+
+def _shadingGroup(shader):
+    sgs = shader.outColor.listConnections(type='shadingEngine')
+    return sgs[0] if sgs else None
+
+
+def _cachedShader(color):
+    '''
+    Returns the (shader, shadingEngine) cached for the color if it still exists,
+    matches and is valid, otherwise None.
+    '''
+    key = _colorKey(color)
+    shader = _shaderCache.get(key)
+    if shader is None:
+        return None
+    
+    try:
+        if shader.exists() and similar(color, _shaderColor(shader)):
+            sg = _shadingGroup(shader)
+            if sg:
+                return shader, sg
+    except Exception:  # The node could be from a previous scene
+        pass
+    
+    del _shaderCache[key]
+    return None
+
+
 def listControlShaders():
     '''
     Return all the special control shaders in the scene.
@@ -240,8 +291,12 @@ def findShaders(color):
     '''
     shaders = []
     for shader in listControlShaders():
-        opacity = 1 - shader.outTransparency.get()[0]
-        if similar(color, list(shader.outColor.get()) + [opacity]):
+        shaderColor = _shaderColor(shader)
+        
+        # Since every shader was looked at anyway, remember them for later
+        _shaderCache.setdefault(_colorKey(shaderColor), shader)
+        
+        if similar(color, shaderColor):
             shaders.append(shader)
     return shaders
 
@@ -257,21 +312,21 @@ def assign(obj, color):
     if len(color) == 3:
         color = list(color) + [1.0]
     
-    shaders = findShaders(color)
-    if not shaders:
-        # No existing shader was found, so make it.
-        shader = createShader(color)
-        sg = shader.outColor.listConnections(type='shadingEngine')[0]
+    cached = _cachedShader(color)
+    if cached:
+        shader, sg = cached
     else:
-        # Matching shaders were found, find one that is valid.
-        for shader in shaders:
-            if shader.outColor.listConnections(type='shadingEngine'):
-                sg = shader.outColor.listConnections(type='shadingEngine')[0]
+        # Find an existing, valid, shader
+        for shader in findShaders(color):
+            sg = _shadingGroup(shader)
+            if sg:
                 break
-        # Or end up making one anyway.
+        # Or make one
         else:
             shader = createShader(color)
-            sg = shader.outColor.listConnections(type='shadingEngine')[0]
+            sg = _shadingGroup(shader)
+        
+        _shaderCache[_colorKey(color)] = shader
     
     # cmds is much faster, but `sets` vs `pymel.core.sets` has different args (pymel made it saner but I need speed)
     cmds.sets( cmds.listRelatives(obj.name(), type='nurbsSurface', f=True), e=True, fe=sg.name() )
@@ -290,31 +345,45 @@ def getShaders(obj):
     return shaders
 
 
-def compare(a, b):
+def _shaderKey(shader):
     '''
-    Return True if the two shaders are of the same type and have the same color
-    or texture.
+    Returns a key that is the same for shaders of the same type with the same
+    color and transparency, or the same texture.  None means it uses some other
+    input and isn't merged with anything.
     '''
-    if type(a) != type(b):
-        return False
+    name = shader.name()
     
-    try:
-        aColor = a.color.listConnections()
-        bColor = b.color.listConnections()
-    except Exception:
-        aColor = a.outColor.listConnections()
-        bColor = b.outColor.listConnections()
+    for colorAttr in ('color', 'outColor'):
+        if cmds.attributeQuery(colorAttr, node=name, exists=True):
+            break
+    else:
+        return None
     
-    if not aColor and not bColor:
-        if a.color.get() == b.color.get():
-            return True
-        
-    if aColor and bColor:
-        if isinstance(aColor[0], nt.File) and isinstance(bColor[0], nt.File):
-            if path.compare( aColor[0].fileTextureName.get(), bColor[0].fileTextureName.get() ):
-                return True
+    shaderType = cmds.nodeType(name)
     
-    return False
+    source = cmds.listConnections(name + '.' + colorAttr, s=True, d=False)
+    if source:
+        if cmds.nodeType(source[0]) != 'file':
+            return None
+        return (shaderType, 'texture', path.normalize( cmds.getAttr(source[0] + '.fileTextureName') ))
+    
+    key = [shaderType, 'color', tuple( cmds.getAttr(name + '.' + colorAttr)[0] )]
+    
+    for transparencyAttr in ('transparency', 'outTransparency'):
+        if cmds.attributeQuery(transparencyAttr, node=name, exists=True):
+            key.append( tuple( cmds.getAttr(name + '.' + transparencyAttr)[0] ) )
+            break
+    
+    return tuple(key)
+
+
+def compare(a, b):
+    '''
+    Return True if the two shaders are of the same type and have the same color
+    (and transparency) or texture.
+    '''
+    key = _shaderKey(a)
+    return key is not None and key == _shaderKey(b)
 
 
 def consolidate(reassign=True):
@@ -328,26 +397,37 @@ def consolidate(reassign=True):
     
     '''
     
-    shaders = [shadingEngine.surfaceShader.listConnections()[0] for shadingEngine in ls(type='shadingEngine') if shadingEngine.surfaceShader.listConnections()]
-    shaders.sort()
+    shadingEngines = OrderedDict()  # {shader: [shadingEngines]}
+    for shadingEngine in ls(type='shadingEngine'):
+        con = shadingEngine.surfaceShader.listConnections()
+        if con:
+            shadingEngines.setdefault(con[0], []).append(shadingEngine)
+    
+    # Group the shaders by key, the first (sorted) one of each is kept.
+    groups = OrderedDict()
+    for shader in sorted(shadingEngines):
+        key = _shaderKey(shader)
+        if key is not None:
+            groups.setdefault(key, []).append(shader)
     
     dups = []
     
-    for outerIndex, a in enumerate(shaders[:-1]):
-
-        for b in shaders[outerIndex + 1: len(shaders)]:
-            if a == b or b in dups:
-                continue
+    for shaders in groups.values():
+        keep, others = shaders[0], shaders[1:]
+        if not others:
+            continue
+        
+        if reassign:
+            # Move all the members at once
+            members = []
+            for dup in others:
+                for shadingEngine in shadingEngines[dup]:
+                    members += cmds.sets(shadingEngine.name(), q=True) or []
             
-            if compare(a, b):
-                if reassign:
-                    aSE = a.listConnections(type='shadingEngine')
-                    bSE = b.listConnections(type='shadingEngine')
-                    if aSE and bSE:
-                        for member in bSE[0].members():
-                            sets(aSE[0], edit=True, fe=member)
-                
-                dups.append(b)
+            if members:
+                cmds.sets(members, e=True, fe=shadingEngines[keep][0].name())
+        
+        dups += others
 
     dupNames = [dup.name() for dup in dups]
 
@@ -355,4 +435,4 @@ def consolidate(reassign=True):
         for dup in dups:
             delete(dup)
             
-    return dupNames
\ No newline at end of file
+    return dupNames
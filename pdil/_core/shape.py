@@ -1,3 +1,7 @@
+from collections import defaultdict
+import heapq
+import math
+
 from maya.api import OpenMaya
 from pymel.core import cmds, attributeQuery
 
@@ -8,6 +12,8 @@ __all__ = [
     'isValidNurbsCurve',
     'getNurbsShapes',
     'uniformPointsOnCurve',
+    'getMeshPoints',
+    'PointGrid',
 ]
 
 
@@ -56,4 +62,106 @@ def uniformPointsOnCurve(crv, count):
 
     points = [ _getPoint(crvFn, step * i) for i in range(count) ]
         
-    return points
\ No newline at end of file
+    return points
+
+
+def getMeshPoints(meshes):
+    ''' Returns the world positions of all the verts of the given meshes in a single list, ex [ [1,2,3], [3,5,9] ].
+    
+    Each mesh is read in a single call so it's much faster than `xform` on every vertex.
+    '''
+    toUI = OpenMaya.MDistance.internalToUI
+    
+    points = []
+    for mesh in meshes:
+        fn = OpenMaya.MFnMesh( capi.asDagPath(mesh) )
+        points += [ [toUI(p.x), toUI(p.y), toUI(p.z)] for p in fn.getPoints(OpenMaya.MSpace.kWorld) ]
+    return points
+
+
+class PointGrid(object):
+    ''' Buckets points into a uniform grid for fast nearest neighbor queries, ex:
+    
+        grid = PointGrid( getMeshPoints(meshes) )
+        grid.nearest( [1, 2, 3], 30 )  # Returns the squared distances of the 30 closest points
+    '''
+    
+    def __init__(self, points, pointsPerCell=8):
+        self.points = points
+        self.cells = defaultdict(list)
+        
+        if not points:
+            self.cellSize = 1.0
+            self.bounds = ((0, 0, 0), (0, 0, 0))
+            return
+        
+        low = [min(p[axis] for p in points) for axis in range(3)]
+        high = [max(p[axis] for p in points) for axis in range(3)]
+        
+        # Size the cells so each holds roughly `pointsPerCell` points assuming an even spread, which is close
+        # enough for meshes even though the points are on a surface.
+        sizes = [max(h - l, 0.000001) for l, h in zip(low, high)]
+        volume = sizes[0] * sizes[1] * sizes[2]
+        self.cellSize = max( (volume * pointsPerCell / len(points)) ** (1.0 / 3.0), max(sizes) / 256.0 )
+        
+        for i, point in enumerate(points):
+            self.cells[self._cell(point)].append(i)
+        
+        self.bounds = ( self._cell(low), self._cell(high) )
+    
+    def _cell(self, point):
+        size = self.cellSize
+        return ( int(math.floor(point[0] / size)), int(math.floor(point[1] / size)), int(math.floor(point[2] / size)) )
+    
+    def _shell(self, center, radius):
+        ''' Generates the occupied cells exactly `radius` cells away from `center`, skipping what is out of bounds.
+        '''
+        (lx, ly, lz), (hx, hy, hz) = self.bounds
+        cx, cy, cz = center
+        cells = self.cells
+        
+        for x in range( max(cx - radius, lx), min(cx + radius, hx) + 1 ):
+            edgeX = abs(x - cx) == radius
+            for y in range( max(cy - radius, ly), min(cy + radius, hy) + 1 ):
+                if edgeX or abs(y - cy) == radius:
+                    zRange = range( max(cz - radius, lz), min(cz + radius, hz) + 1 )
+                else:
+                    zRange = [z for z in set((cz - radius, cz + radius)) if lz <= z <= hz]
+                
+                for z in zRange:
+                    cell = (x, y, z)
+                    if cell in cells:
+                        yield cells[cell]
+    
+    def nearest(self, point, count):
+        ''' Returns the sorted squared distances of the `count` points closest to `point`.
+        '''
+        count = min(count, len(self.points))
+        if not count:
+            return []
+        
+        center = self._cell(point)
+        low, high = self.bounds
+        maxRadius = max( max(abs(c - l), abs(h - c)) for c, l, h in zip(center, low, high) )
+        # Closer shells are entirely outside the grid if the point is
+        minRadius = max( max(l - c, c - h, 0) for c, l, h in zip(center, low, high) )
+        
+        # Keep the closest `count` as a max heap (negated) so the worst is easy to replace.
+        px, py, pz = point
+        points = self.points
+        best = []
+        for radius in range(minRadius, maxRadius + 1):
+            for indices in self._shell(center, radius):
+                for i in indices:
+                    x, y, z = points[i]
+                    dist = (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2
+                    if len(best) < count:
+                        heapq.heappush(best, -dist)
+                    elif dist < -best[0]:
+                        heapq.heapreplace(best, -dist)
+            
+            # Everything in unsearched cells is farther than `radius` whole cells away
+            if len(best) == count and -best[0] <= (radius * self.cellSize) ** 2:
+                break
+        
+        return sorted(-d for d in best)
@@ -461,26 +461,31 @@ def autoRedistribute(layout):
 
 class ProgressHelper(object):
     amount = 0
+    enabled = True  # There is no window in batch mode
     
     @classmethod
     def update(cls, increment=1, status=None):
         kwargs = {} if not status else {'status': status}
         cls.amount += increment
-        progressWindow(e=True, progress=cls.amount, **kwargs )
+        if cls.enabled:
+            progressWindow(e=True, progress=cls.amount, **kwargs )
 
-    @staticmethod
-    def isCancelled():
-        return progressWindow(q=True, isCancelled=True)
+    @classmethod
+    def isCancelled(cls):
+        return cls.enabled and progressWindow(q=True, isCancelled=True)
 
 
 @contextlib.contextmanager
 def progressWin(title='', max=100, status=''):
-    ''' Helper for progressWindow, passes in args
+    ''' Helper for progressWindow, passes in args.  Only counts, without a window, in batch mode.
     '''
     ProgressHelper.amount = 0
-    progressWindow(title=title, max=max, status=status)
+    ProgressHelper.enabled = not cmds.about(batch=True)
+    if ProgressHelper.enabled:
+        progressWindow(title=title, max=max, status=status)
     yield ProgressHelper
-    progressWindow(endProgress=True)
+    if ProgressHelper.enabled:
+        progressWindow(endProgress=True)
 
 
 def notify(*args, **kwargs):
@@ -1,17 +1,26 @@
 from __future__ import print_function, absolute_import
 
+from array import array
+from bisect import bisect_left
 from collections import OrderedDict
+from itertools import compress, count
 try: # python 3 compatibility
     from itertools import izip as zip
 except ImportError:
     pass
 import json
+import mmap
 import os
+import struct
+import sys
 import tempfile
 import traceback
+import zlib
 
+from maya.api import OpenMaya
 from maya.api.OpenMayaAnim import MFnSkinCluster
 
+from pymel.internal.factories import apiUndo, ApiUndoItem
 from pymel.core import cmds, dt, duplicate, mel, listConnections, listRelatives, skinCluster, select, selected, PyNode, warning, polyUnite, delete, objExists, skinPercent
 
 from . import capi
@@ -19,11 +28,16 @@ from .. _add import shortName
 
 __all__ = [
     'get',
+    'getCompact',
+    'getCompactMany',
+    'compactToDict',
     'substGen',
     'processWeightData',
     'apply',
     'save',
     'load',
+    'saveBinary',
+    'loadBinary',
     'mergePieces',
     'weightChildren',
     'findRelatedSkinCluster',
@@ -136,96 +150,142 @@ def get_slow(mesh):
     return info
 
 
-def get(mesh):
+def _shapePath(mesh):
+    ''' Returns the dagPath of the non-intermediate shape of `mesh`, which can be the transform or shape.
     '''
-    Creates as dictionary that looks like the following:
+    shapes = cmds.listRelatives(str(mesh), s=True, ni=True, f=True)
+    return capi.asDagPath( shapes[0] if shapes else mesh )
+
+
+def _vertComponent(shapePath, vertIndices=None):
+    ''' Returns a vertex component MObject for the given indices, or the whole mesh if none are given.
+    '''
+    fnComp = OpenMaya.MFnSingleIndexedComponent()
+    comp = fnComp.create( OpenMaya.MFn.kMeshVertComponent )
+    if vertIndices is None:
+        fnComp.setCompleteData( OpenMaya.MFnMesh(shapePath).numVertices )
+    else:
+        fnComp.addElements( vertIndices )
+    return comp
+
+
+def _jointInfo(jointNames):
+    ''' Returns {<index into jointNames>: [<parent index (or name if not in jointNames)>, global_x, global_y, global_z]}
+    '''
+    joints = {}
+    
+    for i, j in enumerate(jointNames):
+        parent = cmds.listRelatives(j, p=True)
+        if parent:
+            try:
+                parent = jointNames.index( parent[0] )
+            except ValueError:
+                parent = parent[0]
+        else:
+            parent = None
+        
+        joints[i] = [parent] + cmds.xform(j, q=True, ws=True, t=True)
+    
+    return joints
+
+
+def getCompact(mesh):
+    '''
+    Like `get` but grabs all the weights in a single `MFnSkinCluster.getWeights` call, returning:
     
     {
-        'weights': [   ], # index is vertex index, value is list of bone, weight pairs
-        [0] = [ (<jn index>, .75), ('j2', .25) ]...
-        'jointNames': ['joint1', joint2]
-        'joints': {
-            <index into jointNames> : [<parent index into jointNames>, global_x, global_y, global_z]
-            ...
-        'required': [<index into jointNames/joints>]
-        }
+        'jointNames': ['joint1', joint2],
+        'joints': <same as `get`>,
+        'required': <same as `get`>,
+        'offsets': array('i'), # Vertex N's weights are at [ offsets[N]:offsets[N + 1] ] of influences/values
+        'influences': array('i'), # Index into jointNames
+        'values': array('d'),
     }
-    '''
     
-    ''' DEBUG
-    from pdil.core import capi
-    from maya.api.OpenMayaAnim import MFnSkinCluster
+    Use `compactToDict` to convert to the regular format.
+    '''
+    return _compact( _harvest(mesh) )
+
+
+def getCompactMany(meshes):
+    ''' Returns {mesh: `getCompact` output}.
+    '''
+    return OrderedDict( (mesh, getCompact(mesh)) for mesh in meshes )
+
+
+def _harvest(mesh):
+    ''' The part of `getCompact` that talks to maya, returning (jointNames, joints, dense weights, influence count).
     '''
-    
     skinClusterName = mel.findRelatedSkinCluster(mesh)
     
     skinClusterMObj = capi.asMObject( skinClusterName )
     skinFn = MFnSkinCluster( skinClusterMObj.object() )
     
-    #construct a dict mapping joint names to joint indices
-    jointApiIndices = {}
-
-    jointNames = []
-    #jointNameLookup = {}
+    # getWeights() columns are in influenceObjects() order, which sidesteps the garbage logical indices.
+    jointNames = [jointDagMObj.partialPathName() for jointDagMObj in skinFn.influenceObjects()]
+    
+    shapePath = _shapePath(mesh)
+    dense, influenceCount = skinFn.getWeights( shapePath, _vertComponent(shapePath) )
+    
+    return jointNames, _jointInfo(jointNames), list(dense), influenceCount
 
-    for i, jointDagMObj in enumerate(skinFn.influenceObjects()):
-        #jointApiIndices[ skinFn.indexForInfluenceObject( jointDagMObj ) ] = jointDagMObj.partialPathName()
-        jointApiIndices[ skinFn.indexForInfluenceObject( jointDagMObj ) ] = i
 
-        jointNames.append(jointDagMObj.partialPathName())
+def _compact(harvested):
+    ''' The part of `getCompact` that doesn't touch maya, pruning the zeros from the dense weights.
+    '''
+    jointNames, joints, dense, influenceCount = harvested
+    
+    # compress() skips the zeros at C speed so only the actual weights get touched in python.
+    nonZero = list( compress(count(), dense) )
+    
+    values = array( 'd', [dense[i] for i in nonZero] )
+    influences = array( 'i', [i % influenceCount for i in nonZero] )
+    # nonZero is sorted, so the start of each vertex is found with a binary search instead of walking every weight.
+    offsets = array( 'i', [bisect_left(nonZero, v * influenceCount) for v in xrange(len(dense) // influenceCount + 1)] )
+    
+    return {
+        'jointNames': jointNames,
+        'joints': joints,
+        'required': sorted(set(influences)),
+        'offsets': offsets,
+        'influences': influences,
+        'values': values,
+    }
 
-    weightListPlug = skinFn.findPlug( 'weightList', True )
-    weightListObj = weightListPlug.attribute()
-    weightsPlug = skinFn.findPlug( 'weights', True )
 
+def compactToDict(data):
+    ''' Converts the output of `getCompact` into the same format as `get`.
+    '''
+    offsets = data['offsets']
+    influences = data['influences']
+    values = data['values']
     
-    weights = [None] * mesh.vtx.count()  # Prebuilding the whole range is nearly instant, appending is probably slower
-    # since it will trigger resizing.
-    
-    for vertIdx in xrange(mesh.vtx.count()):  # noqa
-        # We need to use the api to query the physical indices used
-        weightsPlug.selectAncestorLogicalIndex( vertIdx, weightListObj )
-        activeJointIndices = weightsPlug.getExistingArrayAttributeIndices()
-        
-        # Values = cmds_getAttr( baseFmtStr % vertIdx + '.weights' )[0] # api 2.0 is 0.09 instead of  0.25
-        values = [weightsPlug.elementByLogicalIndex(i).asDouble() for i in activeJointIndices]
-        
-        try:
-            # If `i` isn't in jointApiIndices, that value is skipped.  Not sure why these garbage values are just left behind...
-            weights[vertIdx] = [ [jointApiIndices[idx], v] for idx, v in zip( activeJointIndices, values ) if idx in jointApiIndices]
-        except Exception:
-            raise
-            '''
-            weights[vertIdx] = []
-            # This gets hit when an influence object has been removed
-            for i, v in zip(activeJointIndices, values):
-                if v > 0.000001:
-                    weights[vertIdx].append( (jointApiIndices[i], v) )
-            '''
-    
-    # Prune out the unused joints (Maybe make an option?)
-    joints = {}
-    requiredJoints = set()
-    for wgt in weights:
-        for j, v in wgt:
-            requiredJoints.add(j)
+    weights = [
+        [ [jnt, val] for jnt, val in zip(influences[start:end], values[start:end]) ]
+        for start, end in zip(offsets, offsets[1:])
+    ]
     
-    def parentName(jnt):
-        parent = cmds.listRelatives(j, p=True)
-        if parent:
-            try:
-                return jointNames.index( parent[0] )
-            except ValueError:
-                return parent[0]
+    return {'weights': weights, 'joints': data['joints'], 'jointNames': data['jointNames'], 'required': list(data['required'])}
 
-        return None
 
-    # Save the joint's parent and worldspace position, for possible future use/issue detection.
-    for i, j in enumerate(jointNames):
-        joints[i] = [parentName(j)] + cmds.xform(j, q=True, ws=True, t=True)
+def get(mesh):
+    '''
+    Creates as dictionary that looks like the following:
+    
+    {
+        'weights': [   ], # index is vertex index, value is list of bone, weight pairs
+        [0] = [ (<jn index>, .75), ('j2', .25) ]...
+        'jointNames': ['joint1', joint2]
+        'joints': {
+            <index into jointNames> : [<parent index into jointNames>, global_x, global_y, global_z]
+            ...
+        'required': [<index into jointNames/joints>]
+        }
+    }
     
-    # required is built as a set, but then changed to a list for easy json serialization
-    return {'weights': weights, 'joints': joints, 'jointNames': jointNames, 'required': list(requiredJoints)}
+    Zero weights are not included.  See `getCompact` for a smaller, faster format.
+    '''
+    return compactToDict( getCompact(mesh) )
 
 
 def get_old(mesh):
@@ -421,6 +481,9 @@ def apply(mesh, weight_data, targetVerts=None):
         vertIndex: [ (jointA, val), (jointB, val) ]
     ]
     
+    The output of `getCompact` can be used as well.
+    
+    All the weights are set with a single, undoable, `MFnSkinCluster.setWeights` call.
     '''
     
     '''
@@ -433,7 +496,13 @@ def apply(mesh, weight_data, targetVerts=None):
 
     requiredJoints = [jointNames[index] for index in weight_data['required']]
     
-    weights = weight_data['weights']
+    if 'weights' in weight_data:
+        weights = weight_data['weights']
+        vertCount = len(weights)
+    else:
+        weights = None
+        offsets = weight_data['offsets']
+        vertCount = len(offsets) - 1
     
     #joints = weight_data['joints']
     missing = [j for j in requiredJoints if not objExists(j)]
@@ -466,53 +535,58 @@ def apply(mesh, weight_data, targetVerts=None):
     skinClusterMObj = capi.asMObject( skinClusterName )
     skinFn = MFnSkinCluster( skinClusterMObj.object() )
     
-    #construct a dict mapping joint names to joint indices
-    jointApiIndices = {}
-
-    for jointDagMObj in skinFn.influenceObjects():
-        #jointApiIndices[ jointDagMObj.partialPathName() ] = skinFn.indexForInfluenceObject( jointDagMObj )
+    # Map the jointNames indices to the column in the weight buffer, which is the influenceObjects() order.
+    columns = {}
+    influenceObjects = skinFn.influenceObjects()
+    for column, jointDagMObj in enumerate(influenceObjects):
         # Might need to more rigorously verify, catching objs with the same
-        jointApiIndices[ jointNames.index(jointDagMObj.partialPathName()) ] = skinFn.indexForInfluenceObject( jointDagMObj )
-        
-    weightListPlug = skinFn.findPlug( 'weightList', True )
-    weightListObj = weightListPlug.attribute()
-    weightsPlug = skinFn.findPlug( 'weights', True )
+        name = jointDagMObj.partialPathName()
+        if name in jointNames:
+            columns[ jointNames.index(name) ] = column
     
-    # Prebuild the string for speed
-    baseFmtStr = skinClusterName + '.weightList[%d]'
-    # Set mel commands for direct local access, which could provide a slight speed benefit
-    #cmds_setAttr = cmds.setAttr
-    cmds_removeMultiInstance  = cmds.removeMultiInstance
+    influenceCount = len(influenceObjects)
     
+    shapePath = _shapePath(mesh)
+    meshVertCount = OpenMaya.MFnMesh(shapePath).numVertices
+    if meshVertCount != vertCount:
+        warning( '{} has {} verts but the weights are for {}, only the shared ones will be weighted'.format(mesh, meshVertCount, vertCount) )
+    
+    # Sorted, unique and on both the mesh and data so the buffer rows line up with the component
+    sharedCount = min(vertCount, meshVertCount)
     if not targetVerts:
-        targetVerts = xrange(len(weights))
-        
-    for vertIdx in targetVerts:
-        
-        jointsAndWeights = weights[vertIdx]
-        #cmds_removeMultiInstance( baseFmtStr % vertIdx )  # Removing parent element is not faster.
+        targetVerts = list(range(sharedCount))
+    else:
+        targetVerts = sorted( {int(vertIdx) for vertIdx in targetVerts if int(vertIdx) < sharedCount} )
+    
+    if not targetVerts:
+        return
+    
+    # Dense buffer, so every influence not in the data (the stale ones) get zeroed out too.
+    values = OpenMaya.MDoubleArray( len(targetVerts) * influenceCount, 0.0 )
+    
+    for row, vertIdx in enumerate(targetVerts):
+        base = row * influenceCount
         
-        #we need to use the api to query the physical indices used
-        vertIdx = int(vertIdx)
-        weightsPlug.selectAncestorLogicalIndex( vertIdx, weightListObj )
-        activeJointIndices = weightsPlug.getExistingArrayAttributeIndices()
+        if weights is not None:
+            jointsAndWeights = weights[vertIdx]
+        else:
+            start, end = offsets[vertIdx], offsets[vertIdx + 1]
+            jointsAndWeights = zip( weight_data['influences'][start:end], weight_data['values'][start:end] )
         
-        weightFmtStr = baseFmtStr % vertIdx + '.weights[%d]'
-        # Can't find a way to do this in the api, so call it as little as possible.  Down to .25 with identical weights (.2 bypassing the check).
-        for jointIndex in set(activeJointIndices).difference( [jointApiIndices[ joint ] for joint, w in jointsAndWeights] ):
-            cmds_removeMultiInstance( weightFmtStr % jointIndex )
-            
-        # Need to test if api 2.0 is faster than mel
         for joint, weight in jointsAndWeights:
             if weight:
-                influenceIndex = jointApiIndices[ joint ]
-                #cmds_setAttr( weightFmtStr % influenceIndex, weight )  # Using the api takes it from 1.6 to .9s!
-                weightsPlug.elementByLogicalIndex(influenceIndex).setDouble(weight)
-                try:
-                    activeJointIndices.remove(influenceIndex)
-                except Exception:
-                    pass
-
+                values[ base + columns[joint] ] = weight
+    
+    comp = _vertComponent( shapePath, targetVerts )
+    influenceIndices = OpenMaya.MIntArray( range(influenceCount) )
+    
+    oldValues = skinFn.setWeights( shapePath, comp, influenceIndices, values, False, True )
+    
+    apiUndo.append( ApiUndoItem(
+        skinFn.setWeights,
+        (shapePath, comp, influenceIndices, values, False),
+        (shapePath, comp, influenceIndices, oldValues, False),
+    ) )
 
 
 def apply_old(mesh, weight_data, targetVerts=None):
@@ -605,53 +679,244 @@ def apply_old(mesh, weight_data, targetVerts=None):
                     pass
     
 
-def save(objs=None, outfile=''):
-    
+def save(objs=None, outfile='', binary=False, compressed=True):
+    ''' Save the weights of the given objects (or selection) to a json file or, if `binary`, the format
+    described in `saveBinary`.
+    '''
     if not outfile:
         tempdir = tempfile.gettempdir() + '/pdil'
         if not os.path.exists(tempdir):
             os.makedirs(tempdir)
         
-        outfile = tempdir + '/temp_weights.json'
+        outfile = tempdir + ('/temp_weights.bin' if binary else '/temp_weights.json')
 
     if not objs:
         objs = selected()
     
-    allWeights = {}
+    names = [s.fullPath() for s in objs]
+    
+    if binary:
+        encoded = [_encodeBinary( getCompact(s), compressed, _BINARY_CHUNK_SIZE ) for s in objs]
+        _writeBinary( zip(names, encoded), outfile, compressed, _BINARY_CHUNK_SIZE )
+        return
     
-    for s in objs:
-        allWeights[s.fullPath()] = get(s)
+    encoded = [json.dumps( compactToDict( getCompact(s) ), indent=4 ) for s in objs]
     
     with open(outfile, 'w') as fid:
-        json.dump(allWeights, fid, indent=4)
+        fid.write( '{\n' + ',\n'.join( json.dumps(name) + ': ' + text for name, text in zip(names, encoded) ) + '\n}' )
+
+
+_BINARY_MAGIC = b'PDILWGT1'
+_BINARY_CHUNK_SIZE = 4096
+
+
+def _toBytes(arr):
+    ''' Little endian bytes of the array.
+    '''
+    if sys.byteorder == 'big':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    
+    return arr.tobytes() if hasattr(arr, 'tobytes') else arr.tostring()
+
+
+def _fromBytes(typecode, data):
+    arr = array(typecode)
+    if hasattr(arr, 'frombytes'):
+        arr.frombytes(data)
+    else:
+        arr.fromstring(data)
+    
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    
+    return arr
+
+
+def saveBinary(allWeights, outfile, compressed=True, chunkSize=_BINARY_CHUNK_SIZE):
+    ''' Writes {<mesh name>: <`getCompact` output>} to a binary file, much smaller and faster than json.
+    
+    Layout:
+        _BINARY_MAGIC
+        uint32 header length
+        json header {'compressed', 'chunkSize', 'meshes': {<mesh>: {'jointNames', 'joints', 'required', 'vertCount', 'chunks'}}}
+        chunks
+    
+    Each chunk is `chunkSize` verts of int32 counts, int32 influences then float64 values, optionally
+    zlib compressed.  'chunks' is a list of [byte offset (after the header), byte length, number of weights]
+    so only the chunks needed for a partial load get read.
+    '''
+    encoded = [_encodeBinary(data, compressed, chunkSize) for data in allWeights.values()]
+    _writeBinary( zip(allWeights.keys(), encoded), outfile, compressed, chunkSize )
+
+
+def _encodeBinary(data, compressed, chunkSize):
+    ''' Returns the `saveBinary` header info and the chunk bytes for a single mesh, chunk offsets are relative
+    to the start of this mesh's bytes.
+    '''
+    offsets = data['offsets']
+    vertCount = len(offsets) - 1
+    chunks = []
+    blobs = []
+    pos = 0
+    
+    for startVert in xrange(0, vertCount, chunkSize):
+        endVert = min(startVert + chunkSize, vertCount)
+        start, end = offsets[startVert], offsets[endVert]
         
+        counts = array( 'i', [offsets[v + 1] - offsets[v] for v in xrange(startVert, endVert)] )
+        blob = _toBytes(counts) + _toBytes(data['influences'][start:end]) + _toBytes(data['values'][start:end])
+        if compressed:
+            blob = zlib.compress(blob)
         
-def _loadTempWeight():
-    directions = tempfile.gettempdir() + '/pdil/temp_weights.json'
+        chunks.append( [pos, len(blob), end - start] )
+        blobs.append(blob)
+        pos += len(blob)
+    
+    info = {
+        'jointNames': data['jointNames'],
+        'joints': data['joints'],
+        'required': list(data['required']),
+        'vertCount': vertCount,
+        'chunks': chunks,
+    }
+    
+    return info, b''.join(blobs)
+
+
+def _writeBinary(encodedMeshes, outfile, compressed, chunkSize):
+    ''' Writes the [(<mesh name>, <`_encodeBinary` output>), ...] to the `saveBinary` format.
+    '''
+    header = {'compressed': compressed, 'chunkSize': chunkSize, 'meshes': OrderedDict()}
+    blobs = []
+    pos = 0
+    
+    for mesh, (info, blob) in encodedMeshes:
+        for chunk in info['chunks']:
+            chunk[0] += pos
+        header['meshes'][mesh] = info
+        blobs.append(blob)
+        pos += len(blob)
     
-    if not os.path.exists(directions):
-        warning('Temp file of weights not found, ' + directions)
+    headerBytes = json.dumps(header).encode('utf-8')
+    
+    with open(outfile, 'wb') as fid:
+        fid.write(_BINARY_MAGIC)
+        fid.write( struct.pack('<I', len(headerBytes)) )
+        fid.write(headerBytes)
+        for blob in blobs:
+            fid.write(blob)
+
+
+def loadBinary(filename, targetVerts=None):
+    ''' Reads a file made by `saveBinary`, returning {<mesh name>: <`getCompact` style data>}.
+    
+    If `targetVerts` is given, only the chunks containing them are read, the other verts have no weights.
+    '''
+    allWeights = OrderedDict()
+    
+    with open(filename, 'rb') as fid:
+        mm = mmap.mmap(fid.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if mm[:len(_BINARY_MAGIC)] != _BINARY_MAGIC:
+                raise IOError( '{} is not a binary weight file'.format(filename) )
+            
+            headerStart = len(_BINARY_MAGIC) + 4
+            headerLength = struct.unpack( '<I', mm[len(_BINARY_MAGIC):headerStart] )[0]
+            header = json.loads( mm[headerStart:headerStart + headerLength].decode('utf-8') )
+            dataStart = headerStart + headerLength
+            chunkSize = header['chunkSize']
+            
+            neededChunks = None if targetVerts is None else {int(v) // chunkSize for v in targetVerts}
+            
+            for mesh, info in header['meshes'].items():
+                vertCount = info['vertCount']
+                counts = array('i', [0]) * vertCount
+                influences = array('i')
+                values = array('d')
+                
+                for i, (pos, length, weightCount) in enumerate(info['chunks']):
+                    if neededChunks is not None and i not in neededChunks:
+                        continue
+                    
+                    blob = mm[dataStart + pos:dataStart + pos + length]
+                    if header['compressed']:
+                        blob = zlib.decompress(blob)
+                    
+                    startVert = i * chunkSize
+                    chunkVerts = min(chunkSize, vertCount - startVert)
+                    countsEnd = chunkVerts * 4
+                    influencesEnd = countsEnd + weightCount * 4
+                    
+                    counts[startVert:startVert + chunkVerts] = _fromBytes('i', blob[:countsEnd])
+                    influences += _fromBytes('i', blob[countsEnd:influencesEnd])
+                    values += _fromBytes('d', blob[influencesEnd:])
+                
+                offsets = array('i', [0])
+                total = 0
+                for c in counts:
+                    total += c
+                    offsets.append(total)
+                
+                allWeights[mesh] = {
+                    'jointNames': info['jointNames'],
+                    'joints': {int(index): jointInfo for index, jointInfo in info['joints'].items()},  # json made the keys strings
+                    'required': info['required'],
+                    'offsets': offsets,
+                    'influences': influences,
+                    'values': values,
+                }
+        finally:
+            mm.close()
+    
+    return allWeights
+
+
+def _isBinaryWeightFile(filename):
+    with open(filename, 'rb') as fid:
+        return fid.read(len(_BINARY_MAGIC)) == _BINARY_MAGIC
+
+
+def _readWeightFile(filename, targetVerts=None):
+    ''' Loads either a json or binary weight file.
+    '''
+    if _isBinaryWeightFile(filename):
+        return loadBinary(filename, targetVerts)
+    
+    with open(filename, 'r') as fid:
+        return json.load(fid)
+
+
+def _loadTempWeight(targetVerts=None):
+    ''' Loads the most recently saved temp weight file, json or binary.
+    '''
+    tempdir = tempfile.gettempdir() + '/pdil'
+    existing = [f for f in (tempdir + '/temp_weights.json', tempdir + '/temp_weights.bin') if os.path.exists(f)]
+    
+    if not existing:
+        warning('Temp file of weights not found, ' + tempdir + '/temp_weights.json')
         return None
-        
-    with open(directions, 'r') as fid:
-        data = json.load(fid)
     
-    return data
+    return _readWeightFile( max(existing, key=os.path.getmtime), targetVerts )
         
         
-def load(jsonfile='', subst={}, remove=[], replace=OrderedDict()):
+def load(jsonfile='', subst={}, remove=[], replace=OrderedDict(), targetVerts=None):
+    ''' Loads weights saved by `save`, json or binary.  `targetVerts` limits which verts are applied, and
+    read from binary files.
+    '''
     if not jsonfile:
-        data = _loadTempWeight()
+        data = _loadTempWeight(targetVerts)
     else:
-        with open(jsonfile, 'r') as fid:
-            data = json.load(fid)
+        data = _readWeightFile(jsonfile, targetVerts)
     
     for mesh, weightData in data.items():
         
         if subst or remove or replace:
+            if 'weights' not in weightData:
+                weightData = compactToDict(weightData)
             processWeightData(weightData, subst, remove, replace)
         
-        apply( PyNode(mesh), weightData)
+        apply( PyNode(mesh), weightData, targetVerts)
     
         
 def __load(targetMesh, targetSkeletonRoot):
@@ -1,7 +1,11 @@
 import collections
 from itertools import chain
 import json
+import zlib
 
+from maya.api import OpenMaya, OpenMayaAnim
+
+from pymel.internal.factories import apiUndo, ApiUndoItem
 from pymel.core import cmds, keyframe, selected, currentTime, PyNode, setAttr, hasAttr, setKeyframe, copyKey, pasteKey, warning, delete, exportSelected, playbackOptions, createNode, listAttr, select, objExists, cutKey, setDrivenKeyframe, keyTangent, dt, nt
 
 #from ..add import findFromIds, getIds, simpleName
@@ -19,6 +23,9 @@ __all__ = [
     'findKeyTimes',
     'save',
     'load',
+    'saveClip',
+    'loadClip',
+    'bakeKeys',
     'findSetDrivenKeys',
     'applySetDrivenKeys',
     'curveToData',
@@ -110,6 +117,37 @@ def _processAttr(plug, dups, forceKeys, staticValues, start, end):
 
 SavedCurveInfo = collections.namedtuple( 'SavedCurveInfo', 'start end length' )
 
+CLIP_EXTENSION = '.fclip'
+
+
+def _animatablePlugs(objs):
+    ''' Generates the plugs strings of t/r/s/v and user defined keyable attrs of the objs, used by `save`/`saveClip`.
+    '''
+    defaultAttrs = [t + a for t in 'trs' for a in 'xyz' ] + ['visibility']
+    
+    for obj in objs:
+        zooHack = ['ikBlend'] if obj.hasAttr('ikBlend') else []  # Since use uses builtin ik trans, this doesn't get picked up.
+        
+        if obj.hasAttr('tx'):
+            attrs = chain( listAttr( obj.name(), ud=True, k=True ), defaultAttrs, zooHack )
+        else:
+            attrs = chain( listAttr( obj.name(), ud=True, k=True ), zooHack )
+
+        for attr in attrs:
+            yield obj.name() + '.' + attr
+
+
+def _playbackRange(start, end):
+    if start is None:
+        start = playbackOptions(q=True, min=True)
+    if end is None:
+        end = playbackOptions(q=True, max=True)
+
+    if start >= end:
+        end = start + 1
+    
+    return start, end
+
 
 def save(filename, objs=None, forceOverwrite=False, forceKeys=False, start=None, end=None):
     '''
@@ -119,6 +157,8 @@ def save(filename, objs=None, forceOverwrite=False, forceKeys=False, start=None,
     :param bool forceOverwrite: Allow prompting if the dest file already exists
     :param bool forceKeys: Put keys on the objects
     
+    If filename ends with `CLIP_EXTENSION`, `saveClip` is used instead.
+    
     ..  todo::
         * Check if an attribute ISN'T keyed in the source and mark the static
             value somehow.  Specifically, if parent/world stuff isn't present,
@@ -134,6 +174,9 @@ def save(filename, objs=None, forceOverwrite=False, forceKeys=False, start=None,
     #setAttr = cmds.setAttr
     #duplicate = cmds.duplicate
     # ---
+    if filename.endswith(CLIP_EXTENSION):
+        return saveClip(filename, objs=objs, forceKeys=forceKeys, start=start, end=end)
+    
     sel = selected()
     objs = objs if objs else selected()
     
@@ -142,32 +185,16 @@ def save(filename, objs=None, forceOverwrite=False, forceKeys=False, start=None,
     info.addAttr('end', at='long')
     info.addAttr('staticValues', dt='string')
 
-    if start is None:
-        start = playbackOptions(q=True, min=True)
-    if end is None:
-        end = playbackOptions(q=True, max=True)
-
-    if start >= end:
-        end = start + 1
+    start, end = _playbackRange(start, end)
 
     info.start.set( start )
     info.end.set( end )
     
-    defaultAttrs = [t + a for t in 'trs' for a in 'xyz' ] + ['visibility']
-    
     dups = []
     staticValues = {}
     
-    for obj in objs:
-        zooHack = ['ikBlend'] if obj.hasAttr('ikBlend') else []  # Since use uses builtin ik trans, this doesn't get picked up.
-        
-        if obj.hasAttr('tx'):
-            attrs = chain( listAttr( obj.name(), ud=True, k=True ), defaultAttrs, zooHack )
-        else:
-            attrs = chain( listAttr( obj.name(), ud=True, k=True ), zooHack )
-
-        for attr in attrs:
-            _processAttr(obj.name() + '.' + attr, dups, forceKeys, staticValues, start, end)
+    for plug in _animatablePlugs(objs):
+        _processAttr(plug, dups, forceKeys, staticValues, start, end)
 
     if not dups:
         warning("Nothing was animated")
@@ -181,60 +208,17 @@ def save(filename, objs=None, forceOverwrite=False, forceKeys=False, start=None,
     delete(dups)
 
 
-def load(filename, insertTime=None, alterPlug=None, bufferKeys=True, targetPool=None):
-    '''
-    Loads a file containing animCurves (made with `save`) and hooks them up.
-    
-    :param func alterPlug:  If the input needs some sort of transformation, provide
-        a function that takes the plug string, ex "someSphere.tx" and returns
-        a plug string of how it maps back, ex "zCube.tx" or "zCube.ty" and
-        a function to alter the curve (or None)
-
-        def alterPlug( 'inputNode.attr' ):
-            return 'transformed', <curve altering func>
-        
-    :param bool bufferKeys: If True (default), will add keys a frame before and
-        after the range.
+def _buildAlter(sourcePlugs, existingSelection, alterPlug, targetPool):
+    ''' Used by `load` and `loadClip` to make a function mapping the saved plugs to the ones in the scene, returning
+    (<new plug>, <curve altering func or None>), or None if no mapping is needed.
     '''
-    global TAGGING_ATTR
-    global _loadAlterPlug
-    
-    existingSelection = selected()
-    
-    # Hook for easily providing an alterPlug via the GUI
-    if _loadAlterPlug and not alterPlug:
-        alterPlug = _loadAlterPlug
-        
-    # Using cmds for speed
-    getAttr = cmds.getAttr
-    objExists = cmds.objExists
-    ls = cmds.ls
-    # ---
-    
-    if insertTime is None:
-        insertTime = currentTime(q=True)
-    
-    missingObj = set()
-    missingAttr = []
-    pasteError = []
-    
-    newNodes = cmds.file( filename, i=True, rnn=True )
-    
-    curves = cmds.ls(newNodes, type='animCurve')
-    info = ls(newNodes, type='network')[0]
-    
-    start = getAttr( info + '.start' )
-    end = getAttr( info + '.end' )
-    length = end - start
-    
-    attr = '.' + TAGGING_ATTR
     
     singleObj = ''
     
-    if len(existingSelection) == 1:
-        targetObj = getAttr( curves[0] + attr ).split('.')[0]
-        for c in curves:
-            loadedTarget = getAttr( c + attr ).split('.')[0]
+    if len(existingSelection) == 1 and sourcePlugs:
+        targetObj = sourcePlugs[0].split('.')[0]
+        for plug in sourcePlugs:
+            loadedTarget = plug.split('.')[0]
             # FKIK_SWITCH is a hack to deal with the switching attr if a single
             # obj is selected
             if loadedTarget != targetObj and not loadedTarget.endswith('FKIK_SWITCH'):
@@ -250,9 +234,9 @@ def load(filename, insertTime=None, alterPlug=None, bufferKeys=True, targetPool=
     else:
         # Determine if there is a namespace mismatch
         if alterPlug:
-            targets = [ alterPlug(cmds.getAttr(crv + attr ))[0].split('.')[0] for crv in curves ]
+            targets = [ alterPlug(plug)[0].split('.')[0] for plug in sourcePlugs ]
         else:
-            targets = [ cmds.getAttr(crv + attr ).split('.')[0] for crv in curves ]
+            targets = [ plug.split('.')[0] for plug in sourcePlugs ]
             
         changeNamespace = None
         
@@ -285,6 +269,64 @@ def load(filename, insertTime=None, alterPlug=None, bufferKeys=True, targetPool=
             def alter(plug):
                 return changeNamespace(plug), None
     
+    return alter
+
+
+def load(filename, insertTime=None, alterPlug=None, bufferKeys=True, targetPool=None):
+    '''
+    Loads a file containing animCurves (made with `save`) and hooks them up.
+    
+    :param func alterPlug:  If the input needs some sort of transformation, provide
+        a function that takes the plug string, ex "someSphere.tx" and returns
+        a plug string of how it maps back, ex "zCube.tx" or "zCube.ty" and
+        a function to alter the curve (or None)
+
+        def alterPlug( 'inputNode.attr' ):
+            return 'transformed', <curve altering func>
+        
+    :param bool bufferKeys: If True (default), will add keys a frame before and
+        after the range.
+    
+    If filename ends with `CLIP_EXTENSION`, `loadClip` is used instead.
+    '''
+    global TAGGING_ATTR
+    global _loadAlterPlug
+    
+    if filename.endswith(CLIP_EXTENSION):
+        return loadClip(filename, insertTime=insertTime, alterPlug=alterPlug, bufferKeys=bufferKeys, targetPool=targetPool)
+    
+    existingSelection = selected()
+    
+    # Hook for easily providing an alterPlug via the GUI
+    if _loadAlterPlug and not alterPlug:
+        alterPlug = _loadAlterPlug
+        
+    # Using cmds for speed
+    getAttr = cmds.getAttr
+    objExists = cmds.objExists
+    ls = cmds.ls
+    # ---
+    
+    if insertTime is None:
+        insertTime = currentTime(q=True)
+    
+    missingObj = set()
+    missingAttr = []
+    pasteError = []
+    
+    newNodes = cmds.file( filename, i=True, rnn=True )
+    
+    curves = cmds.ls(newNodes, type='animCurve')
+    info = ls(newNodes, type='network')[0]
+    
+    start = getAttr( info + '.start' )
+    end = getAttr( info + '.end' )
+    length = end - start
+    
+    attr = '.' + TAGGING_ATTR
+    
+    alter = _buildAlter( [getAttr(c + attr) for c in curves], existingSelection, alterPlug, targetPool )
+    
     if hasAttr(PyNode(info), 'staticValues'):
         keys = json.loads(core.text.asciiDecompress( getAttr(info + '.staticValues')))
 
@@ -332,6 +374,14 @@ def load(filename, insertTime=None, alterPlug=None, bufferKeys=True, targetPool=
                 else:
                     missingObj.add( obj )
                     
+    _reportLoadErrors(missingObj, missingAttr, pasteError)
+        
+    delete( newNodes )
+    
+    return SavedCurveInfo( insertTime, insertTime + length, length )
+
+
+def _reportLoadErrors(missingObj, missingAttr, pasteError):
     if missingObj:
         print( core.text.writeInBox( "These objects don't exist:\n\n" + '\n'.join(missingObj) ) )
     if missingAttr:
@@ -341,8 +391,234 @@ def load(filename, insertTime=None, alterPlug=None, bufferKeys=True, targetPool=
         
     if missingObj or missingAttr or pasteError:
         warning( 'Completed but with errors. See script editor for details.' )
+
+
+def _curveToClipData(fn, start, end):
+    ''' Returns the keys of MFnAnimCurve `fn` between start and end (inclusive) as the `saveClip` curve format.
+    '''
+    uiUnit = OpenMaya.MTime.uiUnit()
+    
+    data = {
+        'type': fn.animCurveType,
+        'weighted': fn.isWeighted,
+        'preInfinity': fn.preInfinityType,
+        'postInfinity': fn.postInfinityType,
+        'times': [],
+        'values': [],
+        'inType': [],
+        'outType': [],
+        'inAngle': [],
+        'outAngle': [],
+        'inWeight': [],
+        'outWeight': [],
+        'locked': [],
+    }
+    
+    for i in range(fn.numKeys):
+        time = fn.input(i).asUnits(uiUnit)
+        if time < start or time > end:
+            continue
         
-    delete( newNodes )
+        inAngle, inWeight = fn.getTangentAngleWeight(i, True)
+        outAngle, outWeight = fn.getTangentAngleWeight(i, False)
+        
+        data['times'].append( time )
+        data['values'].append( fn.value(i) )
+        data['inType'].append( fn.inTangentType(i) )
+        data['outType'].append( fn.outTangentType(i) )
+        data['inAngle'].append( inAngle.asRadians() )
+        data['outAngle'].append( outAngle.asRadians() )
+        data['inWeight'].append( inWeight )
+        data['outWeight'].append( outWeight )
+        data['locked'].append( fn.tangentsLocked(i) )
+    
+    # Animated but not keyed in the range, so hold the value.
+    if not data['times']:
+        data['times'].append( start )
+        data['values'].append( fn.evaluate( OpenMaya.MTime(start, uiUnit) ) )
+        data['inType'].append( OpenMayaAnim.MFnAnimCurve.kTangentFlat )
+        data['outType'].append( OpenMayaAnim.MFnAnimCurve.kTangentFlat )
+        data['inAngle'].append( 0.0 )
+        data['outAngle'].append( 0.0 )
+        data['inWeight'].append( 1.0 )
+        data['outWeight'].append( 1.0 )
+        data['locked'].append( True )
+    
+    return data
+
+
+def saveClip(filename, objs=None, forceKeys=False, start=None, end=None):
+    '''
+    Like `save` but reads the curves through the api and writes them straight to a
+    compressed json file instead of duplicating the curves and exporting a maya file.
+    
+    The file is {'start', 'end', 'staticValues', 'curves': {<plug>: <curve data>}}
+    where each curve has the keys stored in parallel lists of times, values, tangent
+    types, angles (radians) and weights.
+    '''
+    objs = objs if objs else selected()
+    
+    start, end = _playbackRange(start, end)
+    
+    curves = {}
+    staticValues = {}
+    
+    for plug in _animatablePlugs(objs):
+        crvs = cmds.listConnections( plug, type='animCurve' )
+        
+        if not crvs:
+            if forceKeys:
+                setKeyframe( plug, t=start )
+                setKeyframe( plug, t=end )
+                crvs = cmds.listConnections( plug, type='animCurve' )
+            else:
+                if not cmds.getAttr(plug, lock=True) and not cmds.listConnections(plug, s=True, d=False):
+                    staticValues[plug] = cmds.getAttr(plug)
+        
+        if crvs:
+            fn = OpenMayaAnim.MFnAnimCurve( core.capi.asMObject(crvs[0]).object() )
+            curves[plug] = _curveToClipData(fn, start, end)
+    
+    if not curves:
+        warning("Nothing was animated")
+        return
+    
+    clip = {'start': start, 'end': end, 'staticValues': staticValues, 'curves': curves}
+    
+    with open(filename, 'wb') as fid:
+        fid.write( zlib.compress( json.dumps(clip).encode('utf-8') ) )
+
+
+class _ClipUndo(object):
+    ''' Bundles the curve creation and key changes made through the api by `loadClip` and `bakeKeys` into a single undo.
+    '''
+    
+    def __init__(self):
+        self.modifier = OpenMaya.MDGModifier()
+        self.change = OpenMayaAnim.MAnimCurveChange()
+    
+    def apply(self, undo):
+        if undo:
+            self.change.undoIt()
+            self.modifier.undoIt()
+        else:
+            self.modifier.doIt()
+            self.change.redoIt()
+
+
+def _clipDataToCurve(data, plug, offset, first, last, bufferKeys, undo):
+    ''' Adds the keys of the `saveClip` curve `data` to the maya.api `plug`, shifted by `offset` frames and
+    replacing any keys in the paste range of `first` to `last`.
+    '''
+    uiUnit = OpenMaya.MTime.uiUnit()
+    change = undo.change
+    
+    fn = OpenMayaAnim.MFnAnimCurve()
+    existing = cmds.listConnections( plug.name(), s=True, d=False, type='animCurve' )
+    
+    if existing:
+        fn.setObject( core.capi.asMObject(existing[0]).object() )
+        
+        # Preserve the animation outside of the range
+        if bufferKeys:
+            for time in (first - 1, last + 1):
+                mtime = OpenMaya.MTime(time, uiUnit)
+                if fn.find(mtime) is None:
+                    fn.addKey(mtime, fn.evaluate(mtime), change=change)
+        
+        for i in reversed(range(fn.numKeys)):
+            if first <= fn.input(i).asUnits(uiUnit) <= last:
+                fn.remove(i, change)
+    else:
+        fn.create(plug, data['type'], undo.modifier)
+        undo.modifier.doIt()
+        fn.setIsWeighted(data['weighted'], change)
+        fn.setPreInfinityType(data['preInfinity'], change)
+        fn.setPostInfinityType(data['postInfinity'], change)
+    
+    times = OpenMaya.MTimeArray( [OpenMaya.MTime(t + offset, uiUnit) for t in data['times']] )
+    fn.addKeys( times, OpenMaya.MDoubleArray(data['values']), keepExistingKeys=True, change=change )
+    
+    for i, time in enumerate(times):
+        index = fn.find(time)
+        
+        # Angles are set first since setting them makes the tangent fixed.
+        fn.setTangentsLocked(index, False, change)
+        fn.setTangent(index, OpenMaya.MAngle(data['inAngle'][i]), data['inWeight'][i], True, change)
+        fn.setTangent(index, OpenMaya.MAngle(data['outAngle'][i]), data['outWeight'][i], False, change)
+        fn.setInTangentType(index, data['inType'][i], change)
+        fn.setOutTangentType(index, data['outType'][i], change)
+        fn.setTangentsLocked(index, data['locked'][i], change)
+
+
+def loadClip(filename, insertTime=None, alterPlug=None, bufferKeys=True, targetPool=None):
+    '''
+    Loads a file made by `saveClip`, adding all the keys through the api without
+    importing any nodes.  The args are the same as `load`, except any curve altering
+    func `alterPlug` returns is ignored since there isn't a curve node to alter.
+    '''
+    global _loadAlterPlug
+    
+    existingSelection = selected()
+    
+    # Hook for easily providing an alterPlug via the GUI
+    if _loadAlterPlug and not alterPlug:
+        alterPlug = _loadAlterPlug
+    
+    if insertTime is None:
+        insertTime = currentTime(q=True)
+    
+    with open(filename, 'rb') as fid:
+        clip = json.loads( zlib.decompress( fid.read() ).decode('utf-8') )
+    
+    start = clip['start']
+    length = clip['end'] - start
+    offset = insertTime - start
+    
+    # The whole clip is pasted over the same range, like `load`, regardless of when each curve's keys start.
+    first = insertTime
+    last = insertTime + length
+    
+    missingObj = set()
+    missingAttr = []
+    pasteError = []
+    
+    alter = _buildAlter( list(clip['curves']), existingSelection, alterPlug, targetPool )
+    
+    for plug, value in clip['staticValues'].items():
+        try:
+            setAttr(alter(plug)[0] if alter else plug, value)
+        except Exception:
+            pass
+    
+    undo = _ClipUndo()
+    
+    for source, data in clip['curves'].items():
+        dest = alter(source)[0] if alter else source
+        
+        if not cmds.objExists( dest ):
+            obj, attr = dest.split('.')
+            if cmds.objExists(obj):
+                missingAttr.append( dest )
+            else:
+                missingObj.add( obj )
+            continue
+        
+        # If we aren't going to be able to paste, just punt.
+        if not cmds.getAttr(dest, k=True):
+            pasteError.append(dest)
+            continue
+        
+        try:
+            sel = OpenMaya.MSelectionList()
+            sel.add(dest)
+            _clipDataToCurve(data, sel.getPlug(0), offset, first, last, bufferKeys, undo)
+        except Exception:
+            pasteError.append( dest )
+    
+    apiUndo.append( ApiUndoItem(undo.apply, (False,), (True,)) )
+    
+    _reportLoadErrors(missingObj, missingAttr, pasteError)
     
     return SavedCurveInfo( insertTime, insertTime + length, length )
 
@@ -350,6 +626,63 @@ def load(filename, insertTime=None, alterPlug=None, bufferKeys=True, targetPool=
 SKD_CURVE_TYPES = ['animCurveUA', 'animCurveUT', 'animCurveUU', 'animCurveUL']
 
 
+def _isStepped(mplug):
+    attr = mplug.attribute()
+    if attr.hasFn(OpenMaya.MFn.kEnumAttribute):
+        return True
+    return attr.hasFn(OpenMaya.MFn.kNumericAttribute) and OpenMaya.MFnNumericAttribute(attr).numericType() == OpenMaya.MFnNumericData.kBoolean
+
+
+def bakeKeys(keys):
+    '''
+    Keys many values at once through the api.  Like `setKeyframe`, keys already at
+    those times only have their values changed, keeping their tangents, and plugs
+    that are locked or driven by something besides an animCurve are skipped.
+    
+    :param dict keys: {<plug str>: ( [times], [values] ) } where the values are in
+        internal units, ex radians, like `MPlug.asDouble()` returns.
+    '''
+    uiUnit = OpenMaya.MTime.uiUnit()
+    undo = _ClipUndo()
+    
+    for plug, (times, values) in keys.items():
+        sel = OpenMaya.MSelectionList()
+        sel.add(plug)
+        mplug = sel.getPlug(0)
+        
+        fn = OpenMayaAnim.MFnAnimCurve()
+        existing = cmds.listConnections( plug, s=True, d=False, type='animCurve' )
+        
+        if existing:
+            fn.setObject( core.capi.asMObject(existing[0]).object() )
+        elif mplug.isLocked or mplug.isDestination:
+            continue
+        else:
+            fn.create(mplug, OpenMayaAnim.MFnAnimCurve.kAnimCurveUnknown, undo.modifier)
+            undo.modifier.doIt()
+        
+        newTimes = OpenMaya.MTimeArray()
+        newValues = OpenMaya.MDoubleArray()
+        
+        for t, value in zip(times, values):
+            time = OpenMaya.MTime(t, uiUnit)
+            index = fn.find(time)
+            if index is None:
+                newTimes.append(time)
+                newValues.append(value)
+            else:
+                fn.setValue(index, value, undo.change)
+        
+        if not len(newTimes):
+            continue
+        
+        # Like setKeyframe, enums and bools are stepped
+        outTangent = OpenMayaAnim.MFnAnimCurve.kTangentStep if _isStepped(mplug) else OpenMayaAnim.MFnAnimCurve.kTangentGlobal
+        fn.addKeys( newTimes, newValues, OpenMayaAnim.MFnAnimCurve.kTangentGlobal, outTangent, True, undo.change )
+    
+    apiUndo.append( ApiUndoItem(undo.apply, (False,), (True,)) )
+
+
 def findSetDrivenKeys(obj):
     ''' Returns dict of set driven key info.
     
@@ -1,6 +1,5 @@
 from __future__ import print_function, absolute_import
 
-from functools import partial
 from operator import eq
 import traceback
 
@@ -30,19 +29,17 @@ def switchSpaceGroup(objs, targetSpace):
     
     with pdil.ui.NoUpdate(objs):
         if pdil.time.rangeIsSelected():
-            switch = partial(space.switchRange, range=pdil.time.selectedTime())
+            space.switchRangeMany(objs, targetSpace, range=pdil.time.selectedTime())
             
         elif animToolSettings.switchMode == 'current':
-            switch = partial(space.switchFrame)
+            for obj in objs:
+                space.switchFrame(obj, targetSpace)
             
         elif animToolSettings.switchMode == 'range':
-            switch = partial(space.switchRange, range=pdil.time.playbackRange())
+            space.switchRangeMany(objs, targetSpace, range=pdil.time.playbackRange())
         
         elif animToolSettings.switchMode == 'all':
-            switch = partial(space.switchRange, range=(None, None) )
-        
-        for obj in objs:
-            switch(obj, targetSpace)
+            space.switchRangeMany(objs, targetSpace, range=(None, None))
 
 
 def animationSwitchMenu(objName):
@@ -9,6 +9,12 @@ from pymel.core import attributeQuery, cmds, PyNode, warning, objExists, ls
 
 from pdil import simpleName
 from . import config
+from ..vendor.session_memo import session_memoize
+
+
+# Bumped by `rebuildIndex` so the session memoized queries below miss the cache.
+if '_generation' not in globals():
+    _generation = 0
 
 
 def rootBone(nodes=None):
@@ -50,7 +56,7 @@ def controllers(main=None):
     ..  todo:: Add the shapes that have ik/fk switching on them
     '''
     
-    allControls = set( cmds.ls( '*.' + config.FOSSIL_CTRL_TYPE, o=True, r=True, l=True ) )
+    allControls = set( _controllerNames(_generation) )
     
     if main:
         mainTransforms = cmds.listRelatives(main.name(), ad=True, type='transform', f=True)
@@ -154,28 +160,29 @@ def blueprintCards(skeletonBlueprint=None):
     ''' Return all the cards, optionally taking a specific skeletonBlueprint.
     '''
     
-    targetCards = set(
-        cmds.ls( '*.skeletonInfo', o=True, r=True, l=True )
-        + cmds.ls( '*.fossilRigData', o=True, r=True, l=True )
-    )
-    
     if skeletonBlueprint:
-        targetCards.intersection_update( cmds.listRelatives(skeletonBlueprint.name(), ad=True, type='transform', f=True) )
+        children = set( cmds.listRelatives(skeletonBlueprint.name(), ad=True, type='transform', f=True) or [] )
+        return [card for card, name in _cards(_generation) if name in children]
     
-    def order(obj):
-        try:
-            return cmds.getAttr(obj + '.buildOrder')
-        except Exception:
-            pass
-    
-        try:
-            return json.loads(cmds.getAttr(obj + '.fossilRigData')).get('buildOrder', 10)
-        except Exception:
-            pass
-    
-        return 10
-    
-    return [PyNode(c) for c in sorted(targetCards, key=order)]
+    return [card for card, name in _cards(_generation)]
+
+
+def bpJoints():
+    ''' Returns all the BPJoints in the scene.
+    '''
+    return list( _bpJoints(_generation) )
+
+
+def realJoints():
+    ''' Returns all the joints built from BPJoints (including mirrors).
+    '''
+    return list( _realJoints(_generation) )
+
+
+def rigControllers():
+    ''' Returns all the RigControllers (the main controllers of each card, which have `.subControl`).
+    '''
+    return list( _rigControllers(_generation) )
 
 
 def cardJointBuildOrder():
@@ -201,6 +208,11 @@ def cardHierarchy():
             ...
         ]
     '''
+    # Copied so callers can't alter the index
+    return [ [parent, list(children)] for parent, children in _sessionCardHierarchy(_generation) ]
+
+
+def _cardHierarchy(cards):
     parentCards = [[None, []]]
     
     mirrored = {}
@@ -208,7 +220,7 @@ def cardHierarchy():
     # Also track parent and their children so we can lookup to add asymetrically made cards to child list
     parentCardsListed = {}
     
-    for card in blueprintCards():
+    for card in cards:
         if not card.parentCard:
             
             # Only pick up cards that are actually top level and not parented to a mirror side
@@ -241,4 +253,71 @@ def cardHierarchy():
             raise Exception('How did this happen? {} has mirrored side set but no discernable parent'.format(card) )
     
     
-    return parentCards
\ No newline at end of file
+    return parentCards
+
+
+def rebuildIndex():
+    ''' Force the queries used by `blueprintCards`, `cardHierarchy`, `controllers` etc. to read the scene again.
+    
+    Only needed within a `session()` after making or deleting cards, joints or controllers.
+    '''
+    global _generation
+    _generation += 1
+
+
+def _cardOrder(obj):
+    try:
+        return cmds.getAttr(obj + '.buildOrder')
+    except Exception:
+        pass
+
+    try:
+        return json.loads(cmds.getAttr(obj + '.fossilRigData')).get('buildOrder', 10)
+    except Exception:
+        pass
+
+    return 10
+
+
+# Each query reads the scene unless it's in a `session()`, where it is only done once (per `rebuildIndex`).
+
+@session_memoize
+def _cards(generation):
+    ''' Returns [(card, longName)] in build order.
+    '''
+    cardNames = set(
+        cmds.ls( '*.skeletonInfo', o=True, r=True, l=True )
+        + cmds.ls( '*.fossilRigData', o=True, r=True, l=True )
+    )
+    return [(PyNode(c), c) for c in sorted(cardNames, key=_cardOrder)]
+
+
+@session_memoize
+def _bpJoints(generation):
+    return [PyNode(j) for j in cmds.ls( '*.realJoint', o=True, r=True, l=True )]
+
+
+@session_memoize
+def _realJoints(generation):
+    plugs = [j + '.realJoint' for j in cmds.ls( '*.realJoint', o=True, r=True, l=True )]
+    plugs += [j + '.realJointMirror' for j in cmds.ls( '*.realJointMirror', o=True, r=True, l=True )]
+    if not plugs:
+        return []
+    
+    return [PyNode(j) for j in set( cmds.listConnections( plugs, type='joint' ) or [] )]
+
+
+@session_memoize
+def _controllerNames(generation):
+    return cmds.ls( '*.' + config.FOSSIL_CTRL_TYPE, o=True, r=True, l=True )
+
+
+@session_memoize
+def _rigControllers(generation):
+    return [PyNode(c) for c in cmds.ls( '*.controlLinks', o=True, r=True, l=True )]
+
+
+@session_memoize
+def _sessionCardHierarchy(generation):
+    # Only made on demand since it can raise errors on bad setups.
+    return _cardHierarchy( [card for card, name in _cards(generation)] )
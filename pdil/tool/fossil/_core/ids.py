@@ -1,4 +1,5 @@
 from collections import OrderedDict
+import copy
 import json
 import operator
 
@@ -7,6 +8,8 @@ from pymel.core import cmds, objExists, PyNode
 import pdil
 from pdil.vendor import six
 
+from ..vendor.session_memo import session, session_memoize
+
 #from . import config
 
 
@@ -17,7 +20,14 @@ if '_specPlugins' not in globals():
 
 def getIdSpec(obj):
     '''
+    Returns the spec dict identifying `obj`, memoized per node within a `session()`.
     '''
+    # A copy since callers edit and store the specs, the memoized one is shared.
+    return copy.deepcopy( _getIdSpec(obj) )
+
+
+@session_memoize
+def _getIdSpec(obj):
     global _specPlugins
     for plugin in _specPlugins.values():
         spec = plugin[0].getSpec(obj)
@@ -25,9 +35,77 @@ def getIdSpec(obj):
             return spec
             
     return IdSpec.baseSpec(obj)
+
+
+def getIdSpecs(objs):
+    ''' Returns the spec for each of the objects, sharing the memoization.
+    '''
+    with session():
+        return [getIdSpec(obj) for obj in objs]
+
+
+# Lookup tables ---------------------------------------------------------------
+# Within a `session()` these are built once and shared by all the specs read.
+
+@session_memoize
+def _readCache():
+    ''' {json of spec: object} of the specs already read this session.
+    '''
+    return {}
+
+
+@session_memoize
+def _cardIdIndex():
+    ''' {card id: card name} of all the cards.
+    '''
+    index = {}
+    for card in cmds.ls( '*.fossilRigData', o=True, r=True, l=True ):
+        # Read through `rigData` so unwritten changes in a `jsonCache()` are seen, like `CardSpec.getSpec`.
+        _id = PyNode(card).rigData.get('id', None)
+        if _id and _id not in index:
+            index[_id] = card
+    return index
+
+
+@session_memoize
+def _cardJoints(card):
+    return card.joints
+
+
+@session_memoize
+def _leadControl(card, side, kinematic):
+    return card.getLeadControl(side, kinematic)
+
+
+def readIdSpec(spec):
+    '''
+    Returns the object identified by the spec dict, or None if not found.
+    
+    Within a `session()`, found objects are cached so repeated specs are only resolved once.
+    '''
+    cache = _readCache()
+    key = json.dumps(spec, sort_keys=True)
     
+    obj = cache.get(key)
+    if obj is not None and obj.exists():
+        return obj
     
-def readIdSpec(spec):
+    # Misses aren't cached since restoring can make the objects being looked for.
+    obj = _readIdSpec(spec)
+    if obj is not None:
+        cache[key] = obj
+    
+    return obj
+
+
+def readIdSpecs(specs):
+    ''' Returns the object (or None) for each of the specs, resolving them all against the same lookup tables.
+    '''
+    with session():
+        return [readIdSpec(spec) for spec in specs]
+
+
+def _readIdSpec(spec):
     global _specPlugins
     
     #if 'type' in spec: # At some point, say 2024, fully deprecate 'fossil_oldspec'
@@ -168,7 +246,7 @@ class RigControllerSpec(IdSpec):
             if not card:
                 return None
             
-            return card.getLeadControl( spec['motion'][0], spec['motion'][1] )
+            return _leadControl( card, spec['motion'][0], spec['motion'][1] )
         
         return None
 
@@ -195,12 +273,9 @@ class CardSpec(IdSpec):
     def readSpec(self, spec):
         
         if 'id' in spec:
-            cards = cmds.ls( '*.fossilRigData', o=True, r=True, l=True )
-            
-            for card in cards:
-                data = json.loads( cmds.getAttr( card + '.fossilRigData' ) )
-                if spec['id'] == data.get('id', None):
-                    return PyNode(card)
+            card = _cardIdIndex().get( spec['id'] )
+            if card and objExists(card):
+                return PyNode(card)
         return None
 
 
@@ -225,7 +300,7 @@ class BPJointSpec(IdSpec):
     @classmethod
     def readSpec(self, spec):
         card = readIdSpec( spec['card'] )
-        bpj = card.joints[ spec['index'] ]
+        bpj = _cardJoints(card)[ spec['index'] ]
         return bpj
 
 
@@ -254,7 +329,7 @@ class JointSpec(IdSpec):
     @classmethod
     def readSpec(self, spec):
         card = readIdSpec( spec['card'] )
-        bpj = card.joints[ spec['index'] ]
+        bpj = _cardJoints(card)[ spec['index'] ]
         
         if spec['mirror']:
             return bpj.realMirror
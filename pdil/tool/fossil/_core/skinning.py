@@ -1,11 +1,104 @@
 ''' Fossil-aware skinning tools.
 '''
 
-from pymel.core import listConnections
+from array import array
+import zlib
+
+from maya.api import OpenMaya
+from maya.api.OpenMayaAnim import MFnSkinCluster
+
+from pymel.core import cmds, listConnections
 
 import pdil
 
 
+if '_skinStates' not in globals():
+    _skinStates = {}  # {skinCluster PyNode: _SkinState}
+
+
+class _SkinState(object):
+    ''' The cached weights of the geometry deformed by a skinCluster, which is marked dirty as soon as any of its
+    weights change so unchanged skins aren't harvested again.  A checksum of the weights is compared too, in case
+    an edit didn't dirty it (ex, a paint stroke or a setAttr with callbacks suspended).
+    '''
+
+    def __init__(self, skin):
+        self.skin = skin
+        self.dirty = True
+        self.influences = []
+        self.checksum = None
+        self.data = {}  # {geometry: pdil.weights.getCompact() output}
+        self.callbackId = OpenMaya.MNodeMessage.addNodeDirtyPlugCallback( pdil.capi.asMObject(skin).object(), self._dirtied )
+
+    def _dirtied(self, node, plug, clientData):
+        if not self.dirty and plug.partialName(useLongNames=True).startswith('weightList'):
+            self.dirty = True
+
+    def isCurrent(self):
+        ''' True if the cached weights still match the skinCluster.
+        '''
+        return not self.dirty and self.influences == _influences(self.skin) and self.checksum == _weightsChecksum(self.skin)
+
+    def markCurrent(self):
+        ''' Call once `data` matches the skinCluster.
+        '''
+        self.influences = _influences(self.skin)
+        self.checksum = _weightsChecksum(self.skin)
+        self.dirty = False
+
+    def remove(self):
+        try:
+            OpenMaya.MMessage.removeCallback(self.callbackId)
+        except Exception:
+            pass
+
+
+def _influences(skin):
+    return cmds.skinCluster(skin.name(), q=True, inf=True) or []
+
+
+def _weightsChecksum(skin):
+    ''' Returns a crc32 of all the weights of the skinCluster.  It's just the raw read, without `getCompact`'s pruning.
+    '''
+    skinFn = MFnSkinCluster( pdil.capi.asMObject(skin).object() )
+    
+    crc = 0
+    for i in range(skinFn.numOutputConnections()):
+        shapePath = skinFn.getPathAtIndex( skinFn.indexForOutputConnection(i) )
+        if not shapePath.hasFn(OpenMaya.MFn.kMesh):
+            continue
+        
+        fnComp = OpenMaya.MFnSingleIndexedComponent()
+        comp = fnComp.create( OpenMaya.MFn.kMeshVertComponent )
+        fnComp.setCompleteData( OpenMaya.MFnMesh(shapePath).numVertices )
+        
+        dense, influenceCount = skinFn.getWeights( shapePath, comp )
+        values = array('d', dense)
+        crc = zlib.crc32( values.tobytes() if hasattr(values, 'tobytes') else values.tostring(), crc )
+    
+    return crc
+
+
+def _skinState(skin):
+    ''' Returns the _SkinState for the skinCluster, making it if needed, and prunes states of deleted skinClusters.
+    '''
+    for oldSkin in [s for s in _skinStates if not s.exists()]:
+        _skinStates.pop(oldSkin).remove()
+
+    if skin not in _skinStates:
+        _skinStates[skin] = _SkinState(skin)
+
+    return _skinStates[skin]
+
+
+def clearWeightCache():
+    ''' Forget all the cached weights so the next `cacheWeights` harvests everything.
+    '''
+    for state in _skinStates.values():
+        state.remove()
+    _skinStates.clear()
+
+
 def getSkinClusters(cards):
     ''' Returns a list of skinClusters used by the given cards.
     '''
@@ -17,34 +110,71 @@ def getSkinClusters(cards):
                     skinClusters.update( listConnections(j.real, type='skinCluster') )
                 if j.realMirror:
                     skinClusters.update( listConnections(j.realMirror, type='skinCluster') )
-                    
+
     return skinClusters
 
-    
+
 def cacheWeights(cards, weightCache):
-    ''' Does a pdil.weights.get() on the meshes skinned to the given cards.  Stores results in weightCache.
+    ''' Does a pdil.weights.getCompact() on the meshes skinned to the given cards.  Stores results in weightCache.
     Reapply weights with `loadCachedWeights`.
-    
+
+    The weights are kept for the session so skinClusters that haven't changed since the last call aren't harvested
+    again.  Use `clearWeightCache` to force it.
+
     Args:
         cards: Iterable of blueprint cards
         weightCache: Empty dict
     '''
-    
-    skinClusters = getSkinClusters(cards)
-    
-    geometry = set()
-    for skin in skinClusters:
-        geometry.update( skin.getGeometry() )
-        
-    for geo in geometry:
-        weightCache[geo] = pdil.weights.get(geo)
-        
-        
+
+    states = [_skinState(skin) for skin in getSkinClusters(cards)]
+    stale = [state for state in states if not state.isCurrent()]
+
+    # Only the stale skins are harvested.
+    geometry = [(state, geo) for state in stale for geo in state.skin.getGeometry()]
+    harvested = pdil.weights.getCompactMany( [geo for state, geo in geometry] )
+
+    for state in stale:
+        state.data = {}
+        state.markCurrent()
+
+    for state, geo in geometry:
+        state.data[geo] = harvested[geo]
+
+    for state in states:
+        weightCache.update( state.data )
+
+
 def loadCachedWeights(weightCache):
     ''' Applies the weights from weightCache (a dictionary) modified by `cacheWeights`.
+
+    Geometry whose skinCluster is unchanged since it was cached is skipped.
     '''
-    
+
+    # Determine what is unchanged first since applying can share a skinCluster with other geometry.
+    current = {}  # {skin: isCurrent}
+    unchanged = set()
+    for g in weightCache:
+        skin = pdil.weights.findRelatedSkinCluster(g)
+        if skin and skin in _skinStates:
+            if skin not in current:
+                current[skin] = _skinStates[skin].isCurrent()
+            if current[skin]:
+                unchanged.add(g)
+
+    applied = set()
     for g, skinData in weightCache.items():
+        if g in unchanged:
+            continue
+
         pdil.weights.apply(g, skinData)
-    
-    weightCache = {}
\ No newline at end of file
+
+        # The skin now matches the cache, so it doesn't need to be harvested next time.
+        skin = pdil.weights.findRelatedSkinCluster(g)
+        if skin:
+            _skinState(skin).data[g] = skinData
+            applied.add(skin)
+
+    for skin in applied:
+        _skinState(skin).markCurrent()
+
+    weightCache.clear()
@@ -5,6 +5,7 @@ import re
 from pymel.core import createNode, listConnections, connectAttr, select, mel
 
 from maya.api import OpenMaya
+from maya import cmds
 from maya.cmds import ls
 
 import pdil
@@ -104,6 +105,8 @@ def setSide(srcPicker, sourceXk, destPicker, destXk, side):
 
 def setLeft(srcPicker, destPicker):
     
+    _graph.markStale()
+    
     setSide(srcPicker, 'ik', destPicker, 'ik', 'Left')
     setSide(srcPicker, 'ik', destPicker, 'fk', 'Left')
     setSide(srcPicker, 'fk', destPicker, 'ik', 'Left')
@@ -267,17 +270,138 @@ def getNextNode(plug, d, fallback):
 #// Result: FossilPickWalkUpNameCommand //
 
 
-def fossilPickWalk(d='down'):
-    allControls = set( ls('*.fossilCtrlType', o=True, r=True) )
-    selected = set( ls(sl=True) )
+class _PickwalkGraph(object):
+    ''' All the picker networks read into dicts so pickwalking is just lookups.
+    
+    Callbacks mark it stale when references or files change, or networks and transforms are added, removed or renamed,
+    and it's rebuilt on the next pickwalk.
+    '''
+    
+    def __init__(self):
+        self.stale = True
+        self.controls = {}  # {<control long name>: (<picker>, <'ik' or 'fk'>, <index>)}
+        self.pickers = {}  # {<picker>: {'ik': {index: control}, 'fk': {...}, 'count': {'ik': n, 'fk': n}, 'up':, 'down':, 'sides': {}}
+        self.callbacks = []
     
-    if selected.issubset(allControls):
-        #maya.cmds.attributeQuery( 'fossil9CtrlType', n='Shoulder_L_ctrl', ex=1 )
-        pickerPlugs = [getPickerPlug(ctrl) for ctrl in selected]
-        if all(pickerPlugs):
-            # All the selection are controls so we can process their special connections
-            select( [getNextNode(pickerPlug, d, ctrl) for pickerPlug, ctrl in zip(pickerPlugs, selected)] )
+    def markStale(self, *args):
+        self.stale = True
+    
+    def installCallbacks(self):
+        if self.callbacks:
             return
+        
+        sceneEvents = [
+            OpenMaya.MSceneMessage.kAfterOpen,
+            OpenMaya.MSceneMessage.kAfterNew,
+            OpenMaya.MSceneMessage.kAfterImport,
+            OpenMaya.MSceneMessage.kAfterCreateReference,
+            OpenMaya.MSceneMessage.kAfterRemoveReference,
+            OpenMaya.MSceneMessage.kAfterLoadReference,
+            OpenMaya.MSceneMessage.kAfterUnloadReference,
+        ]
+        
+        self.callbacks = [OpenMaya.MSceneMessage.addCallback(event, self.markStale) for event in sceneEvents] + [
+            OpenMaya.MDGMessage.addNodeAddedCallback(self.markStale, 'network'),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(self.markStale, 'network'),
+            OpenMaya.MDGMessage.addNodeRemovedCallback(self.markStale, 'transform'),
+            OpenMaya.MNodeMessage.addNameChangedCallback(OpenMaya.MObject.kNullObj, self.markStale),
+        ]
+    
+    def removeCallbacks(self):
+        for callbackId in self.callbacks:
+            OpenMaya.MMessage.removeCallback(callbackId)
+        self.callbacks = []
+    
+    @staticmethod
+    def _connection(plug):
+        cons = cmds.listConnections(plug, s=True, d=False)
+        return cmds.ls(cons[0], l=True)[0] if cons else None
+    
+    def rebuild(self):
+        self.installCallbacks()
+        
+        self.controls = {}
+        self.pickers = {}
+        
+        for picker in cmds.ls('*.ikLinker', o=True, r=True) or []:
+            info = {'ik': {}, 'fk': {}, 'count': {}, 'sides': {},
+                    'up': self._connection(picker + '.up'),
+                    'down': self._connection(picker + '.down')}
+            
+            for xk in ('ik', 'fk'):
+                indices = cmds.getAttr( '{}.{}Linker'.format(picker, xk), multiIndices=True ) or []
+                info['count'][xk] = len(indices)
+                
+                for index in indices:
+                    element = '{}.{}Linker[{}]'.format(picker, xk, index)
+                    
+                    ctrl = self._connection( element + '.' + xk + 'Controller' )
+                    if ctrl:
+                        info[xk][index] = ctrl
+                        self.controls[ctrl] = (picker, xk, index)
+                    
+                    for side in ('Left', 'Right'):
+                        other = self._connection(element + '.' + xk + side)
+                        if other:
+                            info['sides'][(xk, index, side)] = (
+                                other,
+                                cmds.getAttr(element + '.' + xk + side + 'IndexIk'),
+                                cmds.getAttr(element + '.' + xk + side + 'IndexFk'),
+                            )
+            
+            self.pickers[picker] = info
+        
+        self.stale = False
+    
+    def nextControl(self, ctrl, d):
+        ''' Returns the control to pickwalk to from `ctrl`, which must be in `controls`, falling back to itself.
+        '''
+        picker, xk, index = self.controls[ctrl]
+        info = self.pickers[picker]
+        
+        if d == 'down':
+            if index < info['count'][xk] - 1:
+                target = info[xk].get(index + 1)
+            else:
+                target = info['down']
+        
+        elif d == 'up':
+            if index > 0:
+                target = info[xk].get(index - 1)
+            else:
+                target = info['up']
+        
+        else:
+            side = info['sides'].get( (xk, index, d.title()) )
+            if not side:
+                return ctrl
+            
+            # The switcher is animated so it is always read
+            otherPicker, indexIk, indexFk = side
+            if cmds.getAttr(otherPicker + '.switcher') < 0.5:
+                target = self.pickers[otherPicker]['fk'].get(indexFk)
+            else:
+                target = self.pickers[otherPicker]['ik'].get(indexIk)
+        
+        return target if target else ctrl
+
+
+# Only one graph should exist, so clean up the callbacks when reloading.
+if '_graph' in globals():
+    _graph.removeCallbacks()  # noqa
+_graph = _PickwalkGraph()
+
+
+def fossilPickWalk(d='down'):
+    if _graph.stale:
+        _graph.rebuild()
+    
+    selected = ls(sl=True, l=True)
+    
+    if selected and all(ctrl in _graph.controls for ctrl in selected):
+        # All the selection are controls so we can process their special connections
+        select( [_graph.nextControl(ctrl, d) for ctrl in selected] )
+        return
     
     # Fallback of normal pickwalking
     if d == 'down':
@@ -12,6 +12,7 @@ from .common import ( # noqa
     Mode,
     getTrueWorld,
     switchRange,
+    switchRangeMany,
     switchFrame,
 )
 
@@ -30,7 +31,17 @@ from .agnostic import ( # noqa
     addUserDriven,
 )
 
-from .rebuild import serializeSpaces, deserializeSpaces, attemptDelayedSpaces # noqa
+from .rebuild import ( # noqa
+    serializeSpaces,
+    deserializeSpaces,
+    attemptDelayedSpaces,
+    afterSpaces,
+    isPlanning,
+    plannedRestore,
+    planSpaces,
+    restoreSpaces,
+    SpaceRestore,
+)
 
 '''
 *rivetSpace
@@ -15,6 +15,7 @@ from . import common
 BIDIRECTIONAL_ID = 'bidirectional'
 
 
+@pdil.debug.profiled('space add')
 def add(control, target, spaceName='', modeName=common.Mode.ROTATE_TRANSLATE, enum=True, rotateTarget=None):
     ''' Add a space to the given control.
     
@@ -1,6 +1,10 @@
 from __future__ import print_function, absolute_import
 
-from pymel.core import addAttr, cmds, currentTime, group, hide, keyframe, filterCurve, parentConstraint, orientConstraint, pointConstraint, listRelatives, xform, duplicate
+from collections import OrderedDict
+
+from maya.api import OpenMaya
+
+from pymel.core import addAttr, cmds, group, hide, keyframe, filterCurve, parentConstraint, orientConstraint, pointConstraint, listRelatives, xform, duplicate
 
 import pdil
 
@@ -9,6 +13,11 @@ from ..._core import ids
 from ... import enums
 from ... import node
 
+try:
+    basestring
+except NameError:
+    basestring = str
+
 __all__ = ['getNames', 'setNames', 'get', 'ENUM_ATTR', 'SPACE_TYPE_NAME']
 
 
@@ -99,9 +108,12 @@ def switchRange(control, targetSpace, range=(None, None)):
     Switch the `control` into the targetSpace across the given range
     (includes) endpoints.  This alters the keyframes
     '''
+    switchRangeMany([control], targetSpace, range)
+
+
+def _switchTimes(control, range):
     attrs = [ENUM_ATTR] + [t + a for t in 'tr' for a in 'xyz']
-    curTime = currentTime(q=True)
-    times = keyframe( control, at=attrs, q=True, tc=True)
+    times = keyframe( control, at=attrs, q=True, tc=True) or []
     times = sorted(set(times))
     if range[0] is not None and range[1] is not None:
         times = [ t for t in times if range[0] <= t <= range[1] ]
@@ -110,34 +122,146 @@ def switchRange(control, targetSpace, range=(None, None)):
     elif range[1]:
         times = [ t for t in times if t <= range[1] ]
     
-    if not times:
-        switchToSpace( control, targetSpace )
-        return
+    return times
+
+
+def _read3(fn, attr):
+    plug = fn.findPlug(attr, False)
+    return [plug.child(i).asDouble() for i in range(3)]
+
+
+def _translateMatrix(vector):
+    matrix = OpenMaya.MMatrix()
+    for i, value in enumerate(vector):
+        matrix.setElement(3, i, value)
+    return matrix
+
+
+def _scaleShearMatrix(fn):
+    tm = OpenMaya.MTransformationMatrix()
+    tm.setScale( _read3(fn, 'scale'), OpenMaya.MSpace.kTransform )
+    tm.setShear( _read3(fn, 'shear'), OpenMaya.MSpace.kTransform )
+    return tm.asMatrix()
+
+
+def _localSolve(control, local):
+    '''
+    Returns the translate and rotate (internal units) giving the `local` matrix,
+    accounting for the pivots, rotate axis and, on joints, the joint orient, like
+    `switchToSpace` does.  Reads the other attrs in the current context so it
+    respects `pdil.capi.evaluateAt`.
+    
+    The local matrix is always (pre) * R * (post) * T:
+        transforms: [-sp][S][Sh][sp][spt][-rp][ra]  [R]  [rp][rpt]  [T]
+        joints:     [S][Sh][ra]                     [R]  [jo][is]   [T]
+    '''
+    obj = pdil.capi.asMObject(control).object()
+    fn = OpenMaya.MFnDependencyNode(obj)
     
-    # Set initial keys if needed so insert=True works later
-    for attr in attrs:
-        if not keyframe( control.attr(attr), q=True, tc=True ):
-            control.attr(attr).setKey(t=times[0])
-            control.attr(attr).setKey(t=times[-1])
+    rotateAxis = OpenMaya.MEulerRotation( *_read3(fn, 'rotateAxis') ).asMatrix()
     
-    for t in times:
-        control.t.setKey(insert=True, t=t )
-        control.r.setKey(insert=True, t=t )
-        control.attr(ENUM_ATTR).setKey(insert=True, t=t )
+    if obj.hasFn(OpenMaya.MFn.kJoint):
+        pre = _scaleShearMatrix(fn) * rotateAxis
+        post = OpenMaya.MEulerRotation( *_read3(fn, 'jointOrient') ).asMatrix()
         
-    for t in times:
-        currentTime(t)
+        # Compensating for the parent joint's scale
+        parent = control.getParent()
+        if parent and fn.findPlug('segmentScaleCompensate', False).asBool() and parent.type() == 'joint':
+            parentFn = OpenMaya.MFnDependencyNode( pdil.capi.asMObject(parent).object() )
+            parentScale = OpenMaya.MTransformationMatrix()
+            parentScale.setScale( _read3(parentFn, 'scale'), OpenMaya.MSpace.kTransform )
+            post *= parentScale.asMatrix().inverse()
+    
+    else:
+        scalePivot = _read3(fn, 'scalePivot')
+        rotatePivot = _read3(fn, 'rotatePivot')
         
-        switchToSpace( control, targetSpace )
+        pre = _translateMatrix( [-v for v in scalePivot] ) * _scaleShearMatrix(fn) \
+            * _translateMatrix(scalePivot) * _translateMatrix( _read3(fn, 'scalePivotTranslate') ) \
+            * _translateMatrix( [-v for v in rotatePivot] ) * rotateAxis
         
-        control.attr( ENUM_ATTR ).setKey()
-        control.t.setKey()
-        control.r.setKey()
+        rotatePivotTranslate = _read3(fn, 'rotatePivotTranslate')
+        post = _translateMatrix( [a + b for a, b in zip(rotatePivot, rotatePivotTranslate)] )
+    
+    # remainder = R * post * T, so the rotation is (remainder * post^-1) and the translation is offset by post's.
+    remainder = pre.inverse() * local
+    
+    trans = [remainder.getElement(3, i) - post.getElement(3, i) for i in range(3)]
+    
+    for i in range(3):
+        remainder.setElement(3, i, 0.0)
+        post.setElement(3, i, 0.0)
+    
+    rot = OpenMaya.MTransformationMatrix( remainder * post.inverse() ).rotation().reorder( control.rotateOrder.get() )
+    
+    return trans + [rot.x, rot.y, rot.z]
+
+
+def switchRangeMany(controls, targetSpace, range=(None, None)):
+    '''
+    Switch all the `controls` into the targetSpace across the given range
+    (includes) endpoints.  This alters the keyframes.
+    
+    `targetSpace` is either the space (name or index) for all the controls or a
+    dict of {control: space}.
+    
+    The timeline isn't moved, the world transforms are sampled by evaluating in
+    a DG context, then the new local values are solved and keyed all at once.
+    Controls are switched parents first so children account for their parent's
+    new values.
+    '''
+    if not isinstance(targetSpace, dict):
+        targetSpace = {ctrl: targetSpace for ctrl in controls}
+    
+    # Names are converted since each control can have the spaces in a different order.
+    targetSpace = {
+        ctrl: getNames(ctrl).index(space) if isinstance(space, basestring) else space
+        for ctrl, space in targetSpace.items()
+    }
+    
+    allTimes = OrderedDict()
+    for control in sorted(controls, key=lambda c: c.longName().count('|')):
+        times = _switchTimes(control, range)
+        if times:
+            allTimes[control] = times
+        else:
+            switchToSpace( control, targetSpace[control] )
+    
+    if not allTimes:
+        return
+    
+    # Sample the world transforms before anything changes.
+    worldMatrices = {}
+    for control, times in allTimes.items():
+        worldMatrices[control] = []
+        for t in times:
+            with pdil.capi.evaluateAt(t):
+                worldMatrices[control].append( pdil.capi.getMatrix(control) )
+    
+    pdil.anim.bakeKeys( {
+        control.attr(ENUM_ATTR).name(): (times, [targetSpace[control]] * len(times))
+        for control, times in allTimes.items()
+    } )
+    
+    attrs = [t + a for t in 'tr' for a in 'xyz']
+    
+    for control, times in allTimes.items():
+        keys = OrderedDict( (control.attr(attr).name(), ([], [])) for attr in attrs )
         
-    currentTime(curTime)
+        for t, world in zip(times, worldMatrices[control]):
+            # The parent now reflects the new space (and any already switched parent controls).
+            with pdil.capi.evaluateAt(t):
+                parentInverse = pdil.capi.getMatrix(control, 'parentInverseMatrix')
+                values = _localSolve(control, world * parentInverse)
+            
+            for (keyTimes, keyValues), value in zip(keys.values(), values):
+                keyTimes.append(t)
+                keyValues.append(value)
+        
+        pdil.anim.bakeKeys(keys)
     
     if globalSettings.autoEuler:
-        filterCurve(control)
+        filterCurve(list(allTimes))
 
 
 def switchFrame(control, targetSpace):
@@ -269,6 +269,7 @@ def removeAll(control):
             control.deleteAttr(name)
 
 
+@pdil.debug.profiled('space add')
 def add(control, target, spaceName='', mode=common.Mode.ROTATE_TRANSLATE, enum=True, rotateTarget=None):
     '''
     Concerns::
@@ -1,11 +1,16 @@
 from __future__ import absolute_import, division, print_function
 
-from collections import namedtuple
+from collections import defaultdict, namedtuple
+import contextlib
+import heapq
+import traceback
 
 import pdil
 
+from ..._core import exceptions
 from ..._core import ids
 from ... import log as skelLog
+from ...vendor.session_memo import session
 
 from . import agnostic
 from . import bidirectional
@@ -65,13 +70,20 @@ Delayed = namedtuple('Delayed', 'controlSpec data pruneExtra objs')
 def deserializeSpaces(control, data, pruneExtra=True):
     ''' Apply spaces obtained from `serializeSpaces()` to the given control.
     
-    If a spec fails, it gets queued up.
+    If a spec fails, it gets queued up.  Within `plannedRestore()` the spaces are only collected.
 
     Args:
         control: The control to receive spaces
         data: Json from serializeSpaces
         pruneExtra: If True, remove spaces not given with `data` and ensure that order
     '''
+    if _planned is not None:
+        _planned.append( SpaceRestore(control, data, pruneExtra) )
+    else:
+        _deserializeSpaces(control, data, pruneExtra)
+
+
+def _deserializeSpaces(control, data, pruneExtra):
     errors = []
     
     names = common.getNames(control)
@@ -82,7 +94,7 @@ def deserializeSpaces(control, data, pruneExtra=True):
 
         func = bidirectional.add if data['bidir'] else constraintBased.add
 
-        objects = [ids.readIdSpec(s) for s in specs]
+        objects = ids.readIdSpecs(specs)
         if all(objects):
             if func(*args, **kwargs):
                 return True
@@ -162,23 +174,206 @@ def deserializeSpaces(control, data, pruneExtra=True):
 
 
 def attemptDelayedSpaces():
-    ''' Trys to rebuild spacess that failed earlier.
+    ''' Trys to rebuild spacess that failed earlier, once all their targets exist.
     '''
 
     global _queued_restore
 
-    restored = []
+    ready = {}  # {control: SpaceRestore}, only the latest data of each control is needed
+    with session():
+        for info in _queued_restore:
+
+            control = ids.readIdSpec(info.controlSpec)
+            if control and all( ids.readIdSpecs(info.objs) ):
+                ready[control] = SpaceRestore(control, info.data, info.pruneExtra)
+
+    _queued_restore = [info for info in _queued_restore if ids.readIdSpec(info.controlSpec) not in ready]
+
+    restoreSpaces( list(ready.values()) )
+
+
+# Planned restoring -----------------------------------------------------------
+# Collecting all the spaces first means they can be made in dependency order in
+# a single pass and any problems reported up front.
+
+SpaceRestore = namedtuple('SpaceRestore', 'control data pruneExtra')
 
-    for info in _queued_restore:
+SpacePlan = namedtuple('SpacePlan', 'order missing cycles')
 
-        control = ids.readIdSpec(info.controlSpec)
-        if control:
-            for obj in info.objs:
-                if not ids.readIdSpec(obj):
-                    break
-            else:
-                deserializeSpaces(control, info.data, pruneExtra=info.pruneExtra)
-                restored.append(info)
 
-    for info in restored:
-        _queued_restore.remove(info)
\ No newline at end of file
+if '_planned' not in globals():
+    _planned = None  # A list of SpaceRestore while in `plannedRestore()`
+
+if '_plannedAfter' not in globals():
+    _plannedAfter = None  # A list of (func, error message) while in `plannedRestore()`, see `afterSpaces()`
+
+
+def isPlanning():
+    return _planned is not None
+
+
+def afterSpaces(func, errorMessage):
+    ''' Within `plannedRestore()`, run `func()` once the spaces are made, otherwise run it now.
+    
+    Failures of deferred funcs are reported by `plannedRestore()` with the given `errorMessage`.
+    '''
+    if _plannedAfter is not None:
+        _plannedAfter.append( (func, errorMessage) )
+    else:
+        func()
+
+
+@contextlib.contextmanager
+def plannedRestore():
+    ''' Within this block, `deserializeSpaces()` only collects the spaces, which are all made by `restoreSpaces()`
+    when the (outermost) block exits, followed by anything deferred with `afterSpaces()`.
+    
+    Raises a `FossilMultiError` of all the failures once everything has been attempted.  If the block itself
+    raises, what was collected is still restored (failures are only printed) before its exception propagates.
+    '''
+    global _planned
+    global _plannedAfter
+    
+    if _planned is not None:
+        yield
+        return
+    
+    entries = _planned = []
+    after = _plannedAfter = []
+    finished = False
+    try:
+        yield
+        finished = True
+    finally:
+        _planned = None
+        _plannedAfter = None
+        
+        if not finished:
+            _restorePlanned(entries, after)
+    
+    errors = _restorePlanned(entries, after)
+    if errors:
+        raise errors
+
+
+def _restorePlanned(entries, after):
+    ''' Runs `restoreSpaces()` and the `afterSpaces()` funcs, returning a `FossilMultiError` of the failures.
+    '''
+    errors = exceptions.FossilMultiError()
+    
+    try:
+        restoreSpaces(entries)
+    except exceptions.FossilMultiError as spaceErrors:
+        errors.errors += spaceErrors.errors
+    
+    with session():
+        for func, errorMessage in after:
+            try:
+                func()
+            except Exception:
+                print( traceback.format_exc() )
+                errors.append( errorMessage, traceback.format_exc() )
+    
+    return errors
+
+
+def _targetSpecs(spaceInfo):
+    # User driven targets are made by restoring, so don't depend on anything yet.
+    if spaceInfo['type'] == common.Mode.USER:
+        return []
+    
+    if 'target' in spaceInfo:
+        return [spaceInfo['target']]
+    
+    return spaceInfo['targets']
+
+
+def planSpaces(entries):
+    ''' Orders the `SpaceRestore`s so controls that are the targets of other controls' spaces are restored first.
+    
+    Returns:
+        `SpacePlan(order, missing, cycles)` where `missing` is a list of (control, space name, spec) whose target
+        doesn't exist and `cycles` are the controls that depend on eachother, which are put last in `order`.
+    '''
+    
+    byControl = defaultdict(list)  # {control: [entry indices]}
+    for i, entry in enumerate(entries):
+        byControl[entry.control].append(i)
+    
+    blockers = defaultdict(set)  # {entry index: entry indices that must come first}
+    dependents = defaultdict(set)
+    missing = []
+    
+    with session():
+        for i, entry in enumerate(entries):
+            existing = set( common.getNames(entry.control) )
+            
+            for spaceInfo in entry.data['spaces']:
+                if spaceInfo['name'] in existing:
+                    continue
+                
+                specs = _targetSpecs(spaceInfo)
+                for spec, target in zip(specs, ids.readIdSpecs(specs)):
+                    if target is None:
+                        missing.append( (entry.control, spaceInfo['name'], spec) )
+                    elif target != entry.control:
+                        for j in byControl.get(target, []):
+                            blockers[i].add(j)
+                            dependents[j].add(i)
+    
+    # Topological sort, otherwise keeping the given order.
+    ready = [i for i in range(len(entries)) if not blockers[i]]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        i = heapq.heappop(ready)
+        order.append(i)
+        for j in dependents[i]:
+            blockers[j].discard(i)
+            if not blockers[j]:
+                heapq.heappush(ready, j)
+    
+    done = set(order)
+    cyclic = [i for i in range(len(entries)) if i not in done]
+    
+    return SpacePlan(
+        [entries[i] for i in order + cyclic],
+        missing,
+        [entries[i].control for i in cyclic],
+    )
+
+
+def restoreSpaces(entries):
+    ''' Makes the spaces of all the `SpaceRestore`s in dependency order, see `planSpaces()`.  Missing targets and
+    cycles are logged before anything is made.  Returns the `SpacePlan`.
+    
+    Every control is attempted, then a `FossilMultiError` is raised if any failed.
+    '''
+    plan = planSpaces(entries)
+    
+    if plan.missing:
+        skelLog.msg(
+            'Spaces with missing targets:\n    '
+            + '\n    '.join( '{} "{}": {}'.format(control, name, spec.get('long', spec)) for control, name, spec in plan.missing )
+        )
+    
+    if plan.cycles:
+        skelLog.msg(
+            'Spaces targeting eachother in a cycle, restored last:\n    '
+            + '\n    '.join( str(control) for control in plan.cycles )
+        )
+    
+    errors = exceptions.FossilMultiError()
+    
+    with session():
+        for entry in plan.order:
+            try:
+                _deserializeSpaces(entry.control, entry.data, entry.pruneExtra)
+            except Exception:
+                print( traceback.format_exc() )
+                errors.append( 'Issues restoring spaces on ' + pdil.shortName(entry.control), traceback.format_exc() )
+    
+    if errors:
+        raise errors
+    
+    return plan
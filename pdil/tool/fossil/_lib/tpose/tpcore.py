@@ -11,9 +11,12 @@ from __future__ import absolute_import, division, print_function
 
 import contextlib
 
+from maya.api import OpenMaya
+
 from pymel.core import cmds, delete, duplicate, group, hasAttr, joint, listRelatives, ls, makeIdentity, objExists, parentConstraint, PyNode, showHidden, xform, evalDeferred
 
 from pymel.core import displaySmoothness # noqa for an evalDeferred
+from pymel.internal.factories import apiUndo, ApiUndoItem
 
 
 from pdil import simpleName
@@ -28,27 +31,57 @@ from ..._lib import proxyskel
 def updateReposers(cards=None, missingOnly=False, progress=None):
     ''' (Re)Make the given cards' reposers.
     
+    Only what differs from the existing reposer is touched, see `diffReposer()`.  Missing reposers are generated and
+    changed ones have their joints added, removed or re-parented in place, so existing adjustments are kept.
+    
     Args:
         cards: Cards to operate on, `None`, the default, operates on all cards.
         missingOnly: If `True`, only make missing reposers.
         progress: Optional progressWindow passed to `generateReposer()`, see it for configuration.
     '''
+    allCards = False
     if not cards:
         cards = util.selectedCards()
     
     if not cards:
         cards = find.blueprintCards()
+        allCards = True
     
-    valid = getValidReposeCards()
-    cards = [card for card in cards if not getRCard(card, valid)]
+    jointMapping = existingJointMapping()
+    missing, changed = diffReposer(cards, jointMapping)
+    if missingOnly:
+        changed = []
+    
+    otherCards = [card for card in find.cardJointBuildOrder() if card not in missing]
     
-    otherCards = find.cardJointBuildOrder()
-    for c in cards:
-        otherCards.remove(c)
-        
     #with pdil.ui.progressWin(title='Building reposers', max=len(cards) * 2) as prog:
     with reposeToBindPose(otherCards):
-        generateReposer( cards, progress=progress)
+        moved = _pruneReposer() if allCards and not missingOnly else []
+        
+        for card, rCard in changed:
+            if progress:
+                progress.update()
+            moved += _patchJoints(card, rCard, jointMapping)
+        
+        if missing:
+            generateReposer( missing, progress=progress)
+        
+        # Parents are resolved last since they can be joints added by any of the above.
+        jointMapping = existingJointMapping()
+        validCards = getValidReposeCards()
+        
+        relink = changed + [(card, getRCard(card, validCards)) for card in missing]
+        for rCard in moved:
+            card = rCard.bpCard.listConnections()
+            if card:
+                relink.append( (card[0], rCard) )
+        
+        for card, rCard in relink:
+            if rCard and not _cardParentMatches(card, rCard, jointMapping):
+                _relinkCard(card, rCard, jointMapping)
+    
+    if not missing and not relink:
+        return
     
     # For some reason the shaders are always messed up so burp the display to correct it, and only when evalDeferred
     evalDeferred( "displaySmoothness( '{}', divisionsU=0, divisionsV=0, pointsWire=4, pointsShaded=1, polygonObject=1)".format( getReposeContainer().name() ) )
@@ -292,17 +325,7 @@ def generateReposer(cards=None, placeholder=False, progress=None):
             
     # Otherwise populate the containers with the existing reposer to build/add new stuff.
     else:
-        #allExistingRCards = set( cmds.ls( '*.bpCard', o=True, r=True, l=True ) )
-        allExistingRJoints = set( cmds.ls( '*.bpj', o=True, r=True, l=True ) )
-        
-        for oldRoot in getReposeRoots():
-            joints = cmds.listRelatives( str(oldRoot), f=True, ad=True, type='joint' )
-            joints = [PyNode(c) for c in allExistingRJoints.intersection(joints)]
-        
-            for rj in joints:
-                bpj = rj.bpj.listConnections()[0]
-                jointMapping[rj] = bpj
-                jointMapping[bpj] = rj
+        jointMapping = existingJointMapping()
 
     
     for card in cards:
@@ -329,14 +352,7 @@ def generateReposer(cards=None, placeholder=False, progress=None):
         pdil.dagObj.lock( rCard, 's' )
 
         for jnt in card.joints:
-            reposeJoint = joint(None)
-            targetName = simpleName(jnt, '{}_repose' + suffix)
-            
-            previous, attrs = reposeLink(jnt, reposeJoint, 'bpj') if not placeholder else (None, [])
-            unlock[reposeJoint] = attrs
-            renameReposeObj(reposeJoint, targetName, previous)
-
-            pdil.dagObj.matchTo(reposeJoint, jnt)
+            reposeJoint, unlock[reposeJoint] = makeReposeJoint(jnt, placeholder)
 
             #assert jnt.info.get('options', {}).get('mirroredSide', False) is False, 'parent to mirrored joints not supported yet'
             
@@ -404,16 +420,7 @@ def generateReposer(cards=None, placeholder=False, progress=None):
                 rCard.attr(attr).showInChannelBox(True)
                 
     for reposeJoint in rJoints:
-        pdil.dagObj.lock(reposeJoint, 'ry rz')
-        pdil.dagObj.lock(reposeJoint, 't s') # I can't see why I wasn't locking t/s already.  Possible exception, `freeform`
-        
-        if reposeJoint in unlock:
-            for attr in unlock[reposeJoint]:
-                reposeJoint.attr(attr).unlock()
-                reposeJoint.attr(attr).showInChannelBox(True)
-        
-        addVector(reposeJoint, 'origRot', reposeJoint.r.get())
-        addVector(reposeJoint, 'origTrans', reposeJoint.t.get())
+        finishReposeJoint(reposeJoint, unlock.get(reposeJoint, []))
     
         '''
         children = reposeJoint.listRelatives(type='transform')
@@ -427,6 +434,252 @@ def generateReposer(cards=None, placeholder=False, progress=None):
         '''
     
 
+def existingJointMapping():
+    ''' Returns the lazy "bi-directional mapping" of bpj <-> reposeJoint of the existing reposer, both are added as
+    keys to eachother.
+    '''
+    jointMapping = {}
+    allExistingRJoints = set( cmds.ls( '*.bpj', o=True, r=True, l=True ) )
+    
+    for oldRoot in getReposeRoots():
+        joints = cmds.listRelatives( str(oldRoot), f=True, ad=True, type='joint' ) or []
+        
+        for rj in [PyNode(c) for c in allExistingRJoints.intersection(joints)]:
+            bpj = rj.bpj.listConnections()
+            if bpj:
+                jointMapping[rj] = bpj[0]
+                jointMapping[bpj[0]] = rj
+    
+    return jointMapping
+
+
+def makeReposeJoint(jnt, placeholder=False):
+    ''' Makes the unparented repose joint for the BPJoint, returning it and the attrs unlocked on the one it replaced.
+    '''
+    suffix = '_placeholder' if placeholder else ''
+    
+    reposeJoint = joint(None)
+    targetName = simpleName(jnt, '{}_repose' + suffix)
+    
+    previous, attrs = reposeLink(jnt, reposeJoint, 'bpj') if not placeholder else (None, [])
+    renameReposeObj(reposeJoint, targetName, previous)
+
+    pdil.dagObj.matchTo(reposeJoint, jnt)
+    
+    return reposeJoint, attrs
+
+
+def finishReposeJoint(reposeJoint, unlockAttrs):
+    ''' Locks the parented repose joint, except `unlockAttrs`, and records its original transforms.
+    '''
+    pdil.dagObj.lock(reposeJoint, 'ry rz')
+    pdil.dagObj.lock(reposeJoint, 't s') # I can't see why I wasn't locking t/s already.  Possible exception, `freeform`
+    
+    for attr in unlockAttrs:
+        reposeJoint.attr(attr).unlock()
+        reposeJoint.attr(attr).showInChannelBox(True)
+    
+    addVector(reposeJoint, 'origRot', reposeJoint.r.get())
+    addVector(reposeJoint, 'origTrans', reposeJoint.t.get())
+
+
+def _reposeCardOf(obj):
+    ''' Returns the nearest repose card above `obj`.
+    '''
+    parent = obj.getParent()
+    while parent and not parent.hasAttr('bpCard'):
+        parent = parent.getParent()
+    return parent
+
+
+def _ownedJoints(rCard):
+    ''' Returns {reposeJoint: bpj} of the joints belonging to the repose card, stopping at child repose cards.
+    `bpj` is None if it was deleted.
+    '''
+    owned = {}
+    stack = rCard.listRelatives(type='transform')
+    while stack:
+        child = stack.pop()
+        if child.hasAttr('bpCard'):
+            continue
+        
+        if child.hasAttr('bpj'):
+            bpj = child.bpj.listConnections()
+            owned[child] = bpj[0] if bpj else None
+        
+        stack += child.listRelatives(type='transform')
+    
+    return owned
+
+
+def _expectedCardParent(card, jointMapping):
+    ''' Returns the repose joint the repose card belongs under (or None if it is a root) and if it goes through
+    a mirror group.
+    '''
+    bpj = card.parentCardJoint
+    if bpj not in jointMapping:
+        return None, False
+    
+    mirroredSide = card.joints[0].info.get('options', {}).get('mirroredSide')
+    return jointMapping[bpj], bool(card.isCardMirrored() is False and card.mirror is False and mirroredSide)
+
+
+def _cardParentMatches(card, rCard, jointMapping):
+    parent = rCard.getParent()
+    rj, mirrored = _expectedCardParent(card, jointMapping)
+    
+    if not rj:
+        return rCard.hasAttr('reposeRoot') and parent == getReposeContainer()
+    
+    if mirrored:
+        return hasAttr(rj, 'mirrorGroup') and parent in rj.mirrorGroup.listConnections()
+    
+    return parent == rj
+
+
+def _reposerMatches(card, rCard, jointMapping):
+    owned = _ownedJoints(rCard)
+    if len(owned) != len(card.joints) or set(owned.values()) != set(card.joints):
+        return False
+    
+    start = card.start()
+    for rj, bpj in owned.items():
+        expected = rCard if bpj == start else jointMapping.get(bpj.parent)
+        if expected and rj.getParent() != expected:
+            return False
+    
+    return _cardParentMatches(card, rCard, jointMapping)
+
+
+def diffReposer(cards, jointMapping=None):
+    ''' Compares the cards to the existing reposer.
+    
+    Returns:
+        `(missing, changed)` where `missing` are the cards without a reposer and `changed` are the (card, reposeCard)
+        pairs whose joints or parent no longer match.
+    '''
+    if jointMapping is None:
+        jointMapping = existingJointMapping()
+    
+    validCards = getValidReposeCards()
+    
+    missing = []
+    changed = []
+    for card in cards:
+        rCard = getRCard(card, validCards)
+        if not rCard:
+            missing.append(card)
+        elif not _reposerMatches(card, rCard, jointMapping):
+            changed.append( (card, rCard) )
+    
+    return missing, changed
+
+
+def _reparent(obj, parent):
+    ''' Parent `obj`, keeping its locks, and update its orig vectors since the reposer is expected to be in bind pose.
+    '''
+    locked = [obj.attr(t + a) for t in 'tr' for a in 'xyz' if obj.attr(t + a).isLocked()]
+    for plug in locked:
+        plug.unlock()
+    
+    obj.setParent(parent)
+    
+    for plug in locked:
+        plug.lock()
+    
+    if obj.hasAttr('origRot'):
+        obj.origRot.set( obj.r.get() )
+        obj.origTrans.set( obj.t.get() )
+
+
+def _detachChildCards(obj, keep):
+    ''' Moves the repose cards under `obj` to the container, and the `keep` joints to `keep[joint]`, so `obj` can be
+    deleted.  Returns the moved repose cards.
+    '''
+    moved = []
+    stack = obj.listRelatives(type='transform')
+    while stack:
+        child = stack.pop()
+        if child.hasAttr('bpCard'):
+            _reparent(child, getReposeContainer())
+            moved.append(child)
+        elif child in keep:
+            _reparent(child, keep[child])
+        else:
+            stack += child.listRelatives(type='transform')
+    
+    return moved
+
+
+def _patchJoints(card, rCard, jointMapping):
+    ''' Removes, adds and re-parents the repose joints of the card to match its BPJoints, leaving the others alone
+    so their adjustments are kept.  Returns repose cards of other cards that were moved off of removed joints.
+    '''
+    owned = _ownedJoints(rCard)
+    bpJoints = set(card.joints)
+    
+    keep = {rj: rCard for rj, bpj in owned.items() if bpj in bpJoints}
+    moved = []
+    for rj, bpj in owned.items():
+        if rj in keep or not rj.exists():  # Removed joints can be deleted along with their parent
+            continue
+        
+        moved += _detachChildCards(rj, keep)
+        if jointMapping.get(bpj) == rj:
+            del jointMapping[bpj]
+        jointMapping.pop(rj, None)
+        delete(rj)
+    
+    added = {}
+    for jnt in card.joints:
+        if jointMapping.get(jnt) not in keep:
+            reposeJoint, added[reposeJoint] = makeReposeJoint(jnt)
+            jointMapping[jnt] = reposeJoint
+            jointMapping[reposeJoint] = jnt
+    
+    start = card.start()
+    for jnt in card.joints:
+        rj = jointMapping[jnt]
+        parent = rCard if jnt == start else jointMapping.get(jnt.parent)
+        if parent and rj.getParent() != parent:
+            _reparent(rj, parent)
+    
+    for reposeJoint, attrs in added.items():
+        finishReposeJoint(reposeJoint, attrs)
+    
+    return moved
+
+
+def _relinkCard(card, rCard, jointMapping):
+    ''' Parents the repose card under the repose joint of its parent card, or makes it a root.
+    '''
+    rj, mirrored = _expectedCardParent(card, jointMapping)
+    
+    if rj:
+        _reparent(rCard, makeMirrored(rj) if mirrored else rj)
+        xform(rCard, ws=True, piv=xform(card.start(), q=True, t=True, ws=True) )
+        pdil.dagObj.lock(rCard, 't')
+        if rCard.hasAttr('reposeRoot'):
+            rCard.deleteAttr('reposeRoot')
+    else:
+        _reparent(rCard, getReposeContainer())
+        if not rCard.hasAttr('reposeRoot'):
+            rCard.addAttr('reposeRoot', at='message')
+
+
+def _pruneReposer():
+    ''' Deletes the repose cards whose blueprint card no longer exists, returning the repose cards of other cards
+    that were under them.
+    '''
+    moved = []
+    for rCard in getValidReposeCards():
+        if rCard.exists() and rCard.hasAttr('bpCard') and not rCard.bpCard.listConnections():
+            moved += _detachChildCards(rCard, {})
+            delete(rCard)
+    
+    return [obj for obj in moved if obj.exists()]
+
+
 def getReposeRoots():
     ''' Return the top level reposer cards
     '''
@@ -453,9 +706,112 @@ def setTrans(obj, t):
             pass
 
 
+def _applyModifier(modifier, undo):
+    if undo:
+        modifier.undoIt()
+    else:
+        modifier.doIt()
+
+
+def _isSettable(plug):
+    ''' True if the plug isn't locked or driven by anything but an animCurve.
+    '''
+    if plug.isLocked:
+        return False
+    
+    if plug.isDestination:
+        return plug.source().node().hasFn(OpenMaya.MFn.kAnimCurve)
+    
+    return True
+
+
+def setPlugs(plugValues):
+    ''' Sets all the (MPlug, value in internal units) pairs with a single, undoable, MDGModifier.
+    '''
+    modifier = OpenMaya.MDGModifier()
+    for plug, value in plugValues:
+        modifier.newPlugValueDouble(plug, value)
+    
+    modifier.doIt()
+    apiUndo.append( ApiUndoItem(_applyModifier, (modifier, False), (modifier, True)) )
+
+
+class PoseSnapshot(object):
+    ''' Captures the settable translate and rotate plugs (or `attrs`) of the objects in one pass so new values can
+    be applied, and the originals restored, as single bulk operations.
+    
+    Values are stored in internal units (cm and radians).
+    '''
+    
+    TRANSFORM_ATTRS = ('tx', 'ty', 'tz', 'rx', 'ry', 'rz')
+    
+    def __init__(self, objs, attrs=TRANSFORM_ATTRS):
+        self.plugs = {}   # {(obj, attr): (MPlug, MObjectHandle)}
+        self.values = {}  # {(obj, attr): value}
+        
+        # Resolved individually since an MSelectionList drops duplicates, which would shift the indices.
+        for obj in set(objs):
+            fn = pdil.capi.asMObject(obj)
+            handle = OpenMaya.MObjectHandle( fn.object() )
+            for attr in attrs:
+                plug = fn.findPlug(attr, False)
+                if _isSettable(plug):
+                    self.plugs[(obj, attr)] = (plug, handle)
+                    self.values[(obj, attr)] = plug.asDouble()
+    
+    def __contains__(self, key):
+        return key in self.plugs
+    
+    def _plugValues(self, values):
+        for key, value in values.items():
+            if key in self.plugs:
+                plug, handle = self.plugs[key]
+                if handle.isValid():
+                    yield plug, value
+    
+    def apply(self, values):
+        ''' Sets the {(obj, attr): value} given in internal units, skipping anything not captured.
+        '''
+        setPlugs( self._plugValues(values) )
+    
+    def restore(self):
+        ''' Sets everything back to the captured values, skipping deleted objects.
+        '''
+        setPlugs( self._plugValues(self.values) )
+
+
+def _eulerMatrix(degrees):
+    return OpenMaya.MEulerRotation( *[OpenMaya.MAngle.uiToInternal(v) for v in degrees] ).asMatrix()
+
+
+def _matchWorld(obj, world, translate=False):
+    ''' Sets the rotation, and optionally translation, of `obj` so it has the given world MMatrix, ignoring scale.
+    '''
+    local = world * pdil.capi.getMatrix(obj, 'parentInverseMatrix')
+    
+    # The local rotation is [rotateAxis][rotate][jointOrient]
+    rotMatrix = _eulerMatrix(obj.rotateAxis.get()).inverse() * OpenMaya.MTransformationMatrix(local).rotation(asQuaternion=True).asMatrix()
+    if obj.hasAttr('jointOrient'):
+        rotMatrix = rotMatrix * _eulerMatrix(obj.jointOrient.get()).inverse()
+    
+    rotation = OpenMaya.MTransformationMatrix(rotMatrix)
+    rotation.reorderRotation( OpenMaya.MFnTransform( pdil.capi.asDagPath(obj) ).rotationOrder() )
+    rot = rotation.rotation()
+    setRot(obj, [OpenMaya.MAngle.internalToUI(v) for v in (rot.x, rot.y, rot.z)])
+    
+    if translate:
+        # Offsetting by the difference works regardless of pivots.
+        offset = OpenMaya.MTransformationMatrix(local).translation(OpenMaya.MSpace.kTransform) \
+            - OpenMaya.MTransformationMatrix( pdil.capi.getMatrix(obj, 'matrix') ).translation(OpenMaya.MSpace.kTransform)
+        current = obj.t.get()
+        setTrans(obj, [current[i] + OpenMaya.MDistance.internalToUI(offset[i]) for i in range(3)])
+
+
 @contextlib.contextmanager
 def reposeToBindPose(cards):
     ''' Temporarily puts the repose cards in their original orientation (to add/edit cards).
+    
+    Anything re-parented within the block gets its world transform back instead of its old local values.
     '''
     validCards = getValidReposeCards()
 
@@ -463,6 +819,8 @@ def reposeToBindPose(cards):
     currentRot = {}
 
     jointRot = {}
+    
+    parents = {}  # {repose card or joint: (parent, world MMatrix)}
 
     for card in cards:
         reposeCard = getRCard(card, validCards)
@@ -471,25 +829,39 @@ def reposeToBindPose(cards):
 
         currentRot[reposeCard] = reposeCard.r.get()
         currentTrans[reposeCard] = reposeCard.t.get()
+        parents[reposeCard] = (reposeCard.getParent(), pdil.capi.getMatrix(reposeCard))
         
-        setRot(reposeCard, reposeCard.origRot.get())
-        setTrans(reposeCard, reposeCard.origTrans.get())
-
         for jnt in card.joints:
             repose = getRJoint(jnt)
 
             if repose:
                 jointRot[repose] = repose.r.get()
-                setRot(repose, repose.origRot.get())
+                parents[repose] = (repose.getParent(), pdil.capi.getMatrix(repose))
+    
+    # Worlds are captured before anything moves since the cards and joints are nested.
+    for reposeCard in currentRot:
+        setRot(reposeCard, reposeCard.origRot.get())
+        setTrans(reposeCard, reposeCard.origTrans.get())
+    
+    for repose in jointRot:
+        setRot(repose, repose.origRot.get())
 
     yield
+    
+    reparented = [obj for obj, (parent, world) in parents.items() if obj.exists() and obj.getParent() != parent]
 
     for reposeCard, origRot in currentRot.items():
-        setRot(reposeCard, origRot )
-        setTrans(reposeCard, currentTrans[reposeCard] )
+        if reposeCard not in reparented and reposeCard.exists():
+            setRot(reposeCard, origRot )
+            setTrans(reposeCard, currentTrans[reposeCard] )
 
     for reposeJoint, origRot in jointRot.items():
-        setRot(reposeJoint, origRot )
+        if reposeJoint not in reparented and reposeJoint.exists():
+            setRot(reposeJoint, origRot )
+    
+    # Parents first so the children match against their final parent matrices.
+    for obj in sorted(reparented, key=lambda o: o.longName().count('|')):
+        _matchWorld(obj, parents[obj][1], translate=obj in currentTrans)
 
 
 class matchReposer(object):
@@ -506,57 +878,96 @@ class matchReposer(object):
     
     def __init__(self, cards):
         self.relock = []
-        self.prevPos = {}
-        self.prevRot = {}
 
         validCards = getValidReposeCards()
-
+        
+        targetRots = {}  # {card: world rotation as MQuaternion}
+        reposeJoints = {}  # {jnt: repose joint}
+        
         for card in cards:
             reposeCard = getRCard(card, validCards)
             if not reposeCard:
                 continue
-                
-            self.prevRot[card] = self.getRotations(card)
-            rot = xform(reposeCard, q=True, ws=True, ro=True)
             
-            # Need to unlock/disconnect rotation, then redo it later (to handle twists aiming at next joint)
-            
-            xform(card, ws=True, ro=rot)
+            targetRots[card] = OpenMaya.MTransformationMatrix( pdil.capi.getMatrix(reposeCard) ).rotation(asQuaternion=True)
             
             for jnt in card.joints:
                 repose = getRJoint(jnt)
                 
                 if repose:
+                    reposeJoints[jnt] = repose
                     for axis in 'xyz':
                         plug = jnt.attr('t' + axis)
                         if plug.isLocked():
                             plug.unlock()
                             self.relock.append(plug)
-                    #if jnt.tx.isLocked():
-                    #    jnt.tx.unlock()
-                    #    relock.append(jnt)
-                        
-                    self.prevPos[jnt] = jnt.t.get()
-                    
-                    trans = xform(repose, q=True, t=True, ws=True)
-                    try:
-                        xform(jnt, ws=True, t=trans)
-                    except Exception:
-                        del self.prevPos[jnt]
-                        
+        
+        # Need to unlock/disconnect rotation, then redo it later (to handle twists aiming at next joint)
+        self.cardPose = PoseSnapshot(list(targetRots), ('rx', 'ry', 'rz'))
+        self.cardPose.apply( self._cardRotations(targetRots) )
+        
+        # Joint translations are solved after the cards are rotated so their parent matrices are current.
+        self.jointPose = PoseSnapshot(list(reposeJoints), ('tx', 'ty', 'tz'))
+        self.jointPose.apply( self._jointTranslations(reposeJoints) )
+    
+    @staticmethod
+    def _cardRotations(targetRots):
+        ''' Returns the {(card, 'rx'): val} to orient the cards to the given world rotations.
+        '''
+        values = {}
+        for card, worldRot in targetRots.items():
+            parent = card.getParent()
+            if parent in targetRots:
+                parentMatrix = targetRots[parent].asMatrix()
+            else:
+                parentMatrix = pdil.capi.getMatrix(card, 'parentMatrix')
+            
+            local = OpenMaya.MTransformationMatrix( worldRot.asMatrix() * parentMatrix.inverse() )
+            local.reorderRotation( OpenMaya.MFnTransform( pdil.capi.asDagPath(card) ).rotationOrder() )
+            rot = local.rotation()
+            
+            values[(card, 'rx')] = rot.x
+            values[(card, 'ry')] = rot.y
+            values[(card, 'rz')] = rot.z
+        
+        return values
+    
+    def _jointTranslations(self, reposeJoints):
+        ''' Returns the {(jnt, 'tx'): val} to put the joints at the world positions of their repose joints.
+        '''
+        def worldPos(obj):
+            return OpenMaya.MTransformationMatrix( pdil.capi.getMatrix(obj) ).translation(OpenMaya.MSpace.kWorld)
+        
+        targets = {jnt: worldPos(repose) for jnt, repose in reposeJoints.items()}
+        
+        # Moving a joint carries its children, so they are offset by how far their nearest moved ancestor travels.
+        offsets = {jnt: targets[jnt] - worldPos(jnt) for jnt in reposeJoints
+                   if all( (jnt, 't' + axis) in self.jointPose for axis in 'xyz' )}
+        
+        values = {}
+        for jnt, target in targets.items():
+            parent = jnt.getParent()
+            while parent:
+                if parent in offsets:
+                    target = target - offsets[parent]
+                    break
+                parent = parent.getParent()
+            
+            local = OpenMaya.MPoint(target) * pdil.capi.getMatrix(jnt, 'parentInverseMatrix')
+            
+            values[(jnt, 'tx')] = local.x
+            values[(jnt, 'ty')] = local.y
+            values[(jnt, 'tz')] = local.z
+        
+        return values
+    
     def unmatch(self):
+        self.jointPose.restore()
         
-        for jnt, pos in self.prevPos.items():
-            try:
-                jnt.t.set(pos)
-            except Exception:
-                pass
-                
         for plug in self.relock:
             plug.lock()
-            
-        for card, rot in self.prevRot.items():
-            self.restoreRotations(card, rot)
+        
+        self.cardPose.restore()
 
 
     @staticmethod
@@ -618,23 +1029,23 @@ class goToBindPose(object):
         '''
 
         controls = find.controllers()
-        self.current = {ctrl: (ctrl.t.get(), ctrl.r.get()) for ctrl in controls }
-
-
-        for ctrl in controls:
-            if ctrl.hasAttr( 'bindZero' ):
-                try:
-                    ctrl.r.set( ctrl.bindZero.get() )
-                except Exception:
-                    pass
-
-            if ctrl.hasAttr( 'bindZeroTr' ):
-                ctrl.t.set( ctrl.bindZeroTr.get() )
+        self.pose = PoseSnapshot(controls)
+        
+        # bindZero and bindZeroTr are plain doubles in ui units.
+        bindPose = {}
+        for ctrl in set(controls):  # `controllers()` can list the main and root motion twice
+            fn = pdil.capi.asMObject(ctrl)
+            for attr, channel, toInternal in [('bindZero', 'r', OpenMaya.MAngle.uiToInternal),
+                                              ('bindZeroTr', 't', OpenMaya.MDistance.uiToInternal)]:
+                if fn.hasAttribute(attr):
+                    plug = fn.findPlug(attr, False)
+                    for index, axis in enumerate('xyz'):
+                        bindPose[(ctrl, channel + axis)] = toInternal( plug.child(index).asDouble() )
+        
+        self.pose.apply(bindPose)
 
     def returnFromPose(self):
-        for ctrl, (pos, rot) in self.current.items():
-            setRot(ctrl, rot)
-            setTrans(ctrl, pos)
+        self.pose.restore()
 
 
 def addVector(obj, name, val):
@@ -1,9 +1,11 @@
 from __future__ import absolute_import, division, print_function
 
-from pymel.core import cmds, connectAttr, createNode, deleteAttr, listConnections, nodeType, getAttr, mel, PyNode, warning
-
 import logging
 
+from maya.api import OpenMaya
+
+from pymel.core import cmds, deleteAttr, listConnections, PyNode, warning
+
 import pdil
 
 from .._core import find
@@ -30,37 +32,148 @@ def get(create=True):
         return None
         
         
-def getVisLevel(obj):
-    ''' Returns ('name', int:level) if it's in a group, otherwise an empty tuple.
+class _VisRegistry(object):
+    ''' Caches the vis groups of the shared shape, the condition node of each (group, level) and the (group, level)
+    of each object, so connecting or querying many controls doesn't search the connections of each one.
+    
+    Callbacks mark it stale when connections change on the shared shape or its conditions, or when either is deleted.  It is rebuilt on the next use.
     '''
     
-    zero = pdil.dagObj.zero(obj, apply=False, make=False)
-    if zero:
-        obj = zero
+    def __init__(self):
+        self.stale = True
+        self.editing = False  # Connections made by the registry itself keep it current
+        self.shape = None
+        self.conditions = {}  # {(group, level): condition node name}
+        self.members = {}  # {uuid of object with connected visibility: (group, level)}
+        self.globalCallbacks = []
+        self.nodeCallbacks = []
+    
+    def markStale(self, *args):
+        self.stale = True
+    
+    def _connectionChanged(self, msg, plug, otherPlug, clientData):
+        if not self.editing and msg & (OpenMaya.MNodeMessage.kConnectionMade | OpenMaya.MNodeMessage.kConnectionBroken):
+            self.stale = True
+    
+    def _installGlobalCallbacks(self):
+        if self.globalCallbacks:
+            return
         
-    visCon = listConnections(obj.visibility.name(), p=True, s=True, d=False)
-    if visCon:
-        node = visCon[0].node()
-        attr = visCon[0].longName()  # This returns the long attr name, not the node at all, where .attrName() returns the short name.
-        shape = get(create=False)
+        self.globalCallbacks = [
+            OpenMaya.MDGMessage.addNodeRemovedCallback(self.markStale, 'condition'),
+            OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kAfterOpen, self.markStale),
+            OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kAfterNew, self.markStale),
+        ]
+    
+    def _watch(self, node):
+        self.nodeCallbacks.append(
+            OpenMaya.MNodeMessage.addAttributeChangedCallback( pdil.capi.asMObject(node).object(), self._connectionChanged )
+        )
+    
+    def _removeNodeCallbacks(self):
+        for callbackId in self.nodeCallbacks:
+            try:
+                OpenMaya.MMessage.removeCallback(callbackId)
+            except Exception:  # The node might have been deleted
+                pass
+        self.nodeCallbacks = []
+    
+    def removeCallbacks(self):
+        self._removeNodeCallbacks()
+        for callbackId in self.globalCallbacks:
+            OpenMaya.MMessage.removeCallback(callbackId)
+        self.globalCallbacks = []
+    
+    def rebuild(self, shape):
+        self._installGlobalCallbacks()
+        self._removeNodeCallbacks()
         
-        level = 1
+        self.shape = shape
+        self.conditions = {}
+        self.members = {}
         
-        if nodeType(node) == 'condition' and attr == 'outColorR':
-            #con = listConnections(node + '.firstTerm', p=True, s=True, d=False)
-            con = node.firstTerm.listConnections(p=True, s=True, d=False)
+        if shape:
+            self._watch(shape)
+            self.nodeCallbacks.append(
+                OpenMaya.MNodeMessage.addNodePreRemovalCallback( pdil.capi.asMObject(shape).object(), self.markStale )
+            )
             
-            if con:
-                level = int(getAttr(node + '.secondTerm'))
-                #node = shortName(con[0].node())
-                attr = con[0].longName()  # longName() returns the long attribute name, not the node (technically they are the same here).
-                return attr, level
+            for group in cmds.listAttr( shape, ud=True, s=True ) or []:
+                for dest in cmds.listConnections( shape + '.' + group, s=False, d=True, p=True ) or []:
+                    node, attr = dest.split('.', 1)
+                    if attr == 'visibility':
+                        self.members[ _uuid(node) ] = (group, 1)
+                    
+                    elif attr == 'firstTerm' and cmds.nodeType(node) == 'condition':
+                        level = int( cmds.getAttr(node + '.secondTerm') )
+                        self.conditions.setdefault( (group, level), node )
+                        self._watch(node)
+                        
+                        for obj in cmds.listConnections( node + '.outColorR', s=False, d=True, p=True ) or []:
+                            if obj.endswith('.visibility'):
+                                self.members[ _uuid(obj.split('.')[0]) ] = (group, level)
         
-        # Verify the shape is sharedShape via uuid (as of 2017, pymel tosses an error)
-        if mel.ls(node, uuid=True)[0] == mel.ls(shape, uuid=True)[0]:
-            return attr, level
+        self.stale = False
+    
+    def sync(self, shape):
+        ''' Rebuild if stale or the shared shape is different.
+        '''
+        if self.stale or self.shape != shape:
+            self.rebuild(shape)
+    
+    def condition(self, plug, level):
+        ''' Returns the name of the condition node of the `plug` on the shared shape for `level`, making it if needed.
+        '''
+        group = plug.split('.')[-1]
+        node = self.conditions.get( (group, level) )
+        if node and cmds.objExists(node):
+            return node
+        
+        node = cmds.createNode('condition', n=group + '_%i' % level)
+        cmds.setAttr( node + '.secondTerm', level )
+        cmds.setAttr( node + '.operation', 3 )
+        cmds.setAttr( node + '.colorIfTrue', 1, 1, 1 )
+        cmds.setAttr( node + '.colorIfFalse', 0, 0, 0 )
+        
+        self.editing = True
+        try:
+            cmds.connectAttr( plug, node + '.firstTerm', f=True )
+        finally:
+            self.editing = False
+        
+        self.conditions[ (group, level) ] = node
+        self._watch(node)
         
-    return ()
+        return node
+
+
+def _uuid(name):
+    return cmds.ls(name, uuid=True)[0]
+
+
+def _visObject(obj):
+    ''' The zero group holds the visibility connection if it exists.
+    '''
+    zero = pdil.dagObj.zero(obj, apply=False, make=False)
+    return zero if zero else obj
+
+
+def getVisLevel(obj):
+    ''' Returns ('name', int:level) if it's in a group, otherwise an empty tuple.
+    '''
+    return getVisLevels([obj])[obj]
+
+
+def getVisLevels(objs):
+    ''' Returns {obj: ('name', int:level)} for all the objects in a single pass, using an empty tuple if not in a group.
+    '''
+    shape = get(create=False)
+    if not shape:
+        return {obj: () for obj in objs}
+    
+    _registry.sync(shape)
+    
+    return {obj: _registry.members.get( _uuid(_visObject(obj).name() ), () ) for obj in objs}
 
 
 def connect( obj, name_level ):
@@ -71,23 +184,23 @@ def connect( obj, name_level ):
     Optionanal `level` will determine when the `obj` will become visible.  For
     example, 2 will not be visible at 1, but will at 2 and higher.
     '''
+    connectMany( [obj], name_level )
+
+
+def connectMany( objs, name_level ):
+    '''
+    Hook the visibility of all the `objs` to the same vis group, see `connect()`.
+    The attr and condition are only resolved once.
+    '''
     
     name, level = name_level # Probably should just update this eventually to be 3 params
     
-    orig = obj
-    
-    zero = pdil.dagObj.zero(obj, apply=False, make=False)
-    if zero:
-        obj = zero
-    
     shape = get()
     
     if not shape:
         warning('Unable to add vis control, no object exists named "main" or tagged with ".fossilMainControl"')
         return
     
-    log.debug('Applying vis control to {}, was given {} using {}'.format(obj, orig, shape))
-    
     plug = shape + '.' + name
     if not cmds.objExists( plug ):
         cmds.addAttr( shape, ln=name, at='short', min=0, max=level, dv=1 )
@@ -99,15 +212,25 @@ def connect( obj, name_level ):
     if cmds.addAttr(plug, q=True, max=True) < level:
         cmds.addAttr(plug, e=True, max=level)
     
-    if level == 1:
-        connectAttr( plug, obj.visibility.name(), f=True)
-    else:
-        connectAttr( getConditionNode(plug, level).outColorR, obj.visibility, f=True)
-        
-    obj.visibility.setKeyable(False)
+    _registry.sync(shape)
     
-    if not pdil.sharedShape.find(orig, VIS_NODE_TYPE):
-        pdil.sharedShape.use(orig, shape)
+    source = plug if level == 1 else _registry.condition(plug, level) + '.outColorR'
+    
+    _registry.editing = True
+    try:
+        for orig in objs:
+            obj = _visObject(orig)
+            
+            log.debug('Applying vis control to {}, was given {} using {}'.format(obj, orig, shape))
+            
+            cmds.connectAttr( source, obj.visibility.name(), f=True )
+            obj.visibility.setKeyable(False)
+            _registry.members[ _uuid(obj.name()) ] = (name, level)
+            
+            if not pdil.sharedShape.find(orig, VIS_NODE_TYPE):
+                pdil.sharedShape.use(orig, shape)
+    finally:
+        _registry.editing = False
     
     # If we have a main controller, put the container in a subgroup to make
     # the main group more organized.
@@ -121,24 +244,11 @@ def connect( obj, name_level ):
 
 
 def getConditionNode(plug, level):
+    ''' Returns the condition node that turns on at `level` for the vis group `plug` (on the shared shape), making it
+    if needed.
     '''
-    '''
-    
-    conditions = PyNode(plug).listConnections(type='condition', p=True, d=True, s=False)
-    for condition in conditions:
-        if condition.attrName() == 'ft' and condition.node().secondTerm.get() == level:
-            return condition.node()
-    
-    condition = createNode('condition', n=plug.split('.')[1] + '_%i' % level)
-    condition.secondTerm.set(level)
-    condition.operation.set(3)
-    connectAttr( plug, condition.firstTerm, f=True )
-    
-    
-    condition.colorIfTrue.set(1, 1, 1)
-    condition.colorIfFalse.set(0, 0, 0)
-    
-    return condition
+    _registry.sync( plug.split('.')[0] )
+    return PyNode( _registry.condition(plug, level) )
 
 
 def existingGroups():
@@ -216,3 +326,9 @@ def deserializeAllConnections(connections=None):
         if objExists(obj):
             connect(PyNode(obj), data)
 '''
+
+
+# Only one registry should exist, so clean up the callbacks when reloading.
+if '_registry' in globals():
+    _registry.removeCallbacks()
+_registry = _VisRegistry()
@@ -19,4 +19,8 @@ from .build import ( # noqa
     buildRig,
     buildBones,
     deleteBones,
+    markBuilt,
+    isDirty,
+    getRebuildCards,
+    validateBuild,
     )
@@ -1,4 +1,6 @@
+import collections
 from contextlib import contextmanager
+import hashlib
 import json
 import logging
 
@@ -15,7 +17,6 @@ from ..._core import skinning
 from ..._lib import space
 from ..._lib import tpose
 from ..._lib2 import controllerShape
-from ...vendor.session_memo import session, session_memoize
 
 from ... import nodeApi
 
@@ -36,14 +37,15 @@ def buildBones(cards=None, removeTempBind=True):
             pdil.ui.notify( m='No cards selected' )
             return
 
-    issues = validateBoneNames(cards)
+    issues = validateBuild(cards, [NAMES])
     if issues:
-        pdil.ui.notify(m='\n'.join(issues), t='Fix these')
+        pdil.ui.notify(m='\n'.join(issue.message for issue in issues), t='Fix these')
         return
     
     cardBuildOrder = find.cardJointBuildOrder()
 
-    skinning.cacheWeights(cards, _meshStorage)
+    with pdil.debug.profile('cacheWeights'):
+        skinning.cacheWeights(cards, _meshStorage)
 
     useRepose = tpose.reposerExists()
     if useRepose:
@@ -59,7 +61,8 @@ def buildBones(cards=None, removeTempBind=True):
             with tpose.matchReposer(cardBuildOrder):
                 for card in cardBuildOrder:
                     if card in cards:
-                        newJoints = card.buildJoints_core(nodeApi.JointMode.tpose)
+                        with pdil.debug.profile(card.name() + ' tpose joints'):
+                            newJoints = card.buildJoints_core(nodeApi.JointMode.tpose)
                         realJoints += newJoints
                         
                         accessoryFixup(newJoints, card)
@@ -75,7 +78,8 @@ def buildBones(cards=None, removeTempBind=True):
             
             # Temp build the bind pose joints
             for card in bindCardsToBuild:
-                joints = card.buildJoints_core(nodeApi.JointMode.bind)
+                with pdil.debug.profile(card.name() + ' bind joints'):
+                    joints = card.buildJoints_core(nodeApi.JointMode.bind)
                 tempBindJoints += joints
                 if card in cards:
                     bindPoseJoints += joints
@@ -147,16 +151,18 @@ def buildBones(cards=None, removeTempBind=True):
         with pdil.ui.progressWin(title='Build Bones', max=len(cards)) as prog:
             for card in cardBuildOrder:
                 if card in cards:
-                    newJoints = card.buildJoints_core(nodeApi.JointMode.default)
+                    with pdil.debug.profile(card.name() + ' joints'):
+                        newJoints = card.buildJoints_core(nodeApi.JointMode.default)
                     accessoryFixup(newJoints, card)
                     prog.update()
     
     
-    if useRepose:
-        with tpose.goToBindPose():
+    with pdil.debug.profile('loadCachedWeights'):
+        if useRepose:
+            with tpose.goToBindPose():
+                skinning.loadCachedWeights(_meshStorage)
+        else:
             skinning.loadCachedWeights(_meshStorage)
-    else:
-        skinning.loadCachedWeights(_meshStorage)
     
     select(cards)
 
@@ -179,63 +185,66 @@ def buildRig(cards=None):
     
     # allJoints = ...
             
-    cardMissingJoints = []
-    for card in cards:
-        joints = card.getOutputJoints()
-        if joints and card.rigData.get('rigCmd', '') != 'Group':  # Group doesn't build joints
-            if len(cmds.ls(joints)) != len(joints): # &&& This is a bad check, a reference mesh joints can mess it up.
-                cardMissingJoints.append(card)
+    # Cards read their rigData/rigState constantly while building so only parse it once.
+    failed = set()
+    
+    with pdil.factory.jsonCache():
+        cardMissingJoints = [issue.card for issue in validateBuild(cards, [MISSING_JOINTS])]
                 
-    # &&& Ideally this prompts to build joints
-    if cardMissingJoints:
-        print('Cards that do not have built joints:')
-        print('\n'.join(str(c) for c in cardMissingJoints))
-        if len(cardMissingJoints) == 1:
-            pdil.ui.notify(m='{} does not have joints built.'.format(cardMissingJoints[0]) )
-        elif len(cardMissingJoints) < 10:
-            pdil.ui.notify(m='{} cards do not have joints built:\n{}'.format(
-                len(cardMissingJoints), '\n'.join(str(c) for c in cardMissingJoints)
-            ) )
-        else:
-            pdil.ui.notify(m='{} cards do not have joints built.\nSee script editor for full list'.format(
-                len(cardMissingJoints), '\n'.join(str(c) for c in cardMissingJoints)
-            ) )
-        raise Exception('Joints not built')
+        # &&& Ideally this prompts to build joints
+        if cardMissingJoints:
+            print('Cards that do not have built joints:')
+            print('\n'.join(str(c) for c in cardMissingJoints))
+            if len(cardMissingJoints) == 1:
+                pdil.ui.notify(m='{} does not have joints built.'.format(cardMissingJoints[0]) )
+            elif len(cardMissingJoints) < 10:
+                pdil.ui.notify(m='{} cards do not have joints built:\n{}'.format(
+                    len(cardMissingJoints), '\n'.join(str(c) for c in cardMissingJoints)
+                ) )
+            else:
+                pdil.ui.notify(m='{} cards do not have joints built.\nSee script editor for full list'.format(
+                    len(cardMissingJoints), '\n'.join(str(c) for c in cardMissingJoints)
+                ) )
+            raise Exception('Joints not built')
     
-    a = pdil.debug.Timer('Overall build')
+        a = pdil.debug.Timer('Overall build')
             
-    cardBuildOrder = find.cardJointBuildOrder()
+        cardBuildOrder = find.cardJointBuildOrder()
     
-    with tpose.matchReposer(cardBuildOrder) if tpose.reposerExists() else nothing():
+        with tpose.matchReposer(cardBuildOrder) if tpose.reposerExists() else nothing():
         
-        with pdil.ui.progressWin(title='Building', max=len(cards) * 3 ) as pr:
+            with pdil.ui.progressWin(title='Building', max=len(cards) * 3 ) as pr:
             
-            for card in cardBuildOrder:
-                if card not in cards:
-                    continue
-                pr.update(status=card.name() + ' prep')
-                if mode == 'Use Current Shapes':
-                    card.saveShapes()
+                for card in cardBuildOrder:
+                    if card not in cards:
+                        continue
+                    pr.update(status=card.name() + ' prep')
+                    if mode == 'Use Current Shapes':
+                        card.saveShapes()
                 
-                # If this being rebuilt, also restore the if it's in ik or fk
-                switchers = [controllerShape.getSwitcherPlug(x[0]) for x in card._outputs()]
-                prevValues = [ (s, getAttr(s)) for s in switchers if s]
-
-                card.removeRig()
-                pr.update(status=card.name() + ' build')
-                _buildRig([card])
+                    # If this being rebuilt, also restore the if it's in ik or fk
+                    switchers = [controllerShape.getSwitcherPlug(x[0]) for x in card._outputs()]
+                    prevValues = [ (s, getAttr(s)) for s in switchers if s]
+
+                    with pdil.debug.profile(card.name() + ' removeRig'):
+                        card.removeRig()
+                    pr.update(status=card.name() + ' build')
+                    if _buildRig([card]):
+                        failed.add(card)
                 
-                pr.update(status=card.name() + ' build')
-                if mode != 'Use Rig Info Shapes':
-                    card.restoreShapes()
+                    pr.update(status=card.name() + ' build')
+                    if mode != 'Use Rig Info Shapes':
+                        card.restoreShapes()
                     
-                # Restore ik/fk-ness
-                for switch, value in prevValues:
-                    if objExists(switch):
-                        setAttr(switch, value)
+                    # Restore ik/fk-ness
+                    for switch, value in prevValues:
+                        if objExists(switch):
+                            setAttr(switch, value)
                 
     tpose.markBindPose(cards)
     
+    markBuilt( [card for card in cards if card not in failed] )
+    
     select(cards)
     a.stop()
 
@@ -273,7 +282,8 @@ def _buildRig(cards):
                 
                 rigComponent = cardRigging.registeredControls[ card.rigData.get('rigCmd') ]
                 fk = not isAccessory if isAccessory and rigComponent.ik_ else True # Skip fk for ik accessories
-                rigComponent.build(card, buildFk=fk )
+                with pdil.debug.profile(card.name() + ' ' + card.rigData.get('rigCmd')):
+                    rigComponent.build(card, buildFk=fk )
             except Exception:
                 print( traceback.format_exc() )
                 errors.append( (card, traceback.format_exc()) )
@@ -283,9 +293,11 @@ def _buildRig(cards):
         if card.rigData.get('rigCmd'):
             func = cardRigging.registeredControls[ card.rigData.get('rigCmd') ]
             if func:
-                func.postCreate(card)
+                with pdil.debug.profile(card.name() + ' postCreate'):
+                    func.postCreate(card)
     
-    space.attemptDelayedSpaces()
+    with pdil.debug.profile('attemptDelayedSpaces'):
+        space.attemptDelayedSpaces()
     
     if errors:
     
@@ -299,64 +311,119 @@ def _buildRig(cards):
         
         if raiseErrors:
             raise Exception( 'Errors occured on {0}'.format( errors ) )
+    
+    return errors
 
 
-def validateBoneNames(cards):
+Issue = collections.namedtuple('Issue', 'check card message')
+
+NAMES = 'names'
+HELPER_PARENT = 'helperParent'
+MISSING_JOINTS = 'missingJoints'
+
+ALL_CHECKS = (NAMES, HELPER_PARENT, MISSING_JOINTS)
+
+
+def validateBuild(cards, checks=ALL_CHECKS):
     '''
-    Returns a list of any name issues building the given cards.
+    Runs the pre-build `checks` on the given cards, gathering the output names of
+    every card once and checking against a joint name -> cards index.
+    
+    Returns a list of `Issue(check, card, message)`, empty if everything is fine.
     '''
+    allCards = find.blueprintCards() if NAMES in checks else []  # Only names are compared to other cards
+    outputs = collections.OrderedDict( (c, c.getOutputJoints()) for c in allCards )
+    for card in cards:
+        if card not in outputs:
+            outputs[card] = card.getOutputJoints()
+    
     issues = []
-    allJoints = { c: c.getOutputJoints() for c in find.blueprintCards()}
+    if NAMES in checks:
+        issues += _checkNames(cards, outputs)
+    if HELPER_PARENT in checks:
+        issues += _checkHelperParents(cards)
+    if MISSING_JOINTS in checks:
+        issues += _checkMissingJoints(cards, outputs)
+    
+    return issues
 
-    untestedCards = list(allJoints.keys())
 
+def _checkNames(cards, outputs):
+    issues = []
+    cardSet = set(cards)
+    
+    owners = collections.defaultdict(list)  # {joint name: [cards making it]}
+    for card, names in outputs.items():
+        for name in set(names):
+            owners[name].append(card)
+    
     for current in cards:
-        
-        untestedCards.remove(current)
-
-        currentJoints = set( allJoints[current] )
-        if len(currentJoints) != len( allJoints[current] ):
+        currentJoints = set( outputs[current] )
+        if len(currentJoints) != len( outputs[current] ):
             if current.isCardMirrored() and not current.findSuffix():
-                issues.append(current.name() + ' will mirror but needs a "Side" assignment')
+                issues.append( Issue(NAMES, current, current.name() + ' will mirror but needs a "Side" assignment') )
             else:
-                issues.append(current.name() + ' does not have unique internal names')
+                issues.append( Issue(NAMES, current, current.name() + ' does not have unique internal names') )
         
         if 'NOT_ENOUGH_NAMES' in currentJoints:
-            issues.append( '{} does not have enough names'.format(current) )
-
-        for otherCard in untestedCards:
-            overlap = currentJoints.intersection( allJoints[otherCard] )
-            if overlap:
-                issues.append( '{} and {} overlap {}'.format( current, otherCard, overlap ))
-
+            issues.append( Issue(NAMES, current, '{} does not have enough names'.format(current)) )
+    
+    # Each overlapping pair is only reported once, by the card being validated.
+    overlaps = collections.OrderedDict()
+    for name, owned in owners.items():
+        for i, a in enumerate(owned):
+            for b in owned[i + 1:]:
+                if a in cardSet:
+                    overlaps.setdefault( (a, b), set() ).add(name)
+                elif b in cardSet:
+                    overlaps.setdefault( (b, a), set() ).add(name)
+    
+    for (current, otherCard), overlap in overlaps.items():
+        issues.append( Issue(NAMES, current, '{} and {} overlap {}'.format( current, otherCard, overlap )) )
+    
     return issues
 
 
-def validateNoHelperParent(cards):
+def _checkHelperParents(cards):
+    helpers = set( cmds.ls( '*.helper', o=True, r=True, l=True ) )
+    parents = {}
+    
+    def helperAncestor(bpJoint):
+        while bpJoint:
+            if bpJoint.longName() in helpers:
+                return True
+            if bpJoint not in parents:
+                parents[bpJoint] = bpJoint.bpParent
+            bpJoint = parents[bpJoint]
+        return False
+    
+    return [Issue(HELPER_PARENT, card, '{}'.format(card)) for card in cards
+            if helperAncestor(card.parentCardJoint) and not all( [j.longName() in helpers for j in card.joints] )]
 
-    @session_memoize
-    def bpParent(bpJoint):
-        return bpJoint.bpParent
 
-    @session_memoize
-    def helperAncestor(bpJoint):
-        if bpJoint.isHelper:
-            return True
+def _checkMissingJoints(cards, outputs):
+    toCheck = [card for card in cards if outputs[card] and card.rigData.get('rigCmd', '') != 'Group']  # Group doesn't build joints
+    
+    existing = collections.Counter(
+        name.rsplit('|', 1)[-1] for name in cmds.ls( [name for card in toCheck for name in outputs[card]], type='joint' )
+    )
+    
+    return [Issue(MISSING_JOINTS, card, '{} does not have joints built.'.format(card)) for card in toCheck
+            if not all( existing[name] for name in outputs[card] )]
 
-        p = bpParent(bpJoint)
-        while p:
-            if p.isHelper:
-                return True
-            p = bpParent(p)
 
-    issues = []
+def validateBoneNames(cards):
+    '''
+    Returns a list of any name issues building the given cards.
+    '''
+    return [issue.message for issue in validateBuild(cards, [NAMES])]
 
-    with session():
-        for card in cards:
-            if helperAncestor(card.parentCardJoint) and not all( [j.isHelper for j in card.joints ] ):
-                issues.append('{}'.format(card))
 
-    return issues
+def validateNoHelperParent(cards):
+    '''
+    Returns a list of the cards that are parented to a helper without being all helpers.
+    '''
+    return [issue.message for issue in validateBuild(cards, [HELPER_PARENT])]
 
 
 def getRequiredHierarchy(cards):
@@ -376,6 +443,113 @@ def getRequiredHierarchy(cards):
     return [c for c, children in hierachy if c in required]
 
 
+def _round(values):
+    return [round(v, 4) for v in values]
+
+
+def cardContentHash(card):
+    ''' Returns a hash of everything about the card that affects what gets built: the rigData, params, joint
+    positions and orientation and the parent links.
+    '''
+    joints = []
+    for j in card.joints:
+        joints.append( {
+            'name': j.name(),
+            'matrix': _round( cmds.xform(j.name(), q=True, ws=True, m=True) ),
+            'info': j.info,
+            'helper': j.isHelper,
+            'parent': j.parent.name() if j.parent else None,
+            'orientTarget': str(j.orientTarget),
+            'customUp': j.customUp.name() if j.customUp else None,
+            'postCommand': j.postCommand,
+        } )
+    
+    parentCard = card.parentCard
+    
+    content = {
+        'rigData': card.rigData,
+        'rigParams': card.rigParams,
+        'ikControllerOptions': card.ikControllerOptions,
+        'fkControllerOptions': card.fkControllerOptions,
+        'matrix': _round( cmds.xform(card.name(), q=True, ws=True, m=True) ),
+        'parentCard': parentCard.name() if parentCard else None,
+        'joints': joints,
+    }
+    
+    return hashlib.md5( json.dumps(content, sort_keys=True).encode('utf-8') ).hexdigest()
+
+
+def markBuilt(cards):
+    ''' Records the current content hash on the cards so they aren't dirty until changed again.
+    '''
+    for card in cards:
+        card.buildHash = cardContentHash(card)
+
+
+def isDirty(card):
+    ''' Returns True if the card changed since it was last built, or was never built.
+    '''
+    return not card.buildHash or card.buildHash != cardContentHash(card)
+
+
+def getRebuildCards(cards=None):
+    '''
+    Returns (<cards needing bones and rig rebuilt>, <cards only needing rig rebuilt>), both in build order, for an
+    incremental rebuild of the dirty cards in `cards`, defaulting to all.
+    
+    The children cards of dirty cards are rebuilt too since their joints are removed with the parent's.  The rigs of
+    other cards are rebuilt if they have spaces that target the controls or joints being rebuilt.
+    '''
+    if cards is None:
+        cards = find.blueprintCards()
+    
+    hierarchy = find.cardHierarchy()
+    childLookup = {parent: children for parent, children in hierarchy}
+    
+    boneCards = set()
+    toVisit = [card for card in cards if isDirty(card)]
+    while toVisit:
+        card = toVisit.pop()
+        if card not in boneCards:
+            boneCards.add(card)
+            toVisit += childLookup.get(card, [])
+    
+    # Keep expanding the rigs to rebuild until nothing else targets them.
+    rigCards = set(boneCards)
+    changed = bool(rigCards)
+    while changed:
+        changed = False
+        
+        removedNodes = set()
+        for card in rigCards:
+            removedNodes.update( card.getAllControls() )
+            removedNodes.update( card.getRealJoints() )
+        
+        for card in find.blueprintCards():
+            if card in rigCards:
+                continue
+            
+            for ctrl in card.getAllControls():
+                if removedNodes.intersection(_spaceTargets(ctrl)):
+                    rigCards.add(card)
+                    changed = True
+                    break
+    
+    order = find.cardJointBuildOrder()
+    
+    return [c for c in order if c in boneCards], [c for c in order if c in rigCards and c not in boneCards]
+
+
+def _spaceTargets(ctrl):
+    targets = []
+    for info in space.getTargetInfo(ctrl):
+        if isinstance(info.target, tuple):
+            targets += info.target
+        elif info.target:
+            targets.append(info.target)
+    return targets
+
+
 def accessoryFixup(newJoints, card):
     ''' Place the topmost joints in a separate group so they aren't exported.
     '''
@@ -1,5 +1,6 @@
 from __future__ import print_function, division, absolute_import
 
+import heapq
 import importlib
 import itertools
 import json
@@ -9,6 +10,9 @@ import numbers
 import os
 import time
 
+from maya.api import OpenMaya
+
+from pymel.internal.factories import apiUndo, ApiUndoItem
 from pymel.core import addAttr, annotate, Attribute, attributeQuery, circle, cmds, createNode, delete, \
     disconnectAttr, duplicate, hasAttr, hide, ls, listAttr, mel, parent, PyNode, \
     scale, select, spaceLocator, viewFit, xform
@@ -431,8 +435,6 @@ def getShapeInfo(controller):
 
     info['colors'] = extraInfo
 
-    cmds_xform = cmds.xform
-
     def truncateZero(vector):
         for i, v in enumerate(vector):
             if abs(v) < 0.000000001:
@@ -440,19 +442,9 @@ def getShapeInfo(controller):
         return vector
 
     for shape in pdil.shape.getNurbsShapes(controller):
-        # pos = [xform(cv, q=True, os=True, t=True) for cv in shape.cv]
-        # Iterating cvs in mel is 2-6x faster
-        if shape.type() == 'nurbsCurve':
-            cvStr = shape.name() + '.cv[%i]'
-            localPos = [ truncateZero(cmds_xform(cvStr % i, q=True, os=True, t=True)) for i in xrange(shape.numCVs())]
-            worldPos = [ truncateZero(cmds_xform(cvStr % i, q=True, ws=True, t=True)) for i in xrange(shape.numCVs())]
-            
-        else:
-            cvStr = shape.name() + '.cv[%i][%i]'
-            localPos = [ truncateZero(cmds_xform(cvStr % (u, v), q=True, os=True, t=True))
-                for u in xrange(shape.numCVsInU()) for v in xrange(shape.numCVsInV())]
-            worldPos = [ truncateZero(cmds_xform(cvStr % (u, v), q=True, ws=True, t=True))
-                for u in xrange(shape.numCVsInU()) for v in xrange(shape.numCVsInV())]
+        # Reading the whole array through the api is much faster than xform on each cv
+        localPos = [ truncateZero(pos) for pos in _getCVs(shape, OpenMaya.MSpace.kObject) ]
+        worldPos = [ truncateZero(pos) for pos in _getCVs(shape, OpenMaya.MSpace.kWorld) ]
             
         count = len(localPos)
         info[ '{}.{}|os'.format(shape.type(), count) ] = localPos
@@ -528,11 +520,48 @@ def applyShapeInfo(obj, info, space):
         if key in info:
             points = info[key]
             if space == 'os':
-                for cv, pos in zip(shape.cv, points):
-                    xform( cv, os=True, t=pos )
+                _setCVs(shape, points, OpenMaya.MSpace.kObject)
             elif space == 'ws':
-                for cv, pos in zip(shape.cv, points):
-                    xform( cv, ws=True, t=pos )
+                _setCVs(shape, points, OpenMaya.MSpace.kWorld)
+
+
+def _nurbsFn(shape):
+    dagPath = pdil.capi.asDagPath(shape)
+    if dagPath.hasFn(OpenMaya.MFn.kNurbsCurve):
+        return OpenMaya.MFnNurbsCurve(dagPath)
+    return OpenMaya.MFnNurbsSurface(dagPath)
+
+
+def _getCVs(shape, space):
+    ''' Returns the cv positions of the nurbsCurve/Surface as lists in ui units, ordered like `shape.cv`.
+    '''
+    toUI = OpenMaya.MDistance.internalToUI
+    return [ [toUI(p.x), toUI(p.y), toUI(p.z)] for p in _nurbsFn(shape).cvPositions(space) ]
+
+
+def _setCVPositions(shape, points, space):
+    fn = _nurbsFn(shape)
+    fn.setCVPositions(points, space)
+    if isinstance(fn, OpenMaya.MFnNurbsCurve):
+        fn.updateCurve()
+    else:
+        fn.updateSurface()
+
+
+def _setCVs(shape, positions, space):
+    ''' Sets all the cvs on the nurbsCurve/Surface at once (undoably), `positions` are in ui units and can be fewer
+    than the number of cvs, like zipping with `shape.cv`.
+    '''
+    toInternal = OpenMaya.MDistance.uiToInternal
+    
+    prev = _nurbsFn(shape).cvPositions(space)
+    points = OpenMaya.MPointArray(prev)
+    for i, pos in zip(range(len(points)), positions):
+        points[i] = OpenMaya.MPoint( toInternal(pos[0]), toInternal(pos[1]), toInternal(pos[2]) )
+    
+    name = shape.longName()
+    _setCVPositions(name, points, space)
+    apiUndo.append( ApiUndoItem(_setCVPositions, (name, points, space), (name, prev, space)) )
 
 
 def loadControlShapes(leadControl, lines, useObjectSpace=True, targetCtrlKeys=None):
@@ -776,8 +805,8 @@ def simpleCircle(radius=1, orientPosRef=None):
 
 def screenshotControlShapes():
     '''
-    Takes screen shots of all the available controls shapes as `./ui/shapes/<shape_name>_large.png`.
-    
+    Takes screen shots of the controls shapes that don't have an icon yet as `./ui/shapes/<shape_name>_large.png`,
+    then crops them into the `./ui/shapes/<shape_name>.png` icons.
     '''
     global SHAPES
     
@@ -789,9 +818,11 @@ def screenshotControlShapes():
 
     args = ['temp_shape', 1, 'blue 0.5']
 
+    shapeFolder = os.path.dirname(ui.__file__) + '/shapes'
+
     for shape in shapes:
-        destfile = os.path.dirname(ui.__file__) + '/shapes/' + shape + '_large.png'
-        regfile = os.path.dirname(ui.__file__) + '/shapes/' + shape + '.png'
+        destfile = shapeFolder + '/' + shape + '_large.png'
+        regfile = shapeFolder + '/' + shape + '.png'
         if os.path.exists(destfile) or os.path.exists(regfile):
             continue
         print('Grabbing', shape)
@@ -812,9 +843,11 @@ def screenshotControlShapes():
         filename = result.replace('####', '1')
         os.rename( filename, destfile)
         delete(obj)
-    print('Done')
+        
+        # Only the new grabs are cropped so existing icons aren't overwritten
+        pdil.image.autoCropFile(destfile, regfile, size=64)
     
-    #pfx thumbnail --img-path ..."ui\shapes\planePair_large.png" --output ..."ui\shapes\planePair.png"
+    print('Done')
     
 
 def determineRadius(vertPoints, controlPosition, count=30, increase=0.1):
@@ -822,29 +855,29 @@ def determineRadius(vertPoints, controlPosition, count=30, increase=0.1):
     Given `vertPositions` and a `controlPostion`, return a radius that will encompass
     the first `count` vertsPositions.
     
-    postions = [cmds_xform( f'pCube1.vtx[{i}]', q=1, t=1, ws=1 ) for i in range(len(o.vtx)) ]
+    postions = pdil.shape.getMeshPoints( [mesh] )
     
     Args:
-        vertPoints: List of points, ex [ [1,2,3], [3,5,9] ]
+        vertPoints: List of points, ex [ [1,2,3], [3,5,9] ] or a `pdil.shape.PointGrid`
+            which is much faster for repeated queries.
         controlPostion: A 3d postion, ex [1,2,3]
         count: How many of the closest verts to consider for the radius
         increase: Percentage to increase the radius by
     '''
-
-    distsSquared = [
-        (
+    
+    if isinstance(vertPoints, pdil.shape.PointGrid):
+        distsSquared = vertPoints.nearest(controlPosition, count)
+    else:
+        distsSquared = heapq.nsmallest( count, (
             (controlPosition[0] - vertPoint[0]) ** 2
             + (controlPosition[1] - vertPoint[1]) ** 2
             + (controlPosition[2] - vertPoint[2]) ** 2
-        )
-        for i, vertPoint in enumerate(vertPoints)
-    ]
-    
-    distsSquared.sort()
+            for vertPoint in vertPoints
+        ) )
     
-    count = min(count, len(vertPoints))
+    count = len(distsSquared)
     
-    radius = math.sqrt( sum( distsSquared[: count] ) / count )
+    radius = math.sqrt( sum( distsSquared ) / count )
     radius += radius * increase
     
     return radius
@@ -0,0 +1,214 @@
+'''
+Headless rebuilding of many rig files, ex. after a fossil update.
+
+Each file is opened in a standalone maya process, updated with `updater.checkAll`, given a `fullRebuild` (which
+reapplies the weights) and saved.  A pool of processes means N files are rebuilt on N cores.
+
+From a shell (run the file directly, importing the package requires maya):
+
+    mayapy pdil/tool/fossil/batch.py -j 4 -o rebuilt -r report.json a.ma b.ma
+
+The report is a list, in the order given, of:
+
+    {'file': path, 'success': bool, 'error': traceback or '', 'timings': {step: seconds}, 'total': seconds}
+
+`stub=True` (`--stub`) runs the pool and reporting with the maya steps replaced by stand-ins that only check the
+file exists, so it can be exercised without maya or a licence.
+
+Nothing in here imports maya at the top level for that reason.
+'''
+from __future__ import print_function, absolute_import
+
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+
+# The folder containing `pdil`, needed when this file is run directly.
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def _initWorker(stub):
+    if _ROOT not in sys.path:
+        sys.path.append(_ROOT)
+
+    if not stub:
+        import maya.standalone
+        maya.standalone.initialize(name='python')
+
+
+# Steps -----------------------------------------------------------------------
+# Each takes (path, saveTo), where `saveTo` is None to overwrite the original.
+
+def _open(path, saveTo):
+    from maya import cmds
+
+    try:
+        cmds.file(path, open=True, force=True, prompt=False, ignoreVersion=True)
+    except RuntimeError:
+        # Maya raises on recoverable problems, like missing plugins, so only fail if the file didn't open.
+        current = cmds.file(q=True, sceneName=True)
+        if not current or os.path.normcase(os.path.normpath(current)) != os.path.normcase(os.path.normpath(path)):
+            raise
+
+
+def _update(path, saveTo):
+    import pdil
+    from pdil.tool.fossil import updater
+
+    with pdil.ui.disableNotify():
+        updater.checkAll(ask=False)
+
+
+def _rebuild(path, saveTo):
+    import pdil
+    from pdil.tool.fossil import main
+
+    with pdil.ui.disableNotify():
+        main.fullRebuild()
+
+
+def _save(path, saveTo):
+    from maya import cmds
+
+    target = saveTo if saveTo else path
+    if saveTo:
+        cmds.file(rename=saveTo)
+
+    cmds.file(save=True, force=True, type='mayaBinary' if target.lower().endswith('.mb') else 'mayaAscii')
+
+
+def _stubOpen(path, saveTo):
+    if not os.path.isfile(path):
+        raise IOError('No such file: ' + path)
+
+
+def _stubStep(path, saveTo):
+    pass
+
+
+STEPS = [
+    ('open', _open),
+    ('update', _update),
+    ('rebuild', _rebuild),
+    ('save', _save),
+]
+
+STUB_STEPS = [
+    ('open', _stubOpen),
+    ('update', _stubStep),
+    ('rebuild', _stubStep),
+    ('save', _stubStep),
+]
+
+
+# -----------------------------------------------------------------------------
+
+def rebuildFile(path, saveTo=None, stub=False):
+    ''' Runs the steps on a single file in the current (standalone) maya, returning its report entry.
+    '''
+    result = collections.OrderedDict( [
+        ('file', path),
+        ('success', False),
+        ('error', ''),
+        ('timings', collections.OrderedDict()),
+        ('total', 0.0),
+    ] )
+
+    start = time.time()
+    try:
+        for name, step in (STUB_STEPS if stub else STEPS):
+            stepStart = time.time()
+            step(path, saveTo)
+            result['timings'][name] = time.time() - stepStart
+
+        result['success'] = True
+    except Exception:
+        result['error'] = traceback.format_exc()
+
+    result['total'] = time.time() - start
+    return result
+
+
+def _rebuildTask(args):
+    # Pool.imap only passes one arg
+    return rebuildFile(*args)
+
+
+def run(files, processes=None, outputFolder=None, report=None, stub=False, mayapy=None):
+    ''' Rebuilds the files in a pool of standalone maya processes, returning the report (see module docs).
+
+    Args:
+        files: List of .ma/.mb paths
+        processes: Number of simultaneous files, defaulting to the number of cores
+        outputFolder: Save the results here (with the same file names) instead of overwriting the originals
+        report: Optional path to write the report to as json
+        stub: If True, use stand-ins for the maya steps, see module docs
+        mayapy: Path to mayapy, required if not running from mayapy itself (ex. within maya)
+    '''
+    if not files:
+        return []
+
+    if mayapy:
+        multiprocessing.set_executable(mayapy)
+
+    if outputFolder and not os.path.exists(outputFolder):
+        os.makedirs(outputFolder)
+
+    tasks = [
+        (path, os.path.join(outputFolder, os.path.basename(path)) if outputFolder else None, stub)
+        for path in files
+    ]
+
+    processes = min(processes or multiprocessing.cpu_count(), len(files))
+
+    results = {}
+    pool = multiprocessing.Pool(processes, initializer=_initWorker, initargs=(stub,))
+    try:
+        for result in pool.imap_unordered(_rebuildTask, tasks):
+            results[result['file']] = result
+            print( '{} {} ({:.1f}s) {}/{}'.format(
+                'Rebuilt' if result['success'] else 'FAILED', result['file'], result['total'], len(results), len(files)
+            ) )
+    finally:
+        pool.close()
+        pool.join()
+
+    ordered = [results[path] for path in files]
+
+    if report:
+        with open(report, 'w') as fid:
+            json.dump(ordered, fid, indent=4)
+
+    return ordered
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Rebuild fossil rigs in standalone maya processes.')
+    parser.add_argument('files', nargs='+', help='Maya files to rebuild')
+    parser.add_argument('-j', '--processes', type=int, default=None, help='Files to rebuild at once, defaults to the number of cores')
+    parser.add_argument('-o', '--outputFolder', default=None, help='Save here instead of overwriting the originals')
+    parser.add_argument('-r', '--report', default=None, help='Write the json report to this path')
+    parser.add_argument('--stub', action='store_true', help='Use stand-ins for the maya steps, for testing without maya')
+    parser.add_argument('--mayapy', default=None, help='Path to mayapy if not running from it')
+
+    options = parser.parse_args(args)
+
+    results = run(options.files, options.processes, options.outputFolder, options.report, options.stub, options.mayapy)
+
+    failed = [r for r in results if not r['success']]
+    for result in failed:
+        print( '\n{}\n{}'.format(result['file'], result['error']) )
+
+    print( '{} of {} files rebuilt'.format(len(results) - len(failed), len(results)) )
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit( main() )
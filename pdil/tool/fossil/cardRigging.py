@@ -502,7 +502,8 @@ class MetaControl(six.with_metaclass(RegisterdMetaControl)):
                 names = [n + config.controlSideSuffix(side) for n in names]
             kwargs['names'] = names
             
-            fkCtrl, fkConstraints = cls.fk( start, end, groupName=fkGroupName, **kwargs )
+            with pdil.debug.profile('fk'):
+                fkCtrl, fkConstraints = cls.fk( start, end, groupName=fkGroupName, **kwargs )
             
             # If ik is coming, disable fk so ik can lay cleanly on top.  Technically it shouldn't matter but sometimes it does.
             if cls.ik:
@@ -510,11 +511,13 @@ class MetaControl(six.with_metaclass(RegisterdMetaControl)):
                     const.set(0)
             
         if cls.ik:
-            name, ikCtrl, ikConstraints = cls._buildIk(card, start, end, side, sideAlteration, isMirroredSide)
+            with pdil.debug.profile('ik'):
+                name, ikCtrl, ikConstraints = cls._buildIk(card, start, end, side, sideAlteration, isMirroredSide)
         
         switchPlug = None
         if cls.ik and cls.fk and buildFk:
-            switchPlug = controllerShape.addIkFkSwitch( name, ikCtrl, ikConstraints, fkCtrl, fkConstraints )
+            with pdil.debug.profile('ik/fk switch'):
+                switchPlug = controllerShape.addIkFkSwitch( name, ikCtrl, ikConstraints, fkCtrl, fkConstraints )
         
         log.PostRigRotation.check(chain, card, switchPlug)
         
@@ -15,6 +15,7 @@ from ._lib import proxyskel
 
 from . import cardRigging
 from . import util
+from .vendor.session_memo import session
 
 
 class ComboBox(QtWidgets.QComboBox):
@@ -63,8 +64,20 @@ class CardRow(QtWidgets.QTreeWidgetItem):
     def __init__(self, card):
         
         self.card = card
-        rigData = card.rigData
-        name = pdil.simpleName(card)
+        
+        # The combo boxes are only made when the row is scrolled into view, see `CardLister.buildVisibleControls`
+        self.controlsBuilt = False
+        self.controlsCurrent = False
+        
+        QtWidgets.QTreeWidgetItem.__init__( self, self.columnText() )
+        
+        self.setCheckState( 1, Qt.Checked if card.visibility.get() else Qt.Unchecked )
+        self.setFlags( Qt.ItemIsEnabled | Qt.ItemIsEditable | Qt.ItemIsSelectable )
+    
+    
+    def columnText(self):
+        rigData = self.card.rigData
+        name = pdil.simpleName(self.card)
         #head, repeat, tail = util.parse(card.nameInfo.get())
         names = rigData.get( 'nameInfo', {'head': [], 'repeat': '', 'tail': []} )
 
@@ -74,10 +87,33 @@ class CardRow(QtWidgets.QTreeWidgetItem):
         
         side = rigData.get('mirrorCode', '')
         
-        QtWidgets.QTreeWidgetItem.__init__( self, [name, '', '', head, repeat, tail, '', side] )
+        return [name, '', '', head, repeat, tail, '', side]
+    
+    
+    def refreshData(self):
+        '''
+        Updates the text and visibility to match the card, flagging the controls
+        to be updated the next time they are visible.
+        '''
+        for col, text in enumerate(self.columnText()):
+            if self.text(col) != text:
+                self.setText(col, text)
         
-        self.setCheckState( 1, Qt.Checked if card.visibility.get() else Qt.Unchecked )
-        self.setFlags( Qt.ItemIsEnabled | Qt.ItemIsEditable | Qt.ItemIsSelectable )
+        checked = Qt.Checked if self.card.visibility.get() else Qt.Unchecked
+        if self.checkState(self.VIS_COL) != checked:
+            self.setCheckState(self.VIS_COL, checked)
+        
+        self.controlsCurrent = False
+    
+    
+    def showControls(self):
+        '''
+        Make the combo boxes if needed, or update them if the card has changed.
+        '''
+        if not self.controlsBuilt:
+            self.buildControls()
+        elif not self.controlsCurrent:
+            self.updateControls()
     
     
     def rigTypeChanged(self, index):
@@ -134,6 +170,31 @@ class CardRow(QtWidgets.QTreeWidgetItem):
         self.type.addItems( self.options )
         self.treeWidget().setItemWidget(self, 2, self.type)
         
+        # Make the mirror options
+        self.mirror = ComboBox()
+        self.mirror.addItems( self.mirrorOptions )
+        self.treeWidget().setItemWidget(self, self.MIRROR_COL, self.mirror)
+        
+        # Make the side option
+        self.side = ComboBox()
+        self.side.addItems( self.sideOptions )
+        self.treeWidget().setItemWidget(self, self.SIDE_COL, self.side)
+        
+        self.controlsBuilt = True
+        self.updateControls()
+        
+        self.type.currentIndexChanged.connect( self.rigTypeChanged )
+        self.mirror.currentIndexChanged.connect( self.mirrorChanged )
+        self.side.currentIndexChanged.connect( self.sideChanged )
+    
+    
+    def updateControls(self):
+        '''
+        Sets the combo boxes to match the card without triggering their callbacks.
+        '''
+        for combo in (self.type, self.mirror, self.side):
+            combo.blockSignals(True)
+        
         rigData = self.card.rigData
         
         # Set the rig type value
@@ -144,13 +205,7 @@ class CardRow(QtWidgets.QTreeWidgetItem):
         if index > -1:
             self.type.setCurrentIndex(index)
         
-        self.type.currentIndexChanged.connect( self.rigTypeChanged )
-        
-        # Make the mirror options
-        self.mirror = ComboBox()
-        self.mirror.addItems( self.mirrorOptions )
-        self.treeWidget().setItemWidget(self, self.MIRROR_COL, self.mirror)
-        
+        # Set the mirror value
         if self.card.mirror is None:
             if self.card.isCardMirrored():
                 self.mirror.setCurrentIndex(2)
@@ -167,13 +222,7 @@ class CardRow(QtWidgets.QTreeWidgetItem):
         else:
             self.mirror.setCurrentIndex(1)
         
-        self.mirror.currentIndexChanged.connect( self.mirrorChanged )
-        
-        # Make the side option
-        self.side = ComboBox()
-        self.side.addItems( self.sideOptions )
-        self.treeWidget().setItemWidget(self, self.SIDE_COL, self.side)
-        
+        # Set the side value
         mirrorCode = rigData.get('mirrorCode', None)
         if mirrorCode == '':
             self.side.setCurrentIndex( self.sideOptions.index('-') )
@@ -188,7 +237,10 @@ class CardRow(QtWidgets.QTreeWidgetItem):
             # &&& Offer to run the update script since rigData is out of date or corrupt.
             pass
         
-        self.side.currentIndexChanged.connect( self.sideChanged )
+        for combo in (self.type, self.mirror, self.side):
+            combo.blockSignals(False)
+        
+        self.controlsCurrent = True
 
 
 """
@@ -289,6 +341,10 @@ class CardLister(QtWidgets.QTreeWidget):
         self.itemClicked.connect(self.cardListerItemClicked)
         self.itemChanged.connect(self.newDataEntered)
         
+        # Rows only get their controls when visible
+        self.itemExpanded.connect(self.buildVisibleControls)
+        self.verticalScrollBar().valueChanged.connect(self.buildVisibleControls)
+        
         self.highlightedCards = set()
         
         self._dataChangeActive = True
@@ -361,14 +417,22 @@ class CardLister(QtWidgets.QTreeWidget):
     
     
     def cardListerRefresh(self, force=False):
+        '''
+        Updates the rows to match the scene, only adding, removing, moving or
+        renaming the rows that changed.  `force` also refreshes the data of
+        the unchanged rows.
+        '''
+        # The session shares a single scan of the scene between the queries.
+        with session():
+            allCards = find.blueprintCards()
+            
+            if self.allCards == allCards and not force:
+                #print('No Refresh A')
+                return
+            
+            cardOrder = find.cardHierarchy()
         
-        if self.allCards == find.blueprintCards() and not force:
-            #print('No Refresh A')
-            return
-        
-        self.allCards = find.blueprintCards()
-        
-        cardOrder = find.cardHierarchy()
+        self.allCards = allCards
         
         # Exit if nothing has changed
         if self.cardOrder == cardOrder and not force:
@@ -379,17 +443,97 @@ class CardLister(QtWidgets.QTreeWidget):
         
         with self.disableUI():
             self._dataChangeActive = False
-            self.clear()
-            
-            self.cardItems = {None: None}
+            self._applyHierarchy(cardOrder, force)
+        
+        self.buildVisibleControls()
+    
+    
+    def _applyHierarchy(self, cardOrder, force):
+        '''
+        Rearranges the existing rows to match `cardOrder` (from `find.cardHierarchy()`),
+        making rows for new cards and removing the ones for cards that are gone.
+        '''
+        oldItems = self.cardItems
+        self.cardItems = {None: None}
+        
+        for parentCard, childrenCards in cardOrder:
+            parentItem = self.cardItems[parentCard]
             
-            for parentCard, childrenCards in self.cardOrder:
+            index = 0
+            for childCard in childrenCards:
+                if childCard in self.cardItems:  # Guard against a card listed twice
+                    continue
                 
-                for childCard in childrenCards:
-                    item = self.cardListerAddRow(childCard, self.cardItems[parentCard])
-                    item.setExpanded(True)
-                    self.cardItems[childCard] = item
-            
+                item = oldItems.get(childCard)
+                
+                if item is None:
+                    item = self.cardListerAddRow(childCard, parentItem, index)
+                
+                else:
+                    currentIndex = parentItem.indexOfChild(item) if parentItem else self.indexOfTopLevelItem(item)
+                    if item.parent() is not parentItem or currentIndex != index:
+                        self._moveRow(item, parentItem, index)
+                    
+                    if force:
+                        item.refreshData()
+                    else:
+                        name = pdil.simpleName(childCard)
+                        if item.text(CardRow.CARD_NAME) != name:
+                            item.setText(CardRow.CARD_NAME, name)
+                
+                item.setExpanded(True)
+                self.cardItems[childCard] = item
+                index += 1
+        
+        # Anything left belongs to deleted cards, the rows of existing children have already been moved out.
+        for card, item in oldItems.items():
+            if item is not None and card not in self.cardItems:
+                self._takeRow(item)
+    
+    
+    def _takeRow(self, item):
+        parentItem = item.parent()
+        if parentItem:
+            parentItem.takeChild( parentItem.indexOfChild(item) )
+        else:
+            self.takeTopLevelItem( self.indexOfTopLevelItem(item) )
+    
+    
+    def _moveRow(self, item, parentItem, index):
+        self._takeRow(item)
+        
+        if parentItem:
+            parentItem.insertChild(index, item)
+        else:
+            self.insertTopLevelItem(index, item)
+        
+        # Qt deletes the item widgets when the row is removed, for all its descendants too.
+        stack = [item]
+        while stack:
+            row = stack.pop()
+            row.controlsBuilt = False
+            row.setExpanded(True)
+            stack += [row.child(i) for i in range(row.childCount())]
+    
+    
+    def buildVisibleControls(self, *args):
+        '''
+        Makes (or updates) the combo boxes of the rows in view, which is much
+        faster than making them for every card on big rigs.
+        '''
+        item = self.itemAt(0, 0)
+        height = self.viewport().height()
+        
+        while item and self.visualItemRect(item).top() < height:
+            item.showControls()
+            item = self.itemBelow(item)
+    
+    
+    def resizeEvent(self, event):
+        QtWidgets.QTreeWidget.resizeEvent(self, event)
+        self.buildVisibleControls()
+    
+    
     def updateHighlight(self):
         '''
         ..  todo::
@@ -423,17 +567,18 @@ class CardLister(QtWidgets.QTreeWidget):
                     item.card.visibility.set(1)
                 
     
-    def cardListerAddRow(self, card, parentItem):
-        
+    def cardListerAddRow(self, card, parentItem, index=None):
+        '''
+        Adds the row for the card at the end (or at `index`), the controls are
+        made later by `buildVisibleControls`.
+        '''
         item = CardRow(card)
         
         if not parentItem:
-            self.addTopLevelItem(item)
+            self.insertTopLevelItem(self.topLevelItemCount() if index is None else index, item)
         else:
-            parentItem.addChild(item)
-               
-        item.buildControls()
-                    
+            parentItem.insertChild(parentItem.childCount() if index is None else index, item)
+        
         return item
     
     def newDataEntered(self, item, column):
@@ -1,7 +1,6 @@
 from __future__ import print_function, absolute_import
 from functools import partial
 import json
-import itertools
 
 
 from ...vendor.Qt import QtWidgets, QtCore
@@ -181,6 +180,10 @@ class JointLister(QtWidgets.QTableWidget):
             bpJoint.displayHandle.set( item.checkState() == Qt.Checked )
     
     def jointListerRefresh(self, card=FORCE_UPDATE):
+        '''
+        Shows the joints of the given card, reusing the existing cells so only
+        the text that differs is updated.
+        '''
         if self.displayedCard == card:
             return
         
@@ -189,27 +192,33 @@ class JointLister(QtWidgets.QTableWidget):
         else:
             self.displayedCard = card
         
-        self.clearContents()
-        self.joints = []
-        
-        ctr = itertools.count()
-        self.setRowCount(0)
-        
         if not card:
+            self.joints = []
+            self.setRowCount(0)
             return
         
+        # Several joints usually have parents on the same card so only get each output map once.
+        outputMaps = {}
+        
+        def outputMap(card, includeHelpers):
+            key = (card, includeHelpers)
+            if key not in outputMaps:
+                outputMaps[key] = card.getOutputMap(includeHelpers=includeHelpers)
+            return outputMaps[key]
+        
         # Actually build the ui
-        temp = card.getOutputMap(includeHelpers=True)
+        temp = outputMap(card, True)
         names = [ n[0] for n in temp.values() ]
         names += ['<too few names>'] * ( len(card.joints) - len(names) )
         
-        parentCard = card.parentCard
+        joints = card.joints
+        rows = [ self.jointRowData(jnt, name, outputMap) for jnt, name in zip(joints, names) ]
         
-        self.setRowCount( self.rowCount() + len(names) )
+        self.joints = joints[:len(rows)]
+        self.setRowCount( len(rows) )
         
-        for i, (jnt, name) in enumerate(zip(card.joints, names)):
-            self.jointListerAddRow( ctr, jnt, name, card, parentCard)
-            self.joints.append(jnt)
+        for index, values in enumerate(rows):
+            self.setRow(index, values)
     
     def refreshHighlight(self):
         sel = set(util.selectedJoints())
@@ -358,19 +367,37 @@ class JointLister(QtWidgets.QTableWidget):
             else:
                 tempJoint.customOrient = None
                         
-    def jointListerAddRow(self, ctr, tempJoint, name, card, parentCard):
-        index = next(ctr)
+    def setRow(self, index, values):
+        '''
+        Sets the cells of the row to the `values` from `jointRowData`, making
+        the cells if needed and only changing the ones that differ.
+        '''
+        for col, value in enumerate(values):
+            item = self.item(index, col)
+            
+            if col in (self.JOINT_LISTER_HELPER, self.JOINT_LISTER_HANDLES):
+                if item is None:
+                    self.setItem( index, col, Cell(checked=value) )
+                elif (item.checkState() == Qt.Checked) != bool(value):
+                    item.setCheckState( Qt.Checked if value else Qt.Unchecked )
+            
+            else:
+                if item is None:
+                    self.setItem( index, col, Cell(value) )
+                elif item.text() != value:
+                    item.setText(value)
+    
+    @staticmethod
+    def jointRowData(tempJoint, name, outputMap):
+        '''
+        Returns the values of each column for the joint.
         
+        Args:
+            tempJoint: The BPJoint
+            name: Its output name
+            outputMap: Function taking (card, includeHelpers) returning the card's output map.
+        '''
         jointName = pdil.shortName(tempJoint)
-        self.setItem( index, self.JOINT_LISTER_NAME, Cell(jointName) )
-
-        cb = Cell(checked=tempJoint.isHelper)
-        self.setItem( index, self.JOINT_LISTER_HELPER, cb)
-        
-        self.setItem( index, self.JOINT_LISTER_OUTPUT, Cell(name))
-        
-        cb = Cell(checked=tempJoint.displayHandle.get())
-        self.setItem( index, self.JOINT_LISTER_HANDLES, cb)
         
         # --- Orient ---
         orientText = ''
@@ -387,26 +414,32 @@ class JointLister(QtWidgets.QTableWidget):
             orientText = tempJoint.orientTarget
         elif tempJoint.orientTarget:
             orientText = pdil.shortName(tempJoint.orientTarget)
-        self.setItem( index, self.JOINT_LISTER_ORIENT, Cell(orientText))
         
         # --- parent ---
         
         if tempJoint.parent:
             # Technically this will fail if there is a helper also has a child (which is just fine, just not useful)
-            outputMap = tempJoint.parent.card.getOutputMap(includeHelpers=True)
+            parentOutput = outputMap(tempJoint.parent.card, True)
             if tempJoint.info.get('options', {}).get('mirroredSide'):
-                parentName = outputMap[tempJoint.parent][1]
+                parentName = parentOutput[tempJoint.parent][1]
             else:
-                parentName = outputMap[tempJoint.parent][0]
+                parentName = parentOutput[tempJoint.parent][0]
             
             if not parentName:  # This being empty means the parent is a helper
                 parentName = '!helper! ' + pdil.simpleName(tempJoint.parent)
         
         elif tempJoint.extraNode[0]:
-            outputMap = tempJoint.extraNode[0].card.getOutputMap(includeHelpers=False)
-            parentName = outputMap[tempJoint.extraNode[0]][1]
+            parentOutput = outputMap(tempJoint.extraNode[0].card, False)
+            parentName = parentOutput[tempJoint.extraNode[0]][1]
         
         else:
             parentName = ''
         
-        self.setItem( index, self.JOINT_LISTER_CHILDOF, Cell(parentName))
\ No newline at end of file
+        return [
+            jointName,
+            tempJoint.isHelper,
+            name,
+            tempJoint.displayHandle.get(),
+            orientText,
+            parentName,
+        ]
@@ -2,7 +2,9 @@ from __future__ import print_function, absolute_import
 
 from collections import OrderedDict
 
-from pymel.core import cutKey, getAttr, xform, currentTime, setAttr, setKeyframe, orientConstraint
+from maya.api import OpenMaya
+
+from pymel.core import cmds, cutKey, getAttr, xform, currentTime, setAttr, setKeyframe, orientConstraint
 
 import pdil
 
@@ -123,6 +125,37 @@ def _clearKeys(objs, toClear):
         cutKey(objs, t=(start, end), iub=False, cl=True, shape=False)
 
 
+def _keyablePlugs(objs):
+    ''' Returns [(<plug str>, <MPlug>), ...] of the keyable attrs on objs, what `setKeyframe(objs)` would key.
+    '''
+    plugs = []
+    for obj in objs:
+        for attr in cmds.listAttr( obj.name(), k=True ) or []:
+            name = obj.name() + '.' + attr
+            sel = OpenMaya.MSelectionList()
+            try:
+                sel.add(name)
+                plugs.append( (name, sel.getPlug(0)) )
+            except Exception:  # Multi attrs and such that aren't actually keyable can show up
+                pass
+    return plugs
+
+
+def _recordKeys(bakedKeys, plugs, time):
+    ''' Adds the current values of the plugs from `_keyablePlugs` at time to bakedKeys, for `pdil.anim.bakeKeys`.
+    '''
+    for name, plug in plugs:
+        try:
+            value = plug.asDouble()
+        except Exception:  # Non-numeric
+            continue
+        
+        if name not in bakedKeys:
+            bakedKeys[name] = ([], [])
+        bakedKeys[name][0].append(time)
+        bakedKeys[name][1].append(value)
+
+
 def animStateSwitch(leads, start, end, spaces={}, dense=False, key=True):
     ''' Kinematic and space switch over time as efficiently as possible.
     
@@ -243,17 +276,26 @@ def animStateSwitch(leads, start, end, spaces={}, dense=False, key=True):
     allTimes = sorted(allTimes)
     #print('allTime', len(allTimes))
     #print('AllTimes', allTimes[0], allTimes[-1], prep.keys())
-    # Harvest all the data first, so nothing is inadvertently altered
+    # Harvest all the data first, so nothing is inadvertently altered.  Evaluating in a context is much faster than
+    # changing the time since only what the leads depend on is evaluated.
     for t in allTimes:
-        currentTime(t)
-        for lead, times in harvestTimes.items():
-            if t in times:
-                harvestValues[lead][t] = harvestFunc[lead]( prep[lead] )
+        with util.evaluateAt(t):
+            for lead, times in harvestTimes.items():
+                if t in times:
+                    harvestValues[lead][t] = harvestFunc[lead]( prep[lead] )
 
-        for ctrl, times in spaceOnlyTimes.items():
-            if t in times:
-                spaceOnlyData[ctrl][t] = util.worldInfo(ctrl)
-        
+            for ctrl, times in spaceOnlyTimes.items():
+                if t in times:
+                    spaceOnlyData[ctrl][t] = util.worldInfo(ctrl)
+    
+    # Keys are collected as the values are applied and all set at the end instead of keying every frame.
+    keyPlugs = {}
+    if key:
+        for lead in harvestTimes:
+            keyPlugs[lead] = _keyablePlugs(controls[lead])
+        for ctrl in spaceOnlyTimes:
+            keyPlugs[ctrl] = _keyablePlugs([ctrl])
+    bakedKeys = {}
 
     # Apply that results of the harvesting
     for t in allTimes:
@@ -262,7 +304,7 @@ def animStateSwitch(leads, start, end, spaces={}, dense=False, key=True):
             if t in times:
                 applyFunc[lead]( prep[lead], harvestValues[lead][t], lead )
                 if key:
-                    setKeyframe( controls[lead], shape=False )
+                    _recordKeys(bakedKeys, keyPlugs[lead], t)
         
         
         for ctrl, times in spaceOnlyTimes.items():
@@ -270,8 +312,10 @@ def animStateSwitch(leads, start, end, spaces={}, dense=False, key=True):
                 ctrl.space.set( spaceOnlyTargetValues[ctrl] )
                 util.applyWorldInfo(ctrl, spaceOnlyData[ctrl][t])
                 if key:
-                    setKeyframe( ctrl, shape=False )
-                
+                    _recordKeys(bakedKeys, keyPlugs[ctrl], t)
+    
+    if bakedKeys:
+        pdil.anim.bakeKeys(bakedKeys)
 
     for switcher, target in targets.items():
         if not switcher:
@@ -12,7 +12,7 @@ import logging
 from ...vendor import Qt
 
 
-from pymel.core import Callback, cmds, hide, scriptJob, select, selected, setParent, PyNode, \
+from pymel.core import Callback, hide, scriptJob, select, selected, setParent, PyNode, \
     showHidden, warning, xform, \
     button, columnLayout, deleteUI, textFieldGrp
     
@@ -26,6 +26,7 @@ from ._core import config
 from ._core import find
 from ._core import skinning
 from ._lib import proxyskel
+from ._lib import space
 from ._lib import tpose
 from . import updater
 from . import util
@@ -897,32 +898,94 @@ def fullRebuild(weights=None):
         fossil_card.buildRig(cards)
         
         pr.update(status='Restore State')
-        for card in cards:
-            pr.update()
-            card.restoreState()
+        # Spaces are collected from all the cards so they can be made in dependency order, the constraints and
+        # attrState are restored after them, like `Card.toSave`.  Any failures are raised together at the end.
+        with space.plannedRestore():
+            for card in cards:
+                pr.update()
+                card.restoreState()
         
         if reposers:
             tpose.goToBindPose()
         
         if not weights:
-            skinning.cacheWeights(cards, meshStorage)
+            skinning.loadCachedWeights(meshStorage)
         else:
             for obj, data in weights.items():
                 obj = PyNode(obj)
                 pdil.weights.apply(obj, data['weight'])
                 
 
+def incrementalRebuild():
+    ''' Like `fullRebuild` but only rebuilds the cards that changed since they were last built, and the cards that
+    depend on them (see `card.getRebuildCards`).  Returns the cards that had bones rebuilt.
+    '''
+    
+    boneCards, rigOnlyCards = fossil_card.getRebuildCards()
+    rigCards = boneCards + rigOnlyCards
+    
+    if not rigCards:
+        print('Nothing needs rebuilding')
+        return []
+    
+    meshStorage = {}
+    
+    with pdil.ui.progressWin(title='Incremental Rebuild', max=len(rigCards) * 3 + len(boneCards) + 9 ) as pr:
+        pr.update(status='Storing weights')
+        if getBoundMeshes(boneCards):
+            skinning.cacheWeights(boneCards, meshStorage)
+        
+        pr.update(status='Saving states')
+        for card in rigCards:
+            pr.update()
+            card.saveState()
+        
+        pr.update(status='Removing Rig')
+        for card in rigCards:
+            pr.update()
+            card.removeRig()
+        
+        pr.update(status='Removing Bones')
+        for card in boneCards:
+            pr.update()
+            card.removeBones()
+        
+        reposers = tpose.getReposeRoots()
+        if reposers:
+            pr.update(status='New reposer')
+            tpose.updateReposers(boneCards)
+            pr.update(status='Run adjusters')
+            tpose.runAdjusters(boneCards)
+        
+        pr.update(status='Build Bones')
+        fossil_card.buildBones(boneCards)
+        
+        pr.update(status='Build Rig')
+        fossil_card.buildRig(rigCards)
+        
+        pr.update(status='Restore State')
+        # Spaces are collected from all the cards so they can be made in dependency order, the constraints and
+        # attrState are restored after them, like `Card.toSave`.  Any failures are raised together at the end.
+        with space.plannedRestore():
+            for card in rigCards:
+                pr.update()
+                card.restoreState()
+        
+        if reposers:
+            with tpose.goToBindPose():
+                skinning.loadCachedWeights(meshStorage)
+        else:
+            skinning.loadCachedWeights(meshStorage)
+    
+    return boneCards
+
+
 def fitControlsToMesh(cards, meshes):
     ''' Scale all the controls to be slightly larger than the nearest mesh portion.
     '''
     
-    cmds_xform = cmds.xform # Make the fastest version possible
-    
-    allPositions = []
-    for mesh in meshes:
-        # String queries are super fast, about 7x faster than PyMel
-        vertCmd = str(mesh) + '.vtx[{}]'
-        allPositions += [cmds_xform( vertCmd.format(i), q=1, t=1, ws=1 ) for i in range(len(mesh.vtx))]
+    # Index the verts once so each control only looks at the nearby ones.
+    allPositions = pdil.shape.PointGrid( pdil.shape.getMeshPoints(meshes) )
     
     for card in cards:
         for ctrl, side, _type in card.getMainControls():
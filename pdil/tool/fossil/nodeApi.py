@@ -4,6 +4,7 @@ Definitions of custom PyMel node types.
 from __future__ import print_function, absolute_import
 
 import collections
+import functools
 import itertools
 import logging
 import math
@@ -33,6 +34,7 @@ from ._lib import proxyskel
 from ._lib import visNode
 from ._lib import space
 from ._lib2 import controllerShape
+from .vendor.session_memo import session
 
 from . import util
 
@@ -482,6 +484,9 @@ class Card(nt.Transform):
     child of main.  Use `getGroupName()` which has this logic.
     '''
     rigGroupName = pdil.factory.StringAccess('groupName')
+    
+    # Content hash of what the card was last built from, see `fossil.card.isDirty()`
+    buildHash = pdil.factory.StringAccess('fossilBuildHash')
         
     @property
     def outputCenter(self):
@@ -1720,25 +1725,27 @@ class Card(nt.Transform):
     
 
     def saveState(self):
-        allData = self.rigState
-        
-        for niceName, (harvestFunc, restoreFunc) in self.toSave.items():
-            data = self._saveData(harvestFunc)
+        # The session memoizes the id specs of the nodes that are referenced many times.
+        with session():
+            allData = self.rigState
+            
+            for niceName, (harvestFunc, restoreFunc) in self.toSave.items():
+                data = self._saveData(harvestFunc)
 
-            if niceName not in allData:
-                allData[niceName] = data
-            else:
-                # Overwrite per kinematic to prevent wiping data but not letting values linger on accident.
-                for side_kinematic, value in data.items():
-                    allData[niceName][side_kinematic] = value
-                
-        self.rigState = allData
-        
-        rigClass = self.rigCommandClass
-        if rigClass:
-            rigClass.saveState(self)
-        
-        self.saveJointData()
+                if niceName not in allData:
+                    allData[niceName] = data
+                else:
+                    # Overwrite per kinematic to prevent wiping data but not letting values linger on accident.
+                    for side_kinematic, value in data.items():
+                        allData[niceName][side_kinematic] = value
+                    
+            self.rigState = allData
+            
+            rigClass = self.rigCommandClass
+            if rigClass:
+                rigClass.saveState(self)
+            
+            self.saveJointData()
         
         self.saveShapes()
 
@@ -1756,14 +1763,29 @@ class Card(nt.Transform):
         errors = exceptions.FossilMultiError()
         #issues = []
 
-        for niceName, (harvestFunc, restoreFunc) in self.toSave.items():
-            if niceName in allData and allData[niceName]:
-                try:
-                    self._restoreData(restoreFunc, allData[niceName])
-                except Exception:
-                    print(traceback.format_exc())
-                    #issues.append( 'Issues restoring ' + niceName )
-                    errors.append( 'Issues restoring ' + niceName + ' on ' + self.shortName(), traceback.format_exc())
+        # Within `space.plannedRestore()` the spaces are made later, so what comes after them in `toSave` waits too.
+        deferred = False
+
+        # The session shares the id spec lookups between everything restored.
+        with session():
+            for niceName, (harvestFunc, restoreFunc) in self.toSave.items():
+                if niceName in allData and allData[niceName]:
+                    if deferred:
+                        space.afterSpaces(
+                            functools.partial(self._restoreData, restoreFunc, allData[niceName]),
+                            'Issues restoring ' + niceName + ' on ' + self.shortName()
+                        )
+                        continue
+                    
+                    try:
+                        self._restoreData(restoreFunc, allData[niceName])
+                    except Exception:
+                        print(traceback.format_exc())
+                        #issues.append( 'Issues restoring ' + niceName )
+                        errors.append( 'Issues restoring ' + niceName + ' on ' + self.shortName(), traceback.format_exc())
+                
+                if niceName == 'spaces':
+                    deferred = space.isPlanning()
                 
         rigClass = self.rigCommandClass
         
@@ -1774,7 +1796,8 @@ class Card(nt.Transform):
                 #issues.append( 'Issues restoring shapes' )
                 errors.append( 'Issues restoring shapes on ' + self.shortName(), traceback.format_exc())
         
-        self.restoreJointData()
+        with session():
+            self.restoreJointData()
         
         self.restoreShapes(objectSpace=shapesInObjectSpace)
         
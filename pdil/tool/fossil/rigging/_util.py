@@ -1,13 +1,15 @@
 from __future__ import absolute_import, division, print_function
 
 import collections
+import contextlib
 import functools
 import json
 import math
 
 import maya.OpenMaya
+import maya.api.OpenMaya
 
-from pymel.core import aimConstraint, addAttr, arclen, cluster, createNode, delete, duplicate, dt, group, hide, ikHandle, \
+from pymel.core import aimConstraint, addAttr, arclen, cluster, cmds, createNode, delete, duplicate, dt, group, hide, ikHandle, \
     orientConstraint, parentConstraint, pointConstraint, PyNode, scaleConstraint, selected, upAxis, warning, xform, MayaAttributeError
 
 try:
@@ -128,16 +130,14 @@ def defaultspec(defSpec, **additionalSpecs):
                 
                 # If there is one spec and sub controls, it is a chain so apply the same visgroup
                 if len(tempSpec) == 1 and tempSpec['main']['visGroup']:
-                    for name, ctrl in subControls:
-                        visNode.connect(ctrl, (tempSpec['main']['visGroup'], 1) )
+                    visNode.connectMany( [ctrl for name, ctrl in subControls], (tempSpec['main']['visGroup'], 1) )
             
                 # If there are 2 specs, the non-main is the repeating one
                 elif len(tempSpec) == 2:
                     specName = tempSpec.keys()[:].remove('main')
                     visGroup = tempSpec['main']['visGroup']
                     if visGroup:
-                        for name, ctrl in subControls:
-                            visNode.connect(ctrl, (visGroup, 1) )
+                        visNode.connectMany( [ctrl for name, ctrl in subControls], (visGroup, 1) )
                 
                 # Finally, each additional spec should match a sub control
                 else:
@@ -188,7 +188,7 @@ def getChain(start, end):
 
 
 def chainLength(joints):
-    return abs(sum( [j.tx.get() for j in joints[1:]] ))
+    return abs(sum( [attrValue(j.tx) for j in joints[1:]] ))
     
 
 def dupChain(start, end, nameFormat='{0}_dup'):
@@ -867,8 +867,56 @@ def angleBetween( a, mid, c ):
         return 0, axis
 
 
+# Harvesting with an MDGContext -----------------------
+# Inside `evaluateAt`, `worldInfo`, `worldMatrix`, `attrValue` and `chainLength` return the values at the given time
+# without changing the current time so activators can harvest many frames without the whole scene evaluating.
+
+if '_evalTime' not in globals():
+    _evalTime = None
+
+
+@contextlib.contextmanager
+def evaluateAt(time):
+    global _evalTime
+    
+    prevTime = _evalTime
+    _evalTime = time
+    try:
+        with pdil.capi.evaluateAt(time):
+            yield
+    finally:
+        _evalTime = prevTime
+
+
+def worldMatrix(obj):
+    ''' Returns the world matrix as a flat list, like `xform(obj, q=True, ws=True, m=True)`.
+    '''
+    if _evalTime is None:
+        return xform(obj, q=True, ws=True, m=True)
+    
+    matrix = pdil.capi.getMatrix(obj)
+    return [matrix.getElement(row, col) for row in range(4) for col in range(4)]
+
+
+def attrValue(plug):
+    if _evalTime is None:
+        return plug.get()
+    
+    return cmds.getAttr( str(plug), t=_evalTime )
+
+
 def worldInfo(obj):
-    return [xform(obj, q=True, ws=True, t=True), xform(obj, q=True, ws=True, ro=True)]
+    if _evalTime is None:
+        return [xform(obj, q=True, ws=True, t=True), xform(obj, q=True, ws=True, ro=True)]
+    
+    matrix = maya.api.OpenMaya.MTransformationMatrix( pdil.capi.getMatrix(obj) )
+    trans = matrix.translation( maya.api.OpenMaya.MSpace.kWorld )
+    rot = matrix.rotation().reorder( cmds.getAttr( str(obj) + '.rotateOrder' ) )
+    
+    return [
+        [maya.api.OpenMaya.MDistance.internalToUI(v) for v in (trans.x, trans.y, trans.z)],
+        [maya.api.OpenMaya.MAngle.internalToUI(v) for v in (rot.x, rot.y, rot.z)],
+    ]
 
 
 def applyWorldInfo(obj, info):
@@ -316,8 +316,8 @@ class activator(object):
             'knee': util.worldInfo( objects['knee']),
             'ankle': util.worldInfo( objects['ankle']),
             'ball': util.worldInfo( objects['ball']),
-            'length': abs(sum( [b.tx.get() for b in (objects['knee'], objects['ankle'], objects['ball'])] )),
-            'ankleMatrix': xform( objects['ankle'], q=True, ws=True, m=True),
+            'length': abs(sum( [util.attrValue(b.tx) for b in (objects['knee'], objects['ankle'], objects['ball'])] )),
+            'ankleMatrix': util.worldMatrix( objects['ankle'] ),
         }
     
 
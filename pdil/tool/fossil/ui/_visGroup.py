@@ -51,8 +51,7 @@ class VisGroupLayout( object ):
         
         level = self.ui.groupLevel.value()
         
-        for obj in selected():
-            visNode.connect( obj, (name, level) )
+        visNode.connectMany( selected(), (name, level) )
         
         self.update()
         select( sel )
@@ -0,0 +1,52 @@
+from __future__ import print_function
+
+import importlib.util
+import json
+import os
+import sys
+
+
+# Loaded by path since importing `pdil` requires maya, which the stub mode doesn't.
+_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pdil', 'tool', 'fossil', 'batch.py')
+_spec = importlib.util.spec_from_file_location('fossil_batch', _path)
+batch = importlib.util.module_from_spec(_spec)
+sys.modules['fossil_batch'] = batch  # So the pool can find the task functions
+_spec.loader.exec_module(batch)
+
+
+def test_stub_report(tmp_path):
+    existing = tmp_path / 'rig.ma'
+    existing.write_text(u'//Maya ASCII scene\n')
+    missing = str(tmp_path / 'missing.ma')
+
+    files = [missing, str(existing)]
+    reportPath = str(tmp_path / 'report.json')
+
+    results = batch.run(files, processes=2, report=reportPath, stub=True)
+
+    # Same order as given even though the pool can finish them in any order
+    assert [r['file'] for r in results] == files
+
+    failed, rebuilt = results
+
+    assert not failed['success']
+    assert 'No such file' in failed['error']
+    assert list(failed['timings']) == []
+
+    assert rebuilt['success']
+    assert rebuilt['error'] == ''
+    assert list(rebuilt['timings']) == ['open', 'update', 'rebuild', 'save']
+    assert rebuilt['total'] >= 0
+
+    with open(reportPath) as fid:
+        report = json.load(fid)
+
+    assert report == json.loads(json.dumps(results))
+
+
+def test_main_exit_code(tmp_path):
+    existing = tmp_path / 'rig.ma'
+    existing.write_text(u'//Maya ASCII scene\n')
+
+    assert batch.main(['--stub', str(existing)]) == 0
+    assert batch.main(['--stub', str(existing), str(tmp_path / 'missing.ma')]) == 1
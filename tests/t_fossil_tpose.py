@@ -0,0 +1,36 @@
+from __future__ import division
+
+import pytest
+
+from pymel.core import newFile, xform
+from pdil.tool import fossil
+from pdil.tool.fossil._lib.tpose import tpcore
+
+
+@pytest.fixture
+def cleanFile():
+    # Trick to clear the file but use fixtures
+    newFile(f=True)
+
+
+def test_reparent_keeps_adjustment(cleanFile):
+    # given
+    card = fossil.card.makeCard(3, {'repeat': 'chain'})
+    a, b, c = card.joints
+
+    tpcore.updateReposers([card])
+
+    # Adjust the tpose of the old parent and the joint itself so their local values differ between parents
+    tpcore.getRJoint(b).r.set( 0, 0, 30 )
+    rc = tpcore.getRJoint(c)
+    rc.r.set( 10, 20, 0 )
+
+    worldRot = xform(rc, q=True, ws=True, ro=True)
+
+    # when
+    c.setBPParent(a)
+    tpcore.updateReposers([card])
+
+    # then
+    assert rc.getParent() == tpcore.getRJoint(a)
+    assert xform(rc, q=True, ws=True, ro=True) == pytest.approx(worldRot, abs=1e-4)